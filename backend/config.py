@@ -3,179 +3,163 @@ Configuration management for the backend application.
 Centralizes all configuration settings with environment variable support.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
-from pydantic_settings import BaseSettings
-from pydantic import Field, validator
+from typing import Annotated, Any, List, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import BeforeValidator, Field, field_validator
+
+
+def _parse_path(v: Any) -> Any:
+    """Parse path from string."""
+    if isinstance(v, str):
+        return Path(v)
+    return v
+
+
+def _parse_cors_origins(v: Any) -> Any:
+    """Parse CORS origins from string or list."""
+    if isinstance(v, str):
+        return [origin.strip() for origin in v.split(",")]
+    return v
+
+
+# Reusable field types: the before-validator is attached once to the type
+# rather than registered per field name on the model.
+PathField = Annotated[Path, BeforeValidator(_parse_path)]
+CorsList = Annotated[List[str], BeforeValidator(_parse_cors_origins)]
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+    )
+    
     # Application
     APP_NAME: str = "SNOWFLAKE API"
     APP_VERSION: str = "1.0.0"
-    DEBUG: bool = Field(default=False, env="DEBUG")
-    LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
+    DEBUG: bool = Field(default=False)
+    LOG_LEVEL: str = Field(default="INFO")
     
     # Server
-    HOST: str = Field(default="0.0.0.0", env="HOST")
-    PORT: int = Field(default=8000, env="PORT")
-    RELOAD: bool = Field(default=False, env="RELOAD")
+    HOST: str = Field(default="0.0.0.0")
+    PORT: int = Field(default=8000)
+    RELOAD: bool = Field(default=False)
+    EAGER_TASKS: bool = Field(default=True)  # Python 3.12+ only
     
     # Database
-    DATABASE_URL: str = Field(
-        default="sqlite+aiosqlite:///./snowflake.db",
-        env="DATABASE_URL"
-    )
-    DB_ECHO: bool = Field(default=False, env="DB_ECHO")
-    DB_POOL_SIZE: int = Field(default=5, env="DB_POOL_SIZE")
-    DB_MAX_OVERFLOW: int = Field(default=10, env="DB_MAX_OVERFLOW")
+    DATABASE_URL: str = Field(default="sqlite+aiosqlite:///./snowflake.db")
+    DB_ECHO: bool = Field(default=False)
+    # Sized for many concurrent short lookups (job status polling, analysis
+    # endpoints); the default 5 + 10 queues requests under load
+    DB_POOL_SIZE: int = Field(default=20)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_POOL_TIMEOUT: float = Field(default=30.0)  # seconds to wait for a connection
+    DB_POOL_PRE_PING: bool = Field(default=False)
+    
+    # Job creation: inserts arriving within the window are written together
+    JOB_INSERT_BATCH_SIZE: int = Field(default=100)
+    JOB_INSERT_BATCH_WINDOW: float = Field(default=0.005)
     
     # CORS
     # Include localhost:8080 (Vite dev/preview), localhost:3000 (Docker/Next). For Lovable,
     # set CORS_ORIGINS to your frontend URL(s), e.g. "https://your-app.lovable.app" or comma-separated list.
-    CORS_ORIGINS: List[str] = Field(
-        default=["http://localhost:3000", "http://localhost:8080", "http://127.0.0.1:8080", "http://127.0.0.1:3000"],
-        env="CORS_ORIGINS"
-    )
-    CORS_ALLOW_CREDENTIALS: bool = Field(default=True, env="CORS_ALLOW_CREDENTIALS")
+    CORS_ORIGINS: CorsList = Field(default=["http://localhost:3000", "http://localhost:8080", "http://127.0.0.1:8080", "http://127.0.0.1:3000"])
+    CORS_ALLOW_CREDENTIALS: bool = Field(default=True)
     
     # File Storage
-    WORKSPACE_DIR: Path = Field(
-        default=Path("/workspace"),
-        env="WORKSPACE_DIR"
-    )
-    UPLOADS_DIR: Path = Field(
-        default=Path("/workspace/uploads"),
-        env="UPLOADS_DIR"
-    )
-    PREDICTIONS_DIR: Path = Field(
-        default=Path("/workspace/predictions"),
-        env="PREDICTIONS_DIR"
-    )
-    CACHE_DIR: Path = Field(
-        default=Path("/workspace/cache"),
-        env="CACHE_DIR"
-    )
+    WORKSPACE_DIR: PathField = Field(default=Path("/workspace"))
+    UPLOADS_DIR: PathField = Field(default=Path("/workspace/uploads"))
+    PREDICTIONS_DIR: PathField = Field(default=Path("/workspace/predictions"))
+    CACHE_DIR: PathField = Field(default=Path("/workspace/cache"))
     
     # AlphaFold
-    ALPHAFOLD_DOCKER_IMAGE: str = Field(
-        default="alphafold",
-        env="ALPHAFOLD_DOCKER_IMAGE"
-    )
-    ALPHAFOLD_DATA_DIR: Path = Field(
-        default=Path("/data/alphafold"),
-        env="ALPHAFOLD_DATA_DIR"
-    )
-    ALPHAFOLD_USE_CLOUD_API: bool = Field(
-        default=False,
-        env="ALPHAFOLD_USE_CLOUD_API"
-    )
-    BIONEMO_API_KEY: Optional[str] = Field(default=None, env="BIONEMO_API_KEY")
+    ALPHAFOLD_DOCKER_IMAGE: str = Field(default="alphafold")
+    ALPHAFOLD_DATA_DIR: PathField = Field(default=Path("/data/alphafold"))
+    ALPHAFOLD_USE_CLOUD_API: bool = Field(default=False)
+    BIONEMO_API_KEY: Optional[str] = Field(default=None)
     
     # Docking
-    AUTODOCK_VINA_PATH: str = Field(
-        default="/usr/local/bin/vina",
-        env="AUTODOCK_VINA_PATH"
-    )
-    GNINA_PATH: str = Field(
-        default="gnina",
-        env="GNINA_PATH"
-    )
-    USE_GPU_DOCKING: bool = Field(
-        default=False,
-        env="USE_GPU_DOCKING"
-    )
-    MAX_PARALLEL_LIGANDS: int = Field(
-        default=4,
-        env="MAX_PARALLEL_LIGANDS"
-    )
+    AUTODOCK_VINA_PATH: str = Field(default="/usr/local/bin/vina")
+    GNINA_PATH: str = Field(default="gnina")
+    USE_GPU_DOCKING: bool = Field(default=False)
+    MAX_PARALLEL_LIGANDS: int = Field(default=4)
+    # Concurrent job submissions handled per worker; extra requests get 503
+    MAX_CONCURRENT_JOB_SUBMISSIONS: int = Field(default=16)
     
     # AI Services
-    OPENAI_API_KEY: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
-    ANTHROPIC_API_KEY: Optional[str] = Field(default=None, env="ANTHROPIC_API_KEY")
+    OPENAI_API_KEY: Optional[str] = Field(default=None)
+    ANTHROPIC_API_KEY: Optional[str] = Field(default=None)
+    # With both keys set, query both providers per report and keep the first one back
+    AI_REPORT_RACE_PROVIDERS: bool = Field(default=False)
     
     # Blockchain
-    SOLANA_RPC_URL: str = Field(
-        default="https://api.devnet.solana.com",
-        env="SOLANA_RPC_URL"
-    )
-    SOLANA_PRIVATE_KEY: Optional[str] = Field(
-        default=None,
-        env="SOLANA_PRIVATE_KEY"
-    )
+    SOLANA_RPC_URL: str = Field(default="https://api.devnet.solana.com")
+    SOLANA_PRIVATE_KEY: Optional[str] = Field(default=None)
     
     # Redis/Celery
-    REDIS_URL: str = Field(
-        default="redis://localhost:6379/0",
-        env="REDIS_URL"
-    )
+    REDIS_URL: str = Field(default="redis://localhost:6379/0")
     
     # External APIs - PubChem
-    PUBCHEM_BASE_URL: str = Field(
-        default="https://pubchem.ncbi.nlm.nih.gov/rest/pug",
-        env="PUBCHEM_BASE_URL"
-    )
-    PUBCHEM_API_KEY: Optional[str] = Field(default=None, env="PUBCHEM_API_KEY")
+    PUBCHEM_BASE_URL: str = Field(default="https://pubchem.ncbi.nlm.nih.gov/rest/pug")
+    PUBCHEM_API_KEY: Optional[str] = Field(default=None)
     
     # External APIs - ChEMBL
-    CHEMBL_BASE_URL: str = Field(
-        default="https://www.ebi.ac.uk/chembl/api/data",
-        env="CHEMBL_BASE_URL"
-    )
-    CHEMBL_API_KEY: Optional[str] = Field(default=None, env="CHEMBL_API_KEY")
+    CHEMBL_BASE_URL: str = Field(default="https://www.ebi.ac.uk/chembl/api/data")
+    CHEMBL_API_KEY: Optional[str] = Field(default=None)
     
     # External APIs - UniProt
-    UNIPROT_BASE_URL: str = Field(
-        default="https://rest.uniprot.org",
-        env="UNIPROT_BASE_URL"
-    )
-    UNIPROT_API_KEY: Optional[str] = Field(default=None, env="UNIPROT_API_KEY")
+    UNIPROT_BASE_URL: str = Field(default="https://rest.uniprot.org")
+    UNIPROT_API_KEY: Optional[str] = Field(default=None)
     
     # External APIs - PDB
-    PDB_BASE_URL: str = Field(
-        default="https://data.rcsb.org/rest/v1",
-        env="PDB_BASE_URL"
-    )
-    PDB_API_KEY: Optional[str] = Field(default=None, env="PDB_API_KEY")
+    PDB_BASE_URL: str = Field(default="https://data.rcsb.org/rest/v1")
+    PDB_API_KEY: Optional[str] = Field(default=None)
     
     # External API Settings
-    EXTERNAL_API_TIMEOUT: float = Field(default=30.0, env="EXTERNAL_API_TIMEOUT")
-    EXTERNAL_API_MAX_RETRIES: int = Field(default=3, env="EXTERNAL_API_MAX_RETRIES")
-    EXTERNAL_API_RETRY_DELAY: float = Field(default=1.0, env="EXTERNAL_API_RETRY_DELAY")
+    EXTERNAL_API_TIMEOUT: float = Field(default=30.0)
+    EXTERNAL_API_MAX_RETRIES: int = Field(default=3)
+    EXTERNAL_API_RETRY_DELAY: float = Field(default=1.0)
+    EXTERNAL_API_MAX_CONNECTIONS_PER_HOST: int = Field(default=30)
+    EXTERNAL_API_KEEPALIVE_EXPIRY: float = Field(default=300.0)  # seconds
+    EXTERNAL_API_CACHE_ENABLED: bool = Field(default=True)
+    EXTERNAL_API_CACHE_TTL: int = Field(default=86400)  # 24 hours
+    EXTERNAL_API_CACHE_TIMEOUT: float = Field(default=0.5)  # Redis socket timeout
+    EXTERNAL_API_LOCAL_CACHE_SIZE: int = Field(default=1024)  # In-process entries
+    EXTERNAL_API_LOCAL_CACHE_TTL: float = Field(default=60.0)  # seconds
     
     # Security
-    API_KEY_HEADER: Optional[str] = Field(default=None, env="API_KEY_HEADER")
-    RATE_LIMIT_ENABLED: bool = Field(default=False, env="RATE_LIMIT_ENABLED")
-    RATE_LIMIT_PER_MINUTE: int = Field(default=60, env="RATE_LIMIT_PER_MINUTE")
-    
-    @validator("CORS_ORIGINS", pre=True)
-    def parse_cors_origins(cls, v):
-        """Parse CORS origins from string or list."""
-        if isinstance(v, str):
-            return [origin.strip() for origin in v.split(",")]
-        return v
+    API_KEY_HEADER: Optional[str] = Field(default=None)
+    RATE_LIMIT_ENABLED: bool = Field(default=False)
+    RATE_LIMIT_PER_MINUTE: int = Field(default=60)
     
-    @validator("USE_GPU_DOCKING", pre=True)
+    @field_validator("USE_GPU_DOCKING", mode="before")
+    @classmethod
     def parse_use_gpu_docking(cls, v):
         """Parse USE_GPU_DOCKING from string or bool."""
         if isinstance(v, str):
             return v.lower() in ("1", "true", "yes")
         return bool(v)
-    
-    @validator("WORKSPACE_DIR", "UPLOADS_DIR", "PREDICTIONS_DIR", "CACHE_DIR", "ALPHAFOLD_DATA_DIR", pre=True)
-    def parse_path(cls, v):
-        """Parse path from string."""
-        if isinstance(v, str):
-            return Path(v)
-        return v
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide settings instance.
+    
+    The .env file is read and validated only once; use this as a FastAPI
+    dependency (``Depends(get_settings)``) instead of constructing Settings().
+    
+    The current routes only read settings at import time (concurrency limits
+    in decorators, the precomputed external API catalogue), where a
+    dependency can't be used, so they import the module-level ``settings``.
+    """
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
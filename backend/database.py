@@ -1,38 +1,85 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import Connection, Enum, bindparam, case, inspect, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool, QueuePool
-from typing import AsyncGenerator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from typing import Any, AsyncGenerator
 import logging
 
+import orjson
+
 from backend.config import settings
 from backend.exceptions import DatabaseError
 
 logger = logging.getLogger(__name__)
 
+# Backend detection is done once at import; URLs look like "sqlite+aiosqlite:///..."
+_IS_SQLITE = settings.DATABASE_URL.startswith(("sqlite:", "sqlite+"))
+
+# Connectivity probe, sent as raw driver SQL to skip statement compilation
+_PING_SQL = "SELECT 1"
+
+# JSON columns (docking results, ligand files, ...) are encoded and decoded
+# with orjson; numpy scalars/arrays from the analysis code are accepted as-is
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _json_serializer(value: Any) -> str:
+    return orjson.dumps(value, option=_JSON_OPTIONS).decode()
+
+
 # Configure engine with connection pooling
 engine_kwargs = {
     "echo": settings.DB_ECHO,
     "future": True,
+    "json_serializer": _json_serializer,
+    "json_deserializer": orjson.loads,
 }
 
 # Use connection pooling for non-SQLite databases
-if "sqlite" not in settings.DATABASE_URL.lower():
+if not _IS_SQLITE:
     engine_kwargs.update({
+        "poolclass": AsyncAdaptedQueuePool,
         "pool_size": settings.DB_POOL_SIZE,
         "max_overflow": settings.DB_MAX_OVERFLOW,
-        "pool_pre_ping": True,  # Verify connections before using
-        "pool_recycle": 3600,  # Recycle connections after 1 hour
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        # Pre-ping costs a round-trip on every checkout; stale connections are
+        # instead handled by recycling them after 1 hour
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": 3600,
     })
 else:
     # SQLite doesn't support connection pooling
     engine_kwargs["poolclass"] = NullPool
 
-engine = create_async_engine(settings.DATABASE_URL, **engine_kwargs)
-async_session_maker = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """
+    Return the process-wide async engine, creating it on first use.
+    
+    The engine is not built at import time so that each forked worker
+    creates its own connection pool after the fork.
+    """
+    return create_async_engine(settings.DATABASE_URL, **engine_kwargs)
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Return the session factory bound to get_engine()."""
+    return async_sessionmaker(
+        get_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
+
+def async_session_maker() -> AsyncSession:
+    """Open a new session; usable as ``async with async_session_maker() as session``."""
+    return get_sessionmaker()()
+
 
 Base = declarative_base()
 
@@ -45,19 +92,138 @@ async def init_db() -> None:
         DatabaseError: If database initialization fails
     """
     try:
+        engine = get_engine()
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_migrate_schema)
         logger.info("Database initialized successfully")
         
         # Verify connection
-        async with engine.connect() as conn:
-            await conn.execute("SELECT 1")
+        await ping_db()
         logger.info("Database connection verified")
+        
+        await _warm_pool(engine)
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
         raise DatabaseError(f"Database initialization failed: {str(e)}") from e
 
 
+def _migrate_schema(conn: Connection) -> None:
+    """
+    Bring a jobs table created by an earlier version up to date.
+    
+    create_all() only creates missing tables, so changes to existing ones are
+    applied here. Every step is idempotent and runs on each startup.
+    """
+    _migrate_job_enum_columns(conn)
+    _migrate_binding_affinities(conn)
+    _migrate_job_indexes(conn)
+
+
+def _migrate_job_enum_columns(conn: Connection) -> None:
+    """
+    Convert job_type/status from SQLEnum to plain strings holding the enum values.
+    
+    SQLEnum stored the member *names* ("FAILED") and, on PostgreSQL, used a
+    native ENUM type; the columns now store the values ("failed") as VARCHAR.
+    """
+    from backend.models import Job, JobStatus, JobType
+    
+    columns = {column["name"]: column["type"] for column in inspect(conn).get_columns("jobs")}
+    for name, enum_cls in (("job_type", JobType), ("status", JobStatus)):
+        column_type = columns.get(name)
+        if conn.dialect.name == "postgresql" and isinstance(column_type, Enum):
+            conn.exec_driver_sql(f"ALTER TABLE jobs ALTER COLUMN {name} TYPE VARCHAR(32) USING {name}::text")
+            conn.exec_driver_sql(f"DROP TYPE IF EXISTS {column_type.name}")
+            logger.info("Converted jobs.%s from enum type %s to VARCHAR(32)", name, column_type.name)
+        
+        column = Job.__table__.c[name]
+        result = conn.execute(
+            update(Job.__table__)
+            .where(column.in_([member.name for member in enum_cls]))
+            .values({name: case({member.name: member.value for member in enum_cls}, value=column)})
+        )
+        if result.rowcount:
+            logger.info("Rewrote %d jobs.%s enum names to values", result.rowcount, name)
+
+
+def _migrate_binding_affinities(conn: Connection) -> None:
+    """
+    Add jobs.binding_affinities and fill it in for jobs docked before it existed.
+    
+    Only documents with a "results" list are backfilled; malformed ones keep
+    NULL so the statistics endpoints still report them as invalid.
+    """
+    from backend.models import Job
+    from backend.services.docking import extract_mode_affinities
+    
+    jobs = Job.__table__
+    if "binding_affinities" not in {column["name"] for column in inspect(conn).get_columns("jobs")}:
+        column_type = jobs.c.binding_affinities.type.compile(dialect=conn.dialect)
+        conn.exec_driver_sql(f"ALTER TABLE jobs ADD COLUMN binding_affinities {column_type}")
+        logger.info("Added jobs.binding_affinities column")
+    
+    rows = conn.execute(
+        select(jobs.c.id, jobs.c.docking_results)
+        .where(jobs.c.binding_affinities.is_(None), jobs.c.docking_results.isnot(None))
+    )
+    backfill = []
+    for job_id, docking_results in rows:
+        if isinstance(docking_results, (str, bytes)):
+            try:
+                docking_results = orjson.loads(docking_results)
+            except orjson.JSONDecodeError:
+                continue
+        if isinstance(docking_results, dict) and isinstance(docking_results.get("results"), list):
+            backfill.append({"job_id": job_id, "affinities": extract_mode_affinities(docking_results)})
+    
+    if backfill:
+        conn.execute(
+            update(jobs)
+            .where(jobs.c.id == bindparam("job_id"))
+            .values(binding_affinities=bindparam("affinities")),
+            backfill
+        )
+        logger.info("Backfilled binding_affinities for %d jobs", len(backfill))
+
+
+def _migrate_job_indexes(conn: Connection) -> None:
+    """
+    Replace indexes that the model no longer declares with the current ones.
+    
+    The full index on blockchain_tx_hash (from Column(index=True)) was
+    superseded by the partial idx_job_blockchain_tx_notnull; keeping both
+    would double the write cost. create_all() doesn't add indexes to an
+    existing table, so the current ones are created here if missing.
+    """
+    from backend.models import Job
+    
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_jobs_blockchain_tx_hash")
+    for index in Job.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+async def ping_db() -> None:
+    """
+    Run a lightweight connectivity probe on a pooled connection.
+    
+    Raises:
+        SQLAlchemyError: If the database cannot be reached
+    """
+    async with get_engine().connect() as conn:
+        await conn.exec_driver_sql(_PING_SQL)
+
+
+async def _warm_pool(engine: AsyncEngine) -> None:
+    """Open DB_POOL_SIZE connections up front so early requests find a warm pool."""
+    if _IS_SQLITE:
+        return
+    async with AsyncExitStack() as stack:
+        for _ in range(settings.DB_POOL_SIZE):
+            await stack.enter_async_context(engine.connect())
+    logger.info("Database pool warmed with %d connections", settings.DB_POOL_SIZE)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for database sessions.
@@ -66,21 +232,44 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         AsyncSession: Database session
         
     Raises:
-        DatabaseError: If session creation fails
+        DatabaseError: If a database operation fails
     """
     async with async_session_maker() as session:
         try:
             yield session
             await session.commit()
-        except Exception as e:
+        except SQLAlchemyError as e:
             await session.rollback()
             logger.error(f"Database session error: {str(e)}")
             raise DatabaseError(f"Database operation failed: {str(e)}") from e
+        except Exception:
+            # Request errors (HTTPException, validation) pass through unchanged
+            await session.rollback()
+            raise
         finally:
             await session.close()
 
 
+async def get_db_ro() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only database sessions.
+    
+    Unlike get_db(), the session is never flushed or committed, so GET handlers
+    don't pay for an empty COMMIT round-trip. Any implicit transaction is
+    rolled back when the session closes.
+    
+    Yields:
+        AsyncSession: Database session
+    """
+    async with async_session_maker() as session:
+        session.sync_session.autoflush = False
+        yield session
+
+
 async def close_db() -> None:
     """Close database connections."""
-    await engine.dispose()
+    if get_engine.cache_info().currsize:
+        await get_engine().dispose()
+        get_sessionmaker.cache_clear()
+        get_engine.cache_clear()
     logger.info("Database connections closed")
@@ -1,14 +1,25 @@
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import GZipResponder
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
+from starlette.datastructures import Headers
+from starlette.types import Message, Receive, Scope, Send
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Type
 import uvicorn
+import asyncio
 import logging
 import traceback
 
 from backend.routes import jobs, health, blockchain, statistics
-from backend.database import init_db
+from backend.database import init_db, close_db
+from backend.services.external_cache import close_cache
+from backend.services.external_api import close_http_client
+from backend.services.ai_report import close_client as close_ai_client, prewarm_client as prewarm_ai_client
+from backend.services.job_writer import job_writer
 from backend.config import settings
 from backend.exceptions import (
     BackendError,
@@ -27,30 +38,44 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Initialize database
+    # Startup: Initialize database (the engine and its pool are created here,
+    # inside each worker, rather than at import time)
     try:
         await init_db()
         logger.info("Database initialized successfully")
     except Exception as e:
-        logger.error(f"Failed to initialize database: {str(e)}", exc_info=True)
+        logger.error("Failed to initialize database: %s", e, exc_info=True)
         raise
+    # Run new tasks eagerly: request coroutines that finish without suspending
+    # (cached lookups, identity-map hits) skip a trip through the loop's queue
+    if settings.EAGER_TASKS and hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        logger.info("Eager task factory enabled")
+    # Connect to the LLM providers now so the first report skips the handshake
+    await prewarm_ai_client()
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: stop the job writer, then release pooled connections
+    await job_writer.close()
+    await close_db()
+    await close_cache()
+    await close_http_client()
+    await close_ai_client()
     logger.info("Application shutting down")
 
 app = FastAPI(
     title="SNOWFLAKE API",
     description="AlphaFold-powered drug discovery and molecular docking platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Global exception handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle request validation errors"""
-    logger.warning(f"Validation error on {request.url.path}: {exc.errors()}")
-    return JSONResponse(
+    logger.warning("Validation error on %s: %s", request.url.path, exc.errors())
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": exc.errors(),
@@ -58,84 +83,62 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         }
     )
 
-@app.exception_handler(ValidationError)
-async def custom_validation_exception_handler(request: Request, exc: ValidationError):
-    """Handle custom validation errors"""
-    logger.warning(f"Validation error on {request.url.path}: {exc.message}")
-    return JSONResponse(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        content={
-            "detail": exc.message,
-            "message": "Validation failed",
-            "details": exc.details
-        }
-    )
+# Status code, log level, response message, whether to expose the error
+# class name and whether exc.message is safe to return as "detail", keyed by
+# exception type. Non-public errors (database failures may carry SQL or driver
+# text) answer with the generic message as "detail" instead. Lookups walk the
+# MRO so subclasses (e.g. external API errors deriving from ServiceError)
+# inherit their parent's mapping.
+_ERROR_MAP: Dict[Type[BackendError], Tuple[int, int, str, bool, bool]] = {
+    ValidationError: (status.HTTP_400_BAD_REQUEST, logging.WARNING, "Validation failed", False, True),
+    NotFoundError: (status.HTTP_404_NOT_FOUND, logging.INFO, "Resource not found", False, True),
+    DatabaseError: (status.HTTP_500_INTERNAL_SERVER_ERROR, logging.ERROR, "Database operation failed", False, False),
+    FileProcessingError: (status.HTTP_400_BAD_REQUEST, logging.ERROR, "File processing failed", False, True),
+    AlphaFoldError: (status.HTTP_502_BAD_GATEWAY, logging.ERROR, "Service error", True, True),
+    DockingError: (status.HTTP_502_BAD_GATEWAY, logging.ERROR, "Service error", True, True),
+    AIReportError: (status.HTTP_502_BAD_GATEWAY, logging.ERROR, "Service error", True, True),
+    BlockchainError: (status.HTTP_503_SERVICE_UNAVAILABLE, logging.ERROR, "Service error", True, True),
+    ServiceError: (status.HTTP_500_INTERNAL_SERVER_ERROR, logging.ERROR, "Service error", True, True),
+    BackendError: (status.HTTP_500_INTERNAL_SERVER_ERROR, logging.ERROR, "Backend error", True, True),
+}
 
-@app.exception_handler(NotFoundError)
-async def not_found_exception_handler(request: Request, exc: NotFoundError):
-    """Handle not found errors"""
-    logger.info(f"Resource not found on {request.url.path}: {exc.message}")
-    return JSONResponse(
-        status_code=status.HTTP_404_NOT_FOUND,
-        content={
-            "detail": exc.message,
-            "message": "Resource not found",
-            "details": exc.details
-        }
-    )
 
-@app.exception_handler(DatabaseError)
-async def database_exception_handler(request: Request, exc: DatabaseError):
-    """Handle database errors"""
-    logger.error(f"Database error on {request.url.path}: {exc.message}", exc_info=True)
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "detail": "Database operation failed",
-            "message": exc.message,
-            "details": exc.details
-        }
-    )
+@lru_cache(maxsize=None)
+def _resolve_error(exc_type: Type[BackendError]) -> Tuple[int, int, str, bool, bool]:
+    """Find the _ERROR_MAP entry for an exception type (memoized per type)."""
+    for cls in exc_type.__mro__:
+        entry = _ERROR_MAP.get(cls)
+        if entry is not None:
+            return entry
+    return _ERROR_MAP[BackendError]
 
-@app.exception_handler(ServiceError)
-async def service_exception_handler(request: Request, exc: ServiceError):
-    """Handle service errors"""
-    logger.error(f"Service error on {request.url.path}: {exc.message}", exc_info=True)
-    
-    # Map specific service errors to appropriate status codes
-    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
-    if isinstance(exc, (AlphaFoldError, DockingError, AIReportError)):
-        status_code = status.HTTP_502_BAD_GATEWAY  # Service unavailable
-    elif isinstance(exc, BlockchainError):
-        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
-    
-    return JSONResponse(
-        status_code=status_code,
-        content={
-            "detail": exc.message,
-            "message": "Service error",
-            "details": exc.details,
-            "error_type": exc.__class__.__name__
-        }
-    )
 
-@app.exception_handler(FileProcessingError)
-async def file_processing_exception_handler(request: Request, exc: FileProcessingError):
-    """Handle file processing errors"""
-    logger.error(f"File processing error on {request.url.path}: {exc.message}", exc_info=True)
-    return JSONResponse(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        content={
-            "detail": exc.message,
-            "message": "File processing failed",
-            "details": exc.details
-        }
+@app.exception_handler(BackendError)
+async def backend_exception_handler(request: Request, exc: BackendError):
+    """Handle all backend errors"""
+    status_code, log_level, message, include_error_type, public = _resolve_error(type(exc))
+    # Tracebacks are only worth formatting for server-side (5xx) failures
+    logger.log(
+        log_level,
+        "%s on %s %s: %s",
+        message,
+        request.method,
+        request.url.path,
+        exc.message,
+        exc_info=status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR
     )
+    if public:
+        content = {"detail": exc.message, "message": message, "details": exc.details}
+    else:
+        content = {"detail": message, "message": exc.message, "details": exc.details}
+    if include_error_type:
+        content["error_type"] = exc.__class__.__name__
+    return ORJSONResponse(status_code=status_code, content=content)
 
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc):
     """Handle 404 errors"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={
             "detail": f"Endpoint not found: {request.url.path}",
@@ -143,31 +146,17 @@ async def not_found_handler(request: Request, exc):
         }
     )
 
-@app.exception_handler(BackendError)
-async def backend_exception_handler(request: Request, exc: BackendError):
-    """Handle all backend errors"""
-    logger.error(
-        f"Backend error on {request.method} {request.url.path}: {exc.message}",
-        exc_info=True
-    )
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "detail": exc.message,
-            "message": "Backend error",
-            "details": exc.details,
-            "error_type": exc.__class__.__name__
-        }
-    )
-
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions"""
     logger.error(
-        f"Unhandled exception on {request.method} {request.url.path}: {str(exc)}",
+        "Unhandled exception on %s %s: %s",
+        request.method,
+        request.url.path,
+        exc,
         exc_info=True
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Internal server error",
@@ -176,13 +165,111 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
+class CachedCORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware with memoized origin matching and reusable preflights.
+    
+    Allowed origins are kept in a frozenset and the result of each origin
+    check is memoized since traffic comes from a handful of origins; the
+    matching rules are CORSMiddleware's own. A preflight response depends only on the request's Origin,
+    Access-Control-Request-Method and Access-Control-Request-Headers, so the
+    built response is memoized on that triple instead of re-assembling the
+    same allow-list headers for every OPTIONS request.
+    """
+    
+    def __init__(
+        self,
+        *args,
+        preflight_cache_size: int = 256,
+        origin_cache_size: int = 1024,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self._exact_origins = frozenset(self.allow_origins)
+        self._origin_cache: Dict[str, bool] = {}
+        self._origin_cache_size = origin_cache_size
+        self._cached_preflight = lru_cache(maxsize=preflight_cache_size)(self._build_preflight)
+    
+    def is_allowed_origin(self, origin: str) -> bool:
+        if self.allow_all_origins:
+            return True
+        
+        allowed = self._origin_cache.get(origin)
+        if allowed is None:
+            allowed = origin in self._exact_origins or (
+                self.allow_origin_regex is not None
+                and self.allow_origin_regex.fullmatch(origin) is not None
+            )
+            if len(self._origin_cache) < self._origin_cache_size:
+                self._origin_cache[origin] = allowed
+        return allowed
+    
+    def _build_preflight(
+        self,
+        origin: str,
+        method: str,
+        requested_headers: Optional[str]
+    ) -> Response:
+        raw = {
+            "origin": origin,
+            "access-control-request-method": method,
+        }
+        if requested_headers is not None:
+            raw["access-control-request-headers"] = requested_headers
+        return super().preflight_response(request_headers=Headers(headers=raw))
+    
+    def preflight_response(self, request_headers: Headers) -> Response:
+        return self._cached_preflight(
+            request_headers["origin"],
+            request_headers["access-control-request-method"],
+            request_headers.get("access-control-request-headers")
+        )
+
 # CORS configuration
 app.add_middleware(
-    CORSMiddleware,
+    CachedCORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
+)
+
+class _EventStreamGZipResponder(GZipResponder):
+    """GZipResponder that passes text/event-stream responses through uncompressed"""
+    
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith("text/event-stream"):
+                # Forwarded as-is, like a response that already has a Content-Encoding
+                self.initial_message = message
+                self.content_encoding_set = True
+                return
+        await super().send_with_gzip(message)
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves server-sent event streams uncompressed.
+    
+    SSE responses must reach the client event by event, but the gzip stream
+    buffers small writes until the response ends, so any text/event-stream
+    response is sent as-is.
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _EventStreamGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+# Compress JSON responses (job results, external API proxies) for clients
+# that send Accept-Encoding: gzip
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=1024,
+    compresslevel=4,
 )
 
 # Include routers
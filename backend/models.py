@@ -1,9 +1,31 @@
-from sqlalchemy import Column, String, Text, Enum as SQLEnum, DateTime, Float, JSON, Index
+from sqlalchemy import Column, String, Text, DateTime, Float, JSON, Index
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.sql import func
 from backend.database import Base
 import enum
+import logging
+import uuid
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+try:
+    from uuid6 import uuid7
+    UUID7_AVAILABLE = True
+except ImportError:
+    UUID7_AVAILABLE = False
+    logger.warning("uuid6 package not available. Job IDs will be random (uuid4) rather than time-ordered.")
+
+
+def new_job_id() -> str:
+    """
+    Generate a primary key for a new job.
+    
+    UUIDv7 ids start with a millisecond timestamp, so new rows are appended at
+    the end of the primary key index instead of at random positions.
+    """
+    return str(uuid7() if UUID7_AVAILABLE else uuid.uuid4())
+
 class JobType(str, enum.Enum):
     DOCKING_ONLY = "docking_only"
     SEQUENCE_TO_DOCKING = "sequence_to_docking"
@@ -18,13 +40,25 @@ class JobStatus(str, enum.Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+# SQLite's CURRENT_TIMESTAMP has whole-second precision; store/bind created_at
+# in the same format so keyset comparisons against it match stored values
+_SQLITE_SECONDS_DATETIME = sqlite.DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+
+# JSON documents are stored as binary JSONB on PostgreSQL, which is parsed
+# once on write instead of on every read; other backends keep plain JSON
+_JSON = JSON().with_variant(postgresql.JSONB(), "postgresql")
+
 class Job(Base):
     __tablename__ = "jobs"
 
     id = Column(String, primary_key=True)
     job_name = Column(String, nullable=False, index=True)
-    job_type = Column(SQLEnum(JobType), nullable=False, default=JobType.DOCKING_ONLY, index=True)
-    status = Column(SQLEnum(JobStatus), nullable=False, default=JobStatus.SUBMITTED, index=True)
+    # Stored as plain strings (the enum values); JobType/JobStatus validation
+    # happens in the Pydantic schemas, so rows skip per-value enum coercion.
+    job_type = Column(String(32), nullable=False, default=JobType.DOCKING_ONLY.value, index=True)
+    status = Column(String(32), nullable=False, default=JobStatus.SUBMITTED.value, index=True)
     
     # For DOCKING_ONLY jobs
     protein_pdb_path = Column(String, nullable=True)
@@ -33,21 +67,22 @@ class Job(Base):
     protein_sequence = Column(Text, nullable=True)
     predicted_pdb_path = Column(String, nullable=True)
     plddt_score = Column(Float, nullable=True)  # AlphaFold confidence score
-    quality_metrics = Column(JSON, nullable=True)  # Comprehensive quality metrics (pLDDT, PAE, etc.)
+    quality_metrics = Column(_JSON, nullable=True)  # Comprehensive quality metrics (pLDDT, PAE, etc.)
     
     # Ligand information
-    ligand_files = Column(JSON, nullable=True)
+    ligand_files = Column(_JSON, nullable=True)
     
     # Docking parameters and results
-    docking_parameters = Column(JSON, nullable=True)
-    docking_results = Column(JSON, nullable=True)
+    docking_parameters = Column(_JSON, nullable=True)
+    docking_results = Column(_JSON, nullable=True)
+    binding_affinities = Column(_JSON, nullable=True)  # Every mode's affinity, flattened from docking_results
     top_binding_score = Column(Float, nullable=True)
     
     # AI Report
     ai_report_content = Column(Text, nullable=True)
     
     # Blockchain verification
-    blockchain_tx_hash = Column(String, nullable=True, index=True)
+    blockchain_tx_hash = Column(String, nullable=True)
     structure_hash = Column(String, nullable=True)
     report_hash = Column(String, nullable=True)
     
@@ -55,10 +90,23 @@ class Job(Base):
     error_message = Column(Text, nullable=True)
     progress = Column(Float, nullable=True, default=0.0)  # Progress percentage (0-100)
     progress_message = Column(String, nullable=True)  # Human-readable progress message
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(
+        DateTime(timezone=True).with_variant(_SQLITE_SECONDS_DATETIME, "sqlite"),
+        server_default=func.now(),
+        index=True,
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
 # Add composite indexes for common query patterns
 Index('idx_job_status_created', Job.status, Job.created_at)
 Index('idx_job_type_status', Job.job_type, Job.status)
+# Keyset pagination for job listings: ORDER BY created_at DESC, id DESC
+Index('idx_job_created_id', Job.created_at.desc(), Job.id.desc())
+# Most jobs are never written to the blockchain, so only index rows that have a hash
+Index(
+    'idx_job_blockchain_tx_notnull',
+    Job.blockchain_tx_hash,
+    postgresql_where=Job.blockchain_tx_hash.isnot(None),
+    sqlite_where=Job.blockchain_tx_hash.isnot(None),
+)
@@ -0,0 +1,293 @@
+"""
+Computation shared by the statistics endpoints.
+
+Everything here is synchronous and does no database access, so it can run on
+worker threads; routes/statistics.py does the querying and error reporting.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+import math
+import threading
+
+import numpy as np
+import orjson
+from sqlalchemy import Row
+
+from backend.services.docking import iter_mode_affinities
+
+logger = logging.getLogger(__name__)
+
+# numba is listed in requirements.txt and compiles the statistics kernels
+# below. Where it can't be installed (no llvmlite wheel for the platform) the
+# pure-NumPy versions are used instead; results are the same, only slower.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Order statistics reported, as fractions of n: min, q1/p25, median, q3/p75,
+# p90, p95, max
+_ORDER_FRACTIONS = np.array([0.0, 0.25, 0.5, 0.75, 0.9, 0.95, 1.0])
+# Tukey fences: values more than this many IQRs outside the quartiles are outliers
+_IQR_MULT = 1.5
+# Decimal places of reported statistics
+_DECIMALS = 4
+
+# Decoded JSON-string docking_results by (job id, updated_at), least recently
+# used first: key -> (hash of the raw string, decoded value). The raw string
+# itself isn't kept; its hash guards against two writes within the same
+# updated_at tick (SQLite stores whole seconds).
+_PARSED_CACHE_SIZE = 512
+_parsed_cache: "OrderedDict[Tuple[str, Optional[datetime]], Tuple[int, Any]]" = OrderedDict()
+# Compared jobs are summarized on worker threads
+_parsed_cache_lock = threading.Lock()
+
+def _parse_docking_results(raw: str) -> Any:
+    """Decode a JSON-string docking_results value."""
+    if IJSON_AVAILABLE:
+        try:
+            return _stream_results(raw)
+        except ijson.JSONError as e:
+            raise ValueError(str(e)) from e
+    return orjson.loads(raw)
+
+def _stream_results(raw: str) -> Any:
+    """
+    Decode only the per-ligand results of a docking_results JSON string.
+    
+    Instead of materializing the whole document, the parse events are
+    skipped up to the top-level "results" value and just its items are
+    built. A document that isn't an object comes back as None, and a
+    non-list "results" as {"results": None}, so extract_affinities rejects
+    them exactly as it does fully decoded documents.
+    """
+    events = ijson.parse(raw.encode(), use_float=True)
+    for prefix, event, _ in events:
+        if prefix == "":
+            if event in ("start_map", "map_key"):
+                continue
+            if event == "end_map":
+                break
+            return None
+        if prefix == "results":
+            if event != "start_array":
+                return {"results": None}
+            return {"results": list(ijson.items(events, "results.item"))}
+    return {"results": []}
+
+def _load_docking_results(job: Row) -> Any:
+    """
+    Return job.docking_results as decoded JSON.
+    
+    The JSON column normally comes back already decoded; older rows that hold
+    a JSON-encoded string are parsed once per (job id, updated_at) and the
+    result is shared between requests, so callers must not mutate it.
+    """
+    raw = job.docking_results
+    if not isinstance(raw, str):
+        return raw
+    
+    key = (job.id, job.updated_at)
+    fingerprint = hash(raw)
+    with _parsed_cache_lock:
+        cached = _parsed_cache.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            _parsed_cache.move_to_end(key)
+            return cached[1]
+    
+    parsed = _parse_docking_results(raw)
+    with _parsed_cache_lock:
+        _parsed_cache[key] = (fingerprint, parsed)
+        _parsed_cache.move_to_end(key)
+        while len(_parsed_cache) > _PARSED_CACHE_SIZE:
+            _parsed_cache.popitem(last=False)
+    return parsed
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _moments(a: np.ndarray, lower: float, upper: float) -> Tuple[float, float, int]:
+        """Sum, sum of squares and count outside [lower, upper] in one pass."""
+        total = 0.0
+        sum_sq = 0.0
+        outliers = 0
+        for x in a:
+            total += x
+            sum_sq += x * x
+            if x < lower or x > upper:
+                outliers += 1
+        return total, sum_sq, outliers
+else:
+    def _moments(a: np.ndarray, lower: float, upper: float) -> Tuple[float, float, int]:
+        """Sum, sum of squares and count outside [lower, upper]."""
+        # Uncompiled, a Python loop is far slower than three vectorized passes
+        return a.sum(), a @ a, np.count_nonzero((a < lower) | (a > upper))
+
+def _affinity_stats(a: np.ndarray) -> Tuple[float, float, float, float, float, float, float, float, float, int]:
+    """
+    Summary statistics of a non-empty float64 array of binding affinities.
+    
+    Written against the numba-supported subset of NumPy so it can be
+    compiled with njit when numba is installed.
+    
+    Returns:
+        (mean, variance, min, q1, median, q3, p90, p95, max, outlier_count)
+    """
+    n = a.size
+    
+    # Only a handful of order statistics are reported, so select them
+    # with one introselect pass instead of sorting the whole array: the
+    # _ORDER_FRACTIONS positions plus the lower middle element for
+    # even-length medians. Clamping to n - 1 stands in for
+    # the small-n special cases (e.g. p95 is the max below 20 values).
+    kths = np.empty(8, dtype=np.int64)
+    kths[:7] = np.minimum((n * _ORDER_FRACTIONS).astype(np.int64), n - 1)
+    kths[7] = (n - 1) // 2
+    selected = np.partition(a, np.unique(kths))[kths]
+    median = selected[2] if n % 2 == 1 else (selected[7] + selected[2]) / 2
+    q1 = selected[1]
+    q3 = selected[3]
+    iqr = q3 - q1
+    
+    # Sum, sum of squares and outlier count, fused into one more pass
+    total, sum_sq, outlier_count = _moments(a, q1 - _IQR_MULT * iqr, q3 + _IQR_MULT * iqr)
+    mean = total / n
+    
+    # Var = (sum(x^2) - n * mean^2) / (n - 1), clamped at 0 against
+    # rounding when all values are (nearly) equal
+    variance = 0.0
+    if n > 1:
+        variance = max((sum_sq - total * mean) / (n - 1), 0.0)
+    
+    return (
+        float(mean), float(variance), float(selected[0]), float(q1), float(median),
+        float(q3), float(selected[4]), float(selected[5]), float(selected[6]),
+        int(outlier_count),
+    )
+
+if NUMBA_AVAILABLE:
+    _affinity_stats = njit(cache=True)(_affinity_stats)
+    # Compile at import rather than on the first request
+    _affinity_stats(np.zeros(1))
+
+def extract_affinities(job: Row) -> Optional[Iterable[float]]:
+    """
+    Return a job's binding affinities.
+    
+    Affinities are flattened when the docking results are stored; rows
+    written before that still need extracting from the document.
+    
+    Args:
+        job: Row with id, updated_at, binding_affinities and docking_results
+        
+    Returns:
+        The stored list or a lazy iterator over the document's affinities;
+        None if the job has no docking results
+        
+    Raises:
+        ValueError: If the results document is malformed; the message is
+            suitable for returning to the client
+    """
+    if job.binding_affinities is not None:
+        return job.binding_affinities
+    
+    if not job.docking_results:
+        return None
+    
+    try:
+        docking_results = _load_docking_results(job)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Failed to parse docking results for job {job.id}: {str(e)}")
+        raise ValueError("Invalid docking results format") from e
+    
+    if not isinstance(docking_results, dict):
+        raise ValueError("Docking results must be a dictionary")
+    
+    if not isinstance(docking_results.get("results", []), list):
+        raise ValueError("Docking results must contain a 'results' list")
+    
+    return iter_mode_affinities(docking_results)
+
+def compute_stats(affinities: Iterable[float]) -> Optional[Dict[str, Any]]:
+    """
+    Summary statistics, percentiles and IQR outliers of a job's affinities.
+    
+    Returns:
+        The "statistics" and "outliers" sections of the job statistics
+        response, or None if there are no affinities
+    """
+    a = np.fromiter(affinities, dtype=np.float64)
+    n = a.size
+    if not n:
+        return None
+    
+    mean, variance, lo, q1, median, q3, p90, p95, hi, outlier_count = _affinity_stats(a)
+    std_dev = variance ** 0.5
+    iqr = q3 - q1
+    lower_bound = q1 - _IQR_MULT * iqr
+    upper_bound = q3 + _IQR_MULT * iqr
+    
+    # Round every reported value in one vectorized call
+    (mean, median, std_dev, variance, lo, hi, value_range, q1, q3, iqr,
+     p90, p95, lower_bound, upper_bound) = np.round([
+        mean, median, std_dev, variance, lo, hi, hi - lo, q1, q3, iqr,
+        p90, p95, lower_bound, upper_bound,
+    ], _DECIMALS).tolist()
+    
+    return {
+        "statistics": {
+            "count": n,
+            "mean": mean,
+            "median": median,
+            "std_dev": std_dev,
+            "variance": variance,
+            "min": lo,
+            "max": hi,
+            "range": value_range,
+            "q1": q1,
+            "q2": median,
+            "q3": q3,
+            "iqr": iqr,
+            "p25": q1,
+            "p50": median,
+            "p75": q3,
+            "p90": p90,
+            "p95": p95,
+        },
+        "outliers": {
+            "lower_bound": lower_bound,
+            "upper_bound": upper_bound,
+            "count": outlier_count,
+        }
+    }
+
+def compute_brief_stats(affinities: Iterable[float]) -> Optional[Tuple[int, float, float]]:
+    """
+    Count, mean and minimum (best score) of a job's affinities.
+    
+    Takes a single pass and never collects the affinities into a list.
+    
+    Returns:
+        (count, mean, min), or None if there are no affinities
+    """
+    n = 0
+    total = 0.0
+    min_score = math.inf
+    for affinity in affinities:
+        n += 1
+        total += affinity
+        if affinity < min_score:
+            min_score = affinity
+    
+    if not n:
+        return None
+    return n, total / n, min_score
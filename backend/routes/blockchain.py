@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.exc import SQLAlchemyError
 import logging
+import uuid
 
 from backend.services.blockchain import verify_blockchain_record
 from backend.database import async_session_maker
@@ -10,6 +11,34 @@ from backend.models import Job
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Solana transaction signatures are base58 strings; reject anything else
+# before spending an RPC round-trip on it. translate() strips every allowed
+# character, so a non-empty result means the hash contains invalid ones.
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_B58_STRIP = str.maketrans("", "", _B58_ALPHABET)
+_MIN_TX_HASH_LEN = 44
+_MAX_TX_HASH_LEN = 88
+# Placeholder hashes written by store_on_blockchain() when Solana is not configured
+_MOCK_TX_PREFIXES = ("mock_tx_", "error_mock_")
+
+
+def _is_valid_tx_hash(tx_hash: str) -> bool:
+    """Check that a transaction hash looks like a base58 signature (or a mock hash)."""
+    if tx_hash.startswith(_MOCK_TX_PREFIXES):
+        return True
+    return (
+        _MIN_TX_HASH_LEN <= len(tx_hash) <= _MAX_TX_HASH_LEN
+        and not tx_hash.translate(_B58_STRIP)
+    )
+
+# Built once so SQLAlchemy's compiled-statement cache is hit on every request.
+# Only the hash columns are selected; the large JSON/Text columns are never loaded.
+_JOB_HASHES_BY_ID_STMT = select(
+    Job.blockchain_tx_hash,
+    Job.structure_hash,
+    Job.report_hash,
+).where(Job.id == bindparam("job_id"))
+
 @router.get("/blockchain/verify/{tx_hash}")
 async def verify_transaction(tx_hash: str):
     """Verify a blockchain transaction"""
@@ -17,6 +46,9 @@ async def verify_transaction(tx_hash: str):
     if not tx_hash or not tx_hash.strip():
         raise HTTPException(status_code=400, detail="Transaction hash is required")
     
+    if not _is_valid_tx_hash(tx_hash):
+        raise HTTPException(status_code=400, detail="Invalid transaction hash format")
+    
     try:
         result = await verify_blockchain_record(tx_hash)
         return result
@@ -25,25 +57,25 @@ async def verify_transaction(tx_hash: str):
         raise HTTPException(status_code=500, detail=f"Error verifying transaction: {str(e)}")
 
 @router.get("/blockchain/job/{job_id}")
-async def get_job_blockchain_record(job_id: str):
+async def get_job_blockchain_record(job_id: uuid.UUID):
     """Get blockchain record for a specific job"""
-    
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
+    job_id = str(job_id)
     
     try:
         async with async_session_maker() as session:
             try:
-                result = await session.execute(select(Job).where(Job.id == job_id))
-                job = result.scalar_one_or_none()
+                result = await session.execute(_JOB_HASHES_BY_ID_STMT, {"job_id": job_id})
+                row = result.one_or_none()
             except SQLAlchemyError as e:
                 logger.error(f"Database error getting job {job_id}: {str(e)}")
                 raise HTTPException(status_code=500, detail="Database error retrieving job")
             
-            if not job:
+            if row is None:
                 raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
             
-            if not job.blockchain_tx_hash:
+            tx_hash, structure_hash, report_hash = row
+            
+            if not tx_hash:
                 return {
                     "job_id": job_id,
                     "has_blockchain_record": False,
@@ -51,22 +83,22 @@ async def get_job_blockchain_record(job_id: str):
                 }
             
             try:
-                verification = await verify_blockchain_record(job.blockchain_tx_hash)
+                verification = await verify_blockchain_record(tx_hash)
             except Exception as e:
                 logger.error(f"Error verifying blockchain record for job {job_id}: {str(e)}")
                 # Return partial result even if verification fails
                 verification = {
                     "verified": False,
                     "message": f"Verification error: {str(e)}",
-                    "tx_hash": job.blockchain_tx_hash
+                    "tx_hash": tx_hash
                 }
             
             return {
                 "job_id": job_id,
                 "has_blockchain_record": True,
-                "tx_hash": job.blockchain_tx_hash,
-                "structure_hash": job.structure_hash,
-                "report_hash": job.report_hash,
+                "tx_hash": tx_hash,
+                "structure_hash": structure_hash,
+                "report_hash": report_hash,
                 "verification": verification
             }
     except HTTPException:
@@ -2,9 +2,13 @@
 External API routes.
 Provides endpoints for proxying requests to external APIs.
 """
-from fastapi import APIRouter, HTTPException, Query, Body, Header
-from typing import Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Body, Header, Request
+from typing import Dict, Any, Optional, Tuple
 from pydantic import BaseModel, Field
+import hashlib
+import orjson
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 
 from backend.services.external_api import (
     proxy_external_api,
@@ -16,10 +20,70 @@ from backend.services.external_api import (
     get_chembl_client,
     get_uniprot_client,
     get_pdb_client,
+    ExternalAPIClient,
 )
+from backend.services.external_cache import cached_get
+from backend.config import settings
 from backend.exceptions import ServiceError
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Chunk size when relaying streamed upstream responses
+STREAM_CHUNK_SIZE = 65536
+# Query values that enable streaming (?stream=1)
+_STREAM_FLAGS = ("1", "true", "yes")
+
+# Cache-Control max-age (seconds) for proxied GET responses. PubChem compounds
+# and PDB entries are effectively immutable; ChEMBL and UniProt data changes
+# with their releases.
+PROXY_MAX_AGE = {
+    "pubchem": 86400,
+    "pdb": 86400,
+    "chembl": 3600,
+    "uniprot": 3600,
+}
+
+
+def _split_stream_flag(request: Request) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Get upstream query params from the request, removing the local ?stream flag."""
+    params = dict(request.query_params)
+    stream = params.pop("stream", "").lower() in _STREAM_FLAGS
+    return params or None, stream
+
+
+async def _stream_upstream(
+    client: ExternalAPIClient,
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+) -> StreamingResponse:
+    """Relay an upstream response body as it arrives (chunked), without the success envelope."""
+    upstream = await client.open_stream(endpoint, params=params)
+    return StreamingResponse(
+        upstream.aiter_bytes(STREAM_CHUNK_SIZE),
+        media_type=upstream.headers.get("content-type", "application/json"),
+        background=BackgroundTask(upstream.aclose),
+    )
+
+
+def _cacheable_response(request: Request, api_name: str, result: Dict[str, Any]) -> Response:
+    """
+    Build a proxy response with ETag and Cache-Control headers.
+    
+    Returns 304 Not Modified when the client's If-None-Match already holds
+    the current ETag.
+    """
+    body = orjson.dumps({"success": True, "data": result})
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={PROXY_MAX_AGE[api_name]}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 class ExternalAPIRequest(BaseModel):
@@ -43,16 +107,27 @@ async def proxy_api(request: ExternalAPIRequest):
     which handles authentication, rate limiting, and error handling.
     """
     try:
-        result = await proxy_external_api(
-            api_name=request.api_name,
-            endpoint=request.endpoint,
-            method=request.method,
-            params=request.params,
-            json_data=request.json_data,
-            headers=request.headers,
-            api_key=request.api_key,
-            base_url=request.base_url,
-        )
+        async def fetch():
+            return await proxy_external_api(
+                api_name=request.api_name,
+                endpoint=request.endpoint,
+                method=request.method,
+                params=request.params,
+                json_data=request.json_data,
+                headers=request.headers,
+                api_key=request.api_key,
+                base_url=request.base_url,
+            )
+        
+        # Only cache plain GETs against the configured API; caller-supplied
+        # credentials, headers or base URLs may change the response.
+        if (
+            request.method.upper() == "GET"
+            and not (request.api_key or request.headers or request.base_url)
+        ):
+            result = await cached_get(request.api_name, request.endpoint, request.params, fetch)
+        else:
+            result = await fetch()
         return {
             "success": True,
             "data": result,
@@ -72,23 +147,28 @@ async def proxy_api(request: ExternalAPIRequest):
 @router.get("/external/pubchem/{endpoint:path}")
 async def pubchem_proxy(
     endpoint: str,
-    params: Optional[Dict[str, Any]] = Query(None),
+    request: Request,
 ):
     """
     Proxy request to PubChem API.
     
     Example: /api/external/pubchem/compound/name/aspirin/property/MolecularWeight,CanonicalSMILES/JSON
+    
+    Add ?stream=1 to relay the raw upstream body as it arrives (uncached, unwrapped).
     """
     try:
         client = get_pubchem_client()
         if not client:
             raise HTTPException(status_code=503, detail="PubChem API client not available")
         
-        result = await client.get(endpoint, params=params)
-        return {
-            "success": True,
-            "data": result,
-        }
+        params, stream = _split_stream_flag(request)
+        if stream:
+            return await _stream_upstream(client, endpoint, params)
+        
+        result = await cached_get(
+            "pubchem", endpoint, params, lambda: client.get(endpoint, params=params)
+        )
+        return _cacheable_response(request, "pubchem", result)
     except ExternalAPIError as e:
         raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
@@ -98,23 +178,28 @@ async def pubchem_proxy(
 @router.get("/external/chembl/{endpoint:path}")
 async def chembl_proxy(
     endpoint: str,
-    params: Optional[Dict[str, Any]] = Query(None),
+    request: Request,
 ):
     """
     Proxy request to ChEMBL API.
     
     Example: /api/external/chembl/molecule/CHEMBL25
+    
+    Add ?stream=1 to relay the raw upstream body as it arrives (uncached, unwrapped).
     """
     try:
         client = get_chembl_client()
         if not client:
             raise HTTPException(status_code=503, detail="ChEMBL API client not available")
         
-        result = await client.get(endpoint, params=params)
-        return {
-            "success": True,
-            "data": result,
-        }
+        params, stream = _split_stream_flag(request)
+        if stream:
+            return await _stream_upstream(client, endpoint, params)
+        
+        result = await cached_get(
+            "chembl", endpoint, params, lambda: client.get(endpoint, params=params)
+        )
+        return _cacheable_response(request, "chembl", result)
     except ExternalAPIError as e:
         raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
@@ -124,23 +209,28 @@ async def chembl_proxy(
 @router.get("/external/uniprot/{endpoint:path}")
 async def uniprot_proxy(
     endpoint: str,
-    params: Optional[Dict[str, Any]] = Query(None),
+    request: Request,
 ):
     """
     Proxy request to UniProt API.
     
     Example: /api/external/uniprot/uniprotkb/P04637
+    
+    Add ?stream=1 to relay the raw upstream body as it arrives (uncached, unwrapped).
     """
     try:
         client = get_uniprot_client()
         if not client:
             raise HTTPException(status_code=503, detail="UniProt API client not available")
         
-        result = await client.get(endpoint, params=params)
-        return {
-            "success": True,
-            "data": result,
-        }
+        params, stream = _split_stream_flag(request)
+        if stream:
+            return await _stream_upstream(client, endpoint, params)
+        
+        result = await cached_get(
+            "uniprot", endpoint, params, lambda: client.get(endpoint, params=params)
+        )
+        return _cacheable_response(request, "uniprot", result)
     except ExternalAPIError as e:
         raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
@@ -150,75 +240,85 @@ async def uniprot_proxy(
 @router.get("/external/pdb/{endpoint:path}")
 async def pdb_proxy(
     endpoint: str,
-    params: Optional[Dict[str, Any]] = Query(None),
+    request: Request,
 ):
     """
     Proxy request to PDB API.
     
     Example: /api/external/pdb/core/entry/1ABC
+    
+    Add ?stream=1 to relay the raw upstream body as it arrives (uncached, unwrapped).
     """
     try:
         client = get_pdb_client()
         if not client:
             raise HTTPException(status_code=503, detail="PDB API client not available")
         
-        result = await client.get(endpoint, params=params)
-        return {
-            "success": True,
-            "data": result,
-        }
+        params, stream = _split_stream_flag(request)
+        if stream:
+            return await _stream_upstream(client, endpoint, params)
+        
+        result = await cached_get(
+            "pdb", endpoint, params, lambda: client.get(endpoint, params=params)
+        )
+        return _cacheable_response(request, "pdb", result)
     except ExternalAPIError as e:
         raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+# The catalogue never changes at runtime, so it is encoded once at import
+_APIS_BODY = orjson.dumps({
+    "available_apis": [
+        {
+            "name": "pubchem",
+            "description": "PubChem - Chemical compound database",
+            "base_url": settings.PUBCHEM_BASE_URL,
+            "endpoints": [
+                "/compound/name/{name}/property/{properties}/JSON",
+                "/compound/cid/{cid}/property/{properties}/JSON",
+                "/compound/smiles/{smiles}/property/{properties}/JSON",
+            ],
+        },
+        {
+            "name": "chembl",
+            "description": "ChEMBL - Bioactive molecule database",
+            "base_url": settings.CHEMBL_BASE_URL,
+            "endpoints": [
+                "/molecule/{chembl_id}",
+                "/molecule?pref_name__icontains={name}",
+                "/activity?molecule_chembl_id={chembl_id}",
+            ],
+        },
+        {
+            "name": "uniprot",
+            "description": "UniProt - Protein sequence and function database",
+            "base_url": settings.UNIPROT_BASE_URL,
+            "endpoints": [
+                "/uniprotkb/{accession}",
+                "/uniprotkb/search?query={query}",
+                "/uniparc/{upi}",
+            ],
+        },
+        {
+            "name": "pdb",
+            "description": "Protein Data Bank - 3D structure database",
+            "base_url": settings.PDB_BASE_URL,
+            "endpoints": [
+                "/core/entry/{pdb_id}",
+                "/core/entry/{pdb_id}/polymer_entities",
+                "/core/entry/{pdb_id}/nonpolymer_entities",
+            ],
+        },
+    ],
+})
+_APIS_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+
 @router.get("/external/apis")
 async def list_available_apis():
     """
     List available external API integrations.
     """
-    return {
-        "available_apis": [
-            {
-                "name": "pubchem",
-                "description": "PubChem - Chemical compound database",
-                "base_url": "https://pubchem.ncbi.nlm.nih.gov/rest/pug",
-                "endpoints": [
-                    "/compound/name/{name}/property/{properties}/JSON",
-                    "/compound/cid/{cid}/property/{properties}/JSON",
-                    "/compound/smiles/{smiles}/property/{properties}/JSON",
-                ],
-            },
-            {
-                "name": "chembl",
-                "description": "ChEMBL - Bioactive molecule database",
-                "base_url": "https://www.ebi.ac.uk/chembl/api/data",
-                "endpoints": [
-                    "/molecule/{chembl_id}",
-                    "/molecule?pref_name__icontains={name}",
-                    "/activity?molecule_chembl_id={chembl_id}",
-                ],
-            },
-            {
-                "name": "uniprot",
-                "description": "UniProt - Protein sequence and function database",
-                "base_url": "https://rest.uniprot.org",
-                "endpoints": [
-                    "/uniprotkb/{accession}",
-                    "/uniprotkb/search?query={query}",
-                    "/uniparc/{upi}",
-                ],
-            },
-            {
-                "name": "pdb",
-                "description": "Protein Data Bank - 3D structure database",
-                "base_url": "https://data.rcsb.org/rest/v1",
-                "endpoints": [
-                    "/core/entry/{pdb_id}",
-                    "/core/entry/{pdb_id}/polymer_entities",
-                    "/core/entry/{pdb_id}/nonpolymer_entities",
-                ],
-            },
-        ],
-    }
+    return Response(content=_APIS_BODY, media_type="application/json", headers=_APIS_HEADERS)
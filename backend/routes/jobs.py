@@ -1,19 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Body, File, Form, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Body, File, Form, UploadFile
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from sqlalchemy import bindparam, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+import asyncio
+import base64
 import uuid
 import logging
 import json
+import time
 
-from backend.database import get_db
-from backend.schemas import JobCreate, JobResponse, AIAnalysisRequest, AIAnalysisResponse, AlphaFoldPredictionRequest, AlphaFoldPredictionResponse
-from backend.models import Job, JobType, JobStatus
-from backend.services.workflow import run_alphafold_then_dock, run_docking_only, run_alphafold_only
+import orjson
+
+from backend.database import get_db, get_db_ro
+from backend.schemas import JobCreate, JobResponse, JobSummary, AIAnalysisRequest, AIAnalysisResponse, AlphaFoldPredictionRequest, AlphaFoldPredictionResponse
+from backend.models import Job, JobType, JobStatus, new_job_id
+from backend.services.queue import submit_task, run_alphafold_only_task, run_alphafold_then_dock_task, run_docking_only_task
+from backend.services.job_writer import job_writer
 from backend.services.ai_report import (
     generate_structured_ai_analysis, 
     generate_ai_analysis_stream,
+    generate_ai_report_stream,
     generate_followup_response,
     generate_ensemble_analysis,
     get_conversation_history,
@@ -21,97 +32,235 @@ from backend.services.ai_report import (
     generate_comparative_analysis,
     AIReportError
 )
-from backend.exceptions import ValidationError, DatabaseError, NotFoundError
+from backend.exceptions import ValidationError, DatabaseError
+from backend.config import settings
+from backend.utils.concurrency import limit_concurrency
+from backend.utils.errors import handle_errors
 from backend.utils.docking_results_adapter import adapt_docking_results_for_frontend
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Job rows come from our own database, so the job endpoints serialize
+# them directly instead of re-validating every field against the schema
+_JOB_RESPONSE_FIELDS = tuple(JobResponse.model_fields)
+
+# Streamed analysis tokens are coalesced into one SSE event until this many
+# characters are buffered or this many seconds have passed since the last event
+SSE_FLUSH_CHARS = 256
+SSE_FLUSH_INTERVAL = 0.05
+# Tokens the LLM stream may run ahead of a slow client before it is paused
+SSE_QUEUE_SIZE = 32
+
+# Docking results don't change once a job has completed, so the adapted and
+# encoded /results payload is kept per job, keyed on updated_at to catch any
+# later write. job_id -> (updated_at, body), most recently used last
+RESULTS_CACHE_SIZE = 256
+RESULTS_MAX_AGE = 60
+_results_cache: "OrderedDict[str, Tuple[Optional[datetime], bytes]]" = OrderedDict()
+
+# Hot statements are built once at import and reused with bound parameters
+# Job listings select only the JobSummary columns, leaving large JSON/text
+# columns (ligand files, docking results, report content) in the database
+_LIST_JOBS_STMT = (
+    select(
+        Job.id, Job.job_name, Job.job_type, Job.status, Job.protein_sequence,
+        Job.plddt_score, Job.quality_metrics, Job.top_binding_score,
+        Job.blockchain_tx_hash, Job.error_message, Job.progress,
+        Job.progress_message, Job.created_at, Job.updated_at, Job.completed_at,
+    )
+    .order_by(Job.created_at.desc(), Job.id.desc())
+    .limit(bindparam("limit"))
+)
+_LIST_JOBS_AFTER_STMT = _LIST_JOBS_STMT.where(
+    tuple_(Job.created_at, Job.id) < tuple_(
+        bindparam("created_at", type_=Job.created_at.type),
+        bindparam("last_id", type_=Job.id.type),
+    )
+)
+# Retrying claims the job in one conditional UPDATE, so of several concurrent
+# retries only the one that flips it out of FAILED gets a row back
+_RETRY_JOB_STMT = (
+    update(Job)
+    .where(Job.id == bindparam("job_id"), Job.status == JobStatus.FAILED)
+    .values(status=JobStatus.SUBMITTED, error_message=None, progress=0.0, progress_message=None)
+    .returning(Job)
+    .execution_options(synchronize_session="fetch")
+)
+
+
+async def _load_job(db: AsyncSession, job_id: str) -> Job:
+    """
+    Load a job by primary key, or 404.
+    
+    Uses Session.get(), which checks the identity map before querying and
+    reuses SQLAlchemy's cached primary-key lookup statement.
+    """
+    job = await db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+async def get_job_or_404(job_id: uuid.UUID, db: AsyncSession = Depends(get_db_ro)) -> Job:
+    """
+    Dependency resolving the {job_id} path parameter to its Job.
+    
+    FastAPI rejects malformed IDs before this runs; unknown IDs return 404.
+    """
+    return await _load_job(db, str(job_id))
+
+
+async def get_job_or_404_rw(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> Job:
+    """get_job_or_404 on the read-write session, for routes that modify the job."""
+    return await _load_job(db, str(job_id))
+
+
+async def get_job_with_results(job: Job = Depends(get_job_or_404)) -> Job:
+    """Dependency returning the path job, or 400 if it has no docking results yet."""
+    if not job.docking_results:
+        raise HTTPException(
+            status_code=400,
+            detail="Job does not have docking results yet. Please wait for the job to complete.",
+        )
+    return job
+
+
+async def _drain_into_queue(stream: AsyncIterator[str], queue: asyncio.Queue) -> None:
+    """Feed chunks from an async stream into a queue, followed by a None end marker."""
+    try:
+        async for chunk in stream:
+            await queue.put(chunk)
+    except Exception:
+        # Wake the consumer; it picks up the error by awaiting this task
+        await queue.put(None)
+        raise
+    await queue.put(None)
+
+
+async def _sse_events(stream: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """
+    Relay text chunks from an LLM stream to the client as SSE events.
+    
+    Chunks are coalesced per SSE_FLUSH_CHARS/SSE_FLUSH_INTERVAL, and the stream
+    ends with a [DONE] event, or an error event if the producer fails.
+    """
+    buf = []
+    buffered = 0
+    last_flush = time.monotonic()
+    # The LLM stream is read by a separate task so it keeps fetching
+    # tokens while earlier events are still being written to the client
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+    producer = asyncio.create_task(_drain_into_queue(stream, queue))
+    try:
+        while (chunk := await queue.get()) is not None:
+            buf.append(chunk)
+            buffered += len(chunk)
+            now = time.monotonic()
+            if buffered >= SSE_FLUSH_CHARS or now - last_flush >= SSE_FLUSH_INTERVAL:
+                yield b"data: " + orjson.dumps({"chunk": "".join(buf)}) + b"\n\n"
+                buf.clear()
+                buffered = 0
+                last_flush = now
+        if buf:
+            yield b"data: " + orjson.dumps({"chunk": "".join(buf)}) + b"\n\n"
+        await producer
+        yield b"data: [DONE]\n\n"
+    except Exception as e:
+        logger.error(f"Error in streaming analysis: {str(e)}", exc_info=True)
+        yield b"data: " + orjson.dumps({"error": str(e)}) + b"\n\n"
+    finally:
+        producer.cancel()
+
+
+def _job_response(job: Job) -> ORJSONResponse:
+    """Encode a loaded Job row as a JobResponse body in a single orjson pass."""
+    return ORJSONResponse({name: getattr(job, name) for name in _JOB_RESPONSE_FIELDS})
+
+
+def _encode_cursor(created_at: datetime, job_id: str) -> str:
+    """Encode a job list position as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{job_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by _encode_cursor().
+    
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        created_at, job_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), job_id
+    except ValueError as e:
+        raise ValidationError("Invalid cursor") from e
+
+
 @router.post("/jobs", response_model=JobResponse)
-async def create_job(
-    job: JobCreate,
-    background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db)
-):
+@limit_concurrency(settings.MAX_CONCURRENT_JOB_SUBMISSIONS)
+@handle_errors
+async def create_job(job: JobCreate):
     """Create a new job for structure prediction and/or docking"""
     
+    # Validate input based on job type
+    if job.job_type == JobType.SEQUENCE_TO_DOCKING and not job.protein_sequence:
+        raise ValidationError("protein_sequence is required for SEQUENCE_TO_DOCKING jobs")
+    
+    if job.job_type == JobType.DOCKING_ONLY and not job.protein_pdb:
+        raise ValidationError("protein_pdb is required for DOCKING_ONLY jobs")
+    
+    # Validate ligand files
+    if not job.ligand_files or len(job.ligand_files) == 0:
+        raise ValidationError("At least one ligand file is required")
+    
+    # Validate docking parameters
+    if not job.docking_parameters:
+        raise ValidationError("Docking parameters are required")
+    
+    # Create job record (batched with other concurrent submissions)
+    job_id = new_job_id()
     try:
-        # Validate input based on job type
-        if job.job_type == JobType.SEQUENCE_TO_DOCKING and not job.protein_sequence:
-            raise ValidationError("protein_sequence is required for SEQUENCE_TO_DOCKING jobs")
-        
-        if job.job_type == JobType.DOCKING_ONLY and not job.protein_pdb:
-            raise ValidationError("protein_pdb is required for DOCKING_ONLY jobs")
-        
-        # Validate ligand files
-        if not job.ligand_files or len(job.ligand_files) == 0:
-            raise ValidationError("At least one ligand file is required")
-        
-        # Validate docking parameters
-        if not job.docking_parameters:
-            raise ValidationError("Docking parameters are required")
-        
-        # Create job record
-        job_id = str(uuid.uuid4())
-        db_job = Job(
+        db_job = await job_writer.insert(dict(
             id=job_id,
             job_name=job.job_name or f"Job {job_id[:8]}",
             job_type=job.job_type,
             protein_sequence=job.protein_sequence if job.job_type == JobType.SEQUENCE_TO_DOCKING else None,
             ligand_files=job.ligand_files,
             docking_parameters=job.docking_parameters
-        )
-        
-        try:
-            db.add(db_job)
-            await db.commit()
-            await db.refresh(db_job)
-        except SQLAlchemyError as e:
-            logger.error(f"Database error creating job: {str(e)}", exc_info=True)
-            await db.rollback()
-            raise DatabaseError(f"Failed to create job in database: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error creating job: {str(e)}", exc_info=True)
-            await db.rollback()
-            raise HTTPException(status_code=500, detail="Failed to create job")
-        
-        # Submit background task
-        try:
-            if job.job_type == JobType.SEQUENCE_TO_DOCKING:
-                background_tasks.add_task(
-                    run_alphafold_then_dock,
-                    job_id=job_id,
-                    sequence=job.protein_sequence,
-                    ligand_files=job.ligand_files,
-                    parameters=job.docking_parameters
-                )
-            else:
-                background_tasks.add_task(
-                    run_docking_only,
-                    job_id=job_id,
-                    protein_pdb=job.protein_pdb,
-                    ligand_files=job.ligand_files,
-                    parameters=job.docking_parameters
-                )
-        except Exception as e:
-            logger.error(f"Failed to submit background task for job {job_id}: {str(e)}", exc_info=True)
-            # Job is already created, so we log the error but don't fail the request
-            # The job will remain in queued state
-        
-        return db_job
-    except ValidationError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except DatabaseError as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        ))
+    except SQLAlchemyError as e:
+        logger.error(f"Database error creating job: {str(e)}", exc_info=True)
+        raise DatabaseError(f"Failed to create job in database: {str(e)}")
     except Exception as e:
-        logger.error(f"Unexpected error in create_job: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+        logger.error(f"Unexpected error creating job: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to create job")
+    
+    # Hand the workflow to the task queue; it runs in a Celery worker. The row
+    # is committed, so publishing can overlap with sending the response
+    if job.job_type == JobType.SEQUENCE_TO_DOCKING:
+        submit_task(
+            run_alphafold_then_dock_task,
+            job_id=job_id,
+            sequence=job.protein_sequence,
+            ligand_files=job.ligand_files,
+            parameters=job.docking_parameters
+        )
+    else:
+        submit_task(
+            run_docking_only_task,
+            job_id=job_id,
+            protein_pdb=job.protein_pdb,
+            ligand_files=job.ligand_files,
+            parameters=job.docking_parameters
+        )
+    
+    return _job_response(db_job)
 
 
 @router.post("/jobs/upload", response_model=JobResponse)
+@limit_concurrency(settings.MAX_CONCURRENT_JOB_SUBMISSIONS)
 async def create_job_upload(
-    background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db),
     job_name: str = Form(...),
     job_type: str = Form(...),
     protein_pdb: str | None = Form(None),
@@ -139,650 +288,380 @@ async def create_job_upload(
     except UnicodeDecodeError:
         raise HTTPException(status_code=400, detail="Ligand file must be UTF-8 text (SDF/MOL2)")
     ligand_files = [ligand_content]
-    job_id = str(uuid.uuid4())
-    db_job = Job(
-        id=job_id,
-        job_name=job_name or f"Job {job_id[:8]}",
-        job_type=JobType(job_type),
-        protein_sequence=protein_sequence.strip() if job_type == "sequence_to_docking" and protein_sequence else None,
-        ligand_files=ligand_files,
-        docking_parameters=params,
-    )
+    job_id = new_job_id()
     try:
-        db.add(db_job)
-        await db.commit()
-        await db.refresh(db_job)
+        db_job = await job_writer.insert(dict(
+            id=job_id,
+            job_name=job_name or f"Job {job_id[:8]}",
+            job_type=JobType(job_type),
+            protein_sequence=protein_sequence.strip() if job_type == "sequence_to_docking" and protein_sequence else None,
+            ligand_files=ligand_files,
+            docking_parameters=params,
+        ))
     except SQLAlchemyError as e:
         logger.error(f"Database error creating job: {str(e)}", exc_info=True)
-        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create job")
-    try:
-        if job_type == "sequence_to_docking":
-            background_tasks.add_task(
-                run_alphafold_then_dock,
-                job_id=job_id,
-                sequence=protein_sequence.strip(),
-                ligand_files=ligand_files,
-                parameters=params,
-            )
-        else:
-            background_tasks.add_task(
-                run_docking_only,
-                job_id=job_id,
-                protein_pdb=protein_pdb.strip(),
-                ligand_files=ligand_files,
-                parameters=params,
-            )
-    except Exception as e:
-        logger.error(f"Failed to submit background task for job {job_id}: {str(e)}", exc_info=True)
-    return db_job
+    if job_type == "sequence_to_docking":
+        submit_task(
+            run_alphafold_then_dock_task,
+            job_id=job_id,
+            sequence=protein_sequence.strip(),
+            ligand_files=ligand_files,
+            parameters=params,
+        )
+    else:
+        submit_task(
+            run_docking_only_task,
+            job_id=job_id,
+            protein_pdb=protein_pdb.strip(),
+            ligand_files=ligand_files,
+            parameters=params,
+        )
+    return _job_response(db_job)
 
 
 @router.get("/jobs/{job_id}", response_model=JobResponse)
-async def get_job(job_id: str, db: AsyncSession = Depends(get_db)):
+async def get_job(job: Job = Depends(get_job_or_404)):
     """Get job status and results"""
-    from sqlalchemy import select
-    
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
-    
-    # Validate UUID format
-    try:
-        uuid.UUID(job_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid job ID format")
-    
-    try:
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        
-        if not job:
-            raise NotFoundError(f"Job not found: {job_id}")
-        
-        return job
-    except NotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except SQLAlchemyError as e:
-        logger.error(f"Database error getting job {job_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Database error retrieving job")
-    except Exception as e:
-        logger.error(f"Unexpected error getting job {job_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return _job_response(job)
 
 
 @router.get("/jobs/{job_id}/results")
-async def get_job_results(job_id: str, db: AsyncSession = Depends(get_db)):
+@handle_errors
+async def get_job_results(job: Job = Depends(get_job_with_results)):
     """Get docking results for a completed job in frontend-friendly format."""
-    from sqlalchemy import select
-
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
-    try:
-        uuid.UUID(job_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid job ID format")
-
-    try:
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        if not job:
-            raise NotFoundError(f"Job not found: {job_id}")
-        if not job.docking_results:
-            raise HTTPException(
-                status_code=400,
-                detail="Job does not have docking results yet. Please wait for the job to complete.",
-            )
+    cached = _results_cache.get(job.id)
+    if cached is not None and cached[0] == job.updated_at:
+        _results_cache.move_to_end(job.id)
+        body = cached[1]
+    else:
         dr = job.docking_results if isinstance(job.docking_results, dict) else {}
         adapted = adapt_docking_results_for_frontend(
-            job_id=job_id,
+            job_id=job.id,
             docking_results=dr,
             protein_structure="",
             ligand_structure="",
         )
-        return adapted
-    except NotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error getting results for job {job_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+        body = orjson.dumps(adapted)
+        if job.status == JobStatus.COMPLETED:
+            _results_cache[job.id] = (job.updated_at, body)
+            _results_cache.move_to_end(job.id)
+            while len(_results_cache) > RESULTS_CACHE_SIZE:
+                _results_cache.popitem(last=False)
+    headers = {"Cache-Control": f"public, max-age={RESULTS_MAX_AGE}"} if job.status == JobStatus.COMPLETED else None
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
-@router.get("/jobs", response_model=List[JobResponse])
-async def list_jobs(db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 20):
-    """List all jobs"""
-    from sqlalchemy import select
+@router.get("/jobs", response_model=List[JobSummary])
+@handle_errors
+async def list_jobs(
+    db: AsyncSession = Depends(get_db_ro),
+    cursor: Optional[str] = None,
+    limit: int = 20
+):
+    """
+    List jobs, newest first.
     
-    try:
-        if skip < 0:
-            raise ValidationError("skip must be non-negative")
-        
-        if limit < 1 or limit > 100:
-            raise ValidationError("limit must be between 1 and 100")
-        
-        result = await db.execute(select(Job).offset(skip).limit(limit).order_by(Job.created_at.desc()))
-        jobs = result.scalars().all()
-        
-        return jobs
-    except ValidationError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except SQLAlchemyError as e:
-        logger.error(f"Database error listing jobs: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Database error retrieving jobs")
-    except Exception as e:
-        logger.error(f"Unexpected error listing jobs: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+    Pagination is keyset-based: when more jobs may follow, the X-Next-Cursor
+    response header holds the cursor to pass back for the next page.
+    """
+    if limit < 1 or limit > 100:
+        raise ValidationError("limit must be between 1 and 100")
+    
+    if cursor:
+        created_at, last_id = _decode_cursor(cursor)
+        result = await db.execute(
+            _LIST_JOBS_AFTER_STMT,
+            {"limit": limit, "created_at": created_at, "last_id": last_id},
+        )
+    else:
+        result = await db.execute(_LIST_JOBS_STMT, {"limit": limit})
+    jobs = result.all()
+    
+    response = ORJSONResponse([row._asdict() for row in jobs])
+    if len(jobs) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(jobs[-1].created_at, jobs[-1].id)
+    
+    return response
 
 @router.post("/jobs/{job_id}/retry", response_model=JobResponse)
+@handle_errors
 async def retry_job(
-    job_id: str,
-    background_tasks: BackgroundTasks,
+    job: Job = Depends(get_job_or_404_rw),
     db: AsyncSession = Depends(get_db),
 ):
     """Retry a failed job with the same inputs."""
-    from sqlalchemy import select
-
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
-    try:
-        uuid.UUID(job_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid job ID format")
-
-    try:
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        if not job:
-            raise NotFoundError(f"Job not found: {job_id}")
-        if job.status != JobStatus.FAILED:
-            raise HTTPException(
-                status_code=400,
-                detail="Only failed jobs can be retried.",
-            )
-        if not job.ligand_files or not job.docking_parameters:
-            raise HTTPException(
-                status_code=400,
-                detail="Job missing ligand files or docking parameters; cannot retry.",
-            )
-        job_type = job.job_type
-        if job_type == JobType.SEQUENCE_TO_DOCKING and not job.protein_sequence:
+    job_id = job.id
+    if job.status != JobStatus.FAILED:
+        raise HTTPException(
+            status_code=400,
+            detail="Only failed jobs can be retried.",
+        )
+    if not job.ligand_files or not job.docking_parameters:
+        raise HTTPException(
+            status_code=400,
+            detail="Job missing ligand files or docking parameters; cannot retry.",
+        )
+    job_type = job.job_type
+    if job_type == JobType.SEQUENCE_TO_DOCKING and not job.protein_sequence:
+        raise HTTPException(
+            status_code=400,
+            detail="Sequence-to-docking job missing protein sequence; cannot retry.",
+        )
+    if job_type == JobType.DOCKING_ONLY:
+        pdb_path = job.protein_pdb_path
+        if not pdb_path or not Path(pdb_path).exists():
             raise HTTPException(
                 status_code=400,
-                detail="Sequence-to-docking job missing protein sequence; cannot retry.",
-            )
-        if job_type == JobType.DOCKING_ONLY:
-            from pathlib import Path
-            pdb_path = job.protein_pdb_path
-            if not pdb_path or not Path(pdb_path).exists():
-                raise HTTPException(
-                    status_code=400,
-                    detail="Docking-only job missing or invalid protein PDB file; cannot retry.",
-                )
-            import aiofiles
-            async with aiofiles.open(pdb_path, "r") as f:
-                protein_pdb = await f.read()
-        else:
-            protein_pdb = None
-
-        job.status = JobStatus.SUBMITTED
-        job.error_message = None
-        job.progress = 0.0
-        job.progress_message = None
-        await db.commit()
-        await db.refresh(job)
-
-        if job_type == JobType.SEQUENCE_TO_DOCKING:
-            background_tasks.add_task(
-                run_alphafold_then_dock,
-                job_id=job_id,
-                sequence=job.protein_sequence,
-                ligand_files=job.ligand_files,
-                parameters=job.docking_parameters,
+                detail="Docking-only job missing or invalid protein PDB file; cannot retry.",
             )
-        else:
-            background_tasks.add_task(
-                run_docking_only,
-                job_id=job_id,
-                protein_pdb=protein_pdb,
-                ligand_files=job.ligand_files,
-                parameters=job.docking_parameters,
-            )
-        return job
-    except NotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error retrying job {job_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+
+    result = await db.execute(_RETRY_JOB_STMT, {"job_id": job_id})
+    job = result.scalar_one_or_none()
+    if job is None:
+        raise HTTPException(status_code=409, detail="Job is already being retried.")
+    await db.commit()
+
+    if job_type == JobType.SEQUENCE_TO_DOCKING:
+        submit_task(
+            run_alphafold_then_dock_task,
+            job_id=job_id,
+            sequence=job.protein_sequence,
+            ligand_files=job.ligand_files,
+            parameters=job.docking_parameters,
+        )
+    else:
+        # The worker reads the saved PDB itself; only its path is queued
+        submit_task(
+            run_docking_only_task,
+            job_id=job_id,
+            protein_pdb=None,
+            protein_pdb_path=job.protein_pdb_path,
+            ligand_files=job.ligand_files,
+            parameters=job.docking_parameters,
+        )
+    return _job_response(job)
 
 
 @router.post("/jobs/{job_id}/analyze", response_model=AIAnalysisResponse)
+@handle_errors
 async def analyze_job(
-    job_id: str,
     analysis_request: AIAnalysisRequest = Body(...),
-    db: AsyncSession = Depends(get_db)
+    job: Job = Depends(get_job_with_results)
 ):
     """Generate AI analysis for a completed job"""
-    from sqlalchemy import select
-    
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
-    
-    # Validate UUID format
-    try:
-        uuid.UUID(job_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid job ID format")
-    
     try:
-        # Get job from database
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        
-        if not job:
-            raise NotFoundError(f"Job not found: {job_id}")
-        
-        # Check if job has docking results
-        if not job.docking_results:
-            raise HTTPException(
-                status_code=400,
-                detail="Job does not have docking results yet. Please wait for the job to complete."
-            )
-        
         # Generate structured AI analysis
-        try:
-            analysis_result = await generate_structured_ai_analysis(
-                job_id=job_id,
-                sequence=job.protein_sequence,
-                plddt_score=job.plddt_score,
-                docking_results=job.docking_results,
-                analysis_type=analysis_request.analysis_type,
-                custom_prompt=analysis_request.custom_prompt,
-                stakeholder_type=analysis_request.stakeholder_type
-            )
-            
-            # Ensure response matches expected format
-            if "analysis" not in analysis_result:
-                # Handle case where function returns different structure
-                analysis_result = {
-                    "analysis": analysis_result,
-                    "recommendations": analysis_result.get("recommendations", []),
-                    "confidence": analysis_result.get("confidence", 0.75),
-                    "metadata": analysis_result.get("metadata", {})
-                }
-            
-            return analysis_result
-        except AIReportError as e:
-            logger.error(f"AI analysis error for job {job_id}: {str(e)}", exc_info=True)
-            raise HTTPException(status_code=500, detail=f"AI analysis failed: {str(e)}")
+        analysis_result = await generate_structured_ai_analysis(
+            job_id=job.id,
+            sequence=job.protein_sequence,
+            plddt_score=job.plddt_score,
+            docking_results=job.docking_results,
+            analysis_type=analysis_request.analysis_type,
+            custom_prompt=analysis_request.custom_prompt,
+            stakeholder_type=analysis_request.stakeholder_type
+        )
         
-    except NotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error analyzing job {job_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+        # Ensure response matches expected format
+        if "analysis" not in analysis_result:
+            # Handle case where function returns different structure
+            analysis_result = {
+                "analysis": analysis_result,
+                "recommendations": analysis_result.get("recommendations", []),
+                "confidence": analysis_result.get("confidence", 0.75),
+                "metadata": analysis_result.get("metadata", {})
+            }
+        
+        return analysis_result
+    except AIReportError as e:
+        logger.error(f"AI analysis error for job {job.id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"AI analysis failed: {str(e)}")
 
 @router.post("/jobs/{job_id}/analyze/stream")
 async def analyze_job_stream(
-    job_id: str,
     analysis_request: AIAnalysisRequest = Body(...),
-    db: AsyncSession = Depends(get_db)
+    job: Job = Depends(get_job_with_results)
 ):
     """Generate AI analysis with streaming support for real-time updates"""
-    from sqlalchemy import select
-    
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
-    
-    try:
-        uuid.UUID(job_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid job ID format")
-    
-    try:
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        
-        if not job:
-            raise NotFoundError(f"Job not found: {job_id}")
-        
-        if not job.docking_results:
-            raise HTTPException(
-                status_code=400,
-                detail="Job does not have docking results yet. Please wait for the job to complete."
-            )
-        
-        async def generate():
-            try:
-                async for chunk in generate_ai_analysis_stream(
-                    job_id=job_id,
-                    sequence=job.protein_sequence,
-                    plddt_score=job.plddt_score,
-                    docking_results=job.docking_results,
-                    analysis_type=analysis_request.analysis_type,
-                    custom_prompt=analysis_request.custom_prompt,
-                    stakeholder_type=analysis_request.stakeholder_type
-                ):
-                    yield f"data: {json.dumps({'chunk': chunk})}\n\n"
-                yield "data: [DONE]\n\n"
-            except Exception as e:
-                logger.error(f"Error in streaming analysis: {str(e)}", exc_info=True)
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
-        
-        return StreamingResponse(generate(), media_type="text/event-stream")
-        
-    except NotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error streaming analysis for job {job_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+    stream = generate_ai_analysis_stream(
+        job_id=job.id,
+        sequence=job.protein_sequence,
+        plddt_score=job.plddt_score,
+        docking_results=job.docking_results,
+        analysis_type=analysis_request.analysis_type,
+        custom_prompt=analysis_request.custom_prompt,
+        stakeholder_type=analysis_request.stakeholder_type
+    )
+    return StreamingResponse(_sse_events(stream), media_type="text/event-stream")
+
+@router.get("/jobs/{job_id}/report/stream")
+async def stream_job_report(
+    stakeholder: str = "researcher",
+    job: Job = Depends(get_job_with_results)
+):
+    """Stream the markdown AI report for a completed job as it is generated"""
+    stream = generate_ai_report_stream(
+        job_id=job.id,
+        sequence=job.protein_sequence,
+        plddt_score=job.plddt_score,
+        docking_results=job.docking_results,
+        stakeholder=stakeholder
+    )
+    return StreamingResponse(_sse_events(stream), media_type="text/event-stream")
 
 @router.post("/jobs/{job_id}/analyze/ensemble")
+@handle_errors
 async def analyze_job_ensemble(
-    job_id: str,
     analysis_request: AIAnalysisRequest = Body(...),
-    db: AsyncSession = Depends(get_db)
+    job: Job = Depends(get_job_with_results)
 ):
     """Generate AI analysis using multiple models and combine insights"""
-    from sqlalchemy import select
-    
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
-    
-    try:
-        uuid.UUID(job_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    ensemble_result = await generate_ensemble_analysis(
+        job_id=job.id,
+        sequence=job.protein_sequence,
+        plddt_score=job.plddt_score,
+        docking_results=job.docking_results,
+        analysis_type=analysis_request.analysis_type,
+        stakeholder_type=analysis_request.stakeholder_type
+    )
     
-    try:
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        
-        if not job:
-            raise NotFoundError(f"Job not found: {job_id}")
-        
-        if not job.docking_results:
-            raise HTTPException(
-                status_code=400,
-                detail="Job does not have docking results yet. Please wait for the job to complete."
-            )
-        
-        ensemble_result = await generate_ensemble_analysis(
-            job_id=job_id,
-            sequence=job.protein_sequence,
-            plddt_score=job.plddt_score,
-            docking_results=job.docking_results,
-            analysis_type=analysis_request.analysis_type,
-            stakeholder_type=analysis_request.stakeholder_type
-        )
-        
-        return ensemble_result
-        
-    except NotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in ensemble analysis for job {job_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return ensemble_result
 
 @router.post("/jobs/{job_id}/analyze/followup")
+@handle_errors
 async def analyze_job_followup(
-    job_id: str,
     question: str = Body(..., embed=True),
     stakeholder_type: str = Body(default="researcher", embed=True),
-    db: AsyncSession = Depends(get_db)
+    job: Job = Depends(get_job_with_results)
 ):
     """Generate a follow-up response to a question about the docking results"""
-    from sqlalchemy import select
-    
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
-    
     if not question or not question.strip():
         raise HTTPException(status_code=400, detail="Question is required")
     
-    try:
-        uuid.UUID(job_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    followup_result = await generate_followup_response(
+        job_id=job.id,
+        question=question,
+        docking_results=job.docking_results,
+        stakeholder_type=stakeholder_type
+    )
     
-    try:
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        
-        if not job:
-            raise NotFoundError(f"Job not found: {job_id}")
-        
-        if not job.docking_results:
-            raise HTTPException(
-                status_code=400,
-                detail="Job does not have docking results yet. Please wait for the job to complete."
-            )
-        
-        followup_result = await generate_followup_response(
-            job_id=job_id,
-            question=question,
-            docking_results=job.docking_results,
-            stakeholder_type=stakeholder_type
-        )
-        
-        return followup_result
-        
-    except NotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in follow-up analysis for job {job_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return followup_result
 
 @router.get("/jobs/{job_id}/conversation")
-async def get_job_conversation(
-    job_id: str,
-    db: AsyncSession = Depends(get_db)
-):
+@handle_errors
+async def get_job_conversation(job: Job = Depends(get_job_or_404)):
     """Get conversation history for a job"""
-    from sqlalchemy import select
-    
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
-    
-    try:
-        uuid.UUID(job_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid job ID format")
-    
-    try:
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        
-        if not job:
-            raise NotFoundError(f"Job not found: {job_id}")
-        
-        history = get_conversation_history(job_id)
-        return {"job_id": job_id, "conversation_history": history}
-        
-    except NotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error getting conversation for job {job_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+    # In-memory lookup; no I/O, so it runs inline on the event loop
+    history = get_conversation_history(job.id)
+    return {"job_id": job.id, "conversation_history": history}
 
 @router.get("/jobs/{job_id}/visualizations/suggestions")
+@handle_errors
 async def get_visualization_suggestions(
-    job_id: str,
     analysis_type: str = "comprehensive",
-    db: AsyncSession = Depends(get_db)
+    job: Job = Depends(get_job_with_results)
 ):
     """Get AI-powered visualization suggestions for a job"""
-    from sqlalchemy import select
-    
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
-    
-    try:
-        uuid.UUID(job_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    suggestions = await suggest_visualizations(
+        docking_results=job.docking_results,
+        analysis_type=analysis_type
+    )
     
-    try:
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        
-        if not job:
-            raise NotFoundError(f"Job not found: {job_id}")
-        
-        if not job.docking_results:
-            raise HTTPException(
-                status_code=400,
-                detail="Job does not have docking results yet. Please wait for the job to complete."
-            )
-        
-        suggestions = await suggest_visualizations(
-            docking_results=job.docking_results,
-            analysis_type=analysis_type
-        )
-        
-        return {"job_id": job_id, "suggestions": suggestions}
-        
-    except NotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error getting visualization suggestions for job {job_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return {"job_id": job.id, "suggestions": suggestions}
 
 @router.post("/jobs/compare")
+@handle_errors
 async def compare_jobs(
-    job_ids: List[str] = Body(..., embed=True),
+    job_ids: List[uuid.UUID] = Body(..., embed=True),
     stakeholder_type: str = Body(default="researcher", embed=True),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """Generate comparative analysis across multiple jobs"""
-    from sqlalchemy import select
-    
     if not job_ids or len(job_ids) < 2:
         raise HTTPException(status_code=400, detail="At least 2 job IDs required for comparison")
     
-    try:
-        for job_id in job_ids:
-            uuid.UUID(job_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    docking_results_list = []
+    valid_job_ids = []
     
-    try:
-        docking_results_list = []
-        valid_job_ids = []
+    for job_id in map(str, job_ids):
+        job = await db.get(Job, job_id)
         
-        for job_id in job_ids:
-            result = await db.execute(select(Job).where(Job.id == job_id))
-            job = result.scalar_one_or_none()
-            
-            if not job:
-                logger.warning(f"Job not found: {job_id}, skipping")
-                continue
-            
-            if not job.docking_results:
-                logger.warning(f"Job {job_id} does not have docking results, skipping")
-                continue
-            
-            docking_results_list.append(job.docking_results)
-            valid_job_ids.append(job_id)
+        if not job:
+            logger.warning(f"Job not found: {job_id}, skipping")
+            continue
         
-        if len(valid_job_ids) < 2:
-            raise HTTPException(
-                status_code=400,
-                detail="At least 2 jobs with docking results required for comparison"
-            )
+        if not job.docking_results:
+            logger.warning(f"Job {job_id} does not have docking results, skipping")
+            continue
         
-        comparison_result = await generate_comparative_analysis(
-            job_ids=valid_job_ids,
-            docking_results_list=docking_results_list,
-            stakeholder_type=stakeholder_type
+        docking_results_list.append(job.docking_results)
+        valid_job_ids.append(job_id)
+    
+    if len(valid_job_ids) < 2:
+        raise HTTPException(
+            status_code=400,
+            detail="At least 2 jobs with docking results required for comparison"
         )
-        
-        return comparison_result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error comparing jobs: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    comparison_result = await generate_comparative_analysis(
+        job_ids=valid_job_ids,
+        docking_results_list=docking_results_list,
+        stakeholder_type=stakeholder_type
+    )
+    
+    return comparison_result
 
 @router.post("/alphafold/predict", response_model=AlphaFoldPredictionResponse)
+@handle_errors
 async def predict_structure(
     request: AlphaFoldPredictionRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """Submit an AlphaFold-only structure prediction job (no docking)"""
     
+    # Validate sequence
+    if not request.protein_sequence or not request.protein_sequence.strip():
+        raise ValidationError("protein_sequence is required")
+    
+    # Create job record
+    job_id = new_job_id()
+    db_job = Job(
+        id=job_id,
+        job_name=request.job_name or f"AlphaFold Prediction {job_id[:8]}",
+        job_type=JobType.ALPHAFOLD_ONLY,
+        protein_sequence=request.protein_sequence,
+        ligand_files=None,  # No ligands for AlphaFold-only
+        docking_parameters=None  # No docking for AlphaFold-only
+    )
+    
     try:
-        # Validate sequence
-        if not request.protein_sequence or not request.protein_sequence.strip():
-            raise ValidationError("protein_sequence is required")
-        
-        # Create job record
-        job_id = str(uuid.uuid4())
-        db_job = Job(
-            id=job_id,
-            job_name=request.job_name or f"AlphaFold Prediction {job_id[:8]}",
-            job_type=JobType.ALPHAFOLD_ONLY,
-            protein_sequence=request.protein_sequence,
-            ligand_files=None,  # No ligands for AlphaFold-only
-            docking_parameters=None  # No docking for AlphaFold-only
-        )
-        
-        try:
-            db.add(db_job)
-            await db.commit()
-            await db.refresh(db_job)
-        except SQLAlchemyError as e:
-            logger.error(f"Database error creating AlphaFold job: {str(e)}", exc_info=True)
-            await db.rollback()
-            raise DatabaseError(f"Failed to create job in database: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error creating AlphaFold job: {str(e)}", exc_info=True)
-            await db.rollback()
-            raise HTTPException(status_code=500, detail="Failed to create job")
-        
-        # Extract configuration
-        config = request.alphafold_config
-        model_preset = config.model_preset if config else "monomer"
-        max_template_date = config.max_template_date if config else None
-        db_preset = config.db_preset if config else "reduced_dbs"
-        use_gpu_relax = config.use_gpu_relax if config else True
-        
-        # Submit background task
-        try:
-            background_tasks.add_task(
-                run_alphafold_only,
-                job_id=job_id,
-                sequence=request.protein_sequence,
-                model_preset=model_preset,
-                max_template_date=max_template_date,
-                db_preset=db_preset,
-                use_gpu_relax=use_gpu_relax
-            )
-        except Exception as e:
-            logger.error(f"Failed to submit AlphaFold background task for job {job_id}: {str(e)}", exc_info=True)
-            # Job is already created, so we log the error but don't fail the request
-        
-        return db_job
-    except ValidationError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except DatabaseError as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        db.add(db_job)
+        await db.commit()
+    except SQLAlchemyError as e:
+        logger.error(f"Database error creating AlphaFold job: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise DatabaseError(f"Failed to create job in database: {str(e)}")
     except Exception as e:
-        logger.error(f"Unexpected error in predict_structure: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Internal server error")
+        logger.error(f"Unexpected error creating AlphaFold job: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to create job")
+    
+    # Extract configuration
+    config = request.alphafold_config
+    model_preset = config.model_preset if config else "monomer"
+    max_template_date = config.max_template_date if config else None
+    db_preset = config.db_preset if config else "reduced_dbs"
+    use_gpu_relax = config.use_gpu_relax if config else True
+    
+    # Hand the prediction to the task queue; it runs in a Celery worker
+    submit_task(
+        run_alphafold_only_task,
+        job_id=job_id,
+        sequence=request.protein_sequence,
+        model_preset=model_preset,
+        max_template_date=max_template_date,
+        db_preset=db_preset,
+        use_gpu_relax=use_gpu_relax
+    )
+    
+    return db_job
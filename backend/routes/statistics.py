@@ -3,125 +3,104 @@ Statistics API endpoints for data analysis
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import Float, Row, Select, case, cast, func, select, true, type_coerce
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Dict, Any
-import json
+from collections import OrderedDict
+from datetime import datetime
+from statistics import fmean, pvariance
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import asyncio
 import logging
+import uuid
 
-from backend.database import get_db
+import orjson
+
+from backend.database import get_db_ro
 from backend.models import Job
 from backend.exceptions import NotFoundError, ValidationError, DatabaseError
+from backend.routes._stats_core import compute_brief_stats, compute_stats, extract_affinities
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Serialized job statistics, keyed by job id and tagged with the row's
+# updated_at and a hash of its affinity data; entries are reused only while
+# both match. The hash catches rewrites within one updated_at tick (SQLite
+# stores whole seconds).
+STATS_CACHE_SIZE = 1024
+_stats_cache: "OrderedDict[str, Tuple[Tuple[Optional[datetime], int], bytes]]" = OrderedDict()
+
+# Only the columns the statistics endpoints read, rather than the whole Job
+# row (AI report, file paths, ...). The results document itself is only
+# fetched for rows stored before binding_affinities existed.
+_STATS_COLUMNS = (
+    Job.id,
+    Job.job_name,
+    Job.updated_at,
+    Job.binding_affinities,
+    type_coerce(
+        case((Job.binding_affinities.is_(None), Job.docking_results)),
+        Job.docking_results.type,
+    ).label("docking_results"),
+)
+
+def _affinity_fingerprint(job: Row) -> int:
+    """Hash of the data a job's statistics are computed from."""
+    if job.binding_affinities is not None:
+        return hash(tuple(job.binding_affinities))
+    if isinstance(job.docking_results, str):
+        return hash(job.docking_results)
+    return hash(orjson.dumps(job.docking_results))
 
 @router.get("/statistics/job/{job_id}")
-async def get_job_statistics(job_id: str, db: AsyncSession = Depends(get_db)):
+async def get_job_statistics(job_id: uuid.UUID, db: AsyncSession = Depends(get_db_ro)):
     """Get statistical analysis for a single job"""
-    from sqlalchemy import select
-    
-    if not job_id or not job_id.strip():
-        raise HTTPException(status_code=400, detail="Job ID is required")
+    job_id = str(job_id)
     
     try:
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
+        result = await db.execute(select(*_STATS_COLUMNS).where(Job.id == job_id))
+        job = result.one_or_none()
         
         if not job:
             raise NotFoundError(f"Job not found: {job_id}")
         
-        if not job.docking_results:
-            raise ValidationError("No docking results available for this job")
+        # Dashboards poll this endpoint; serve repeats from memory until the
+        # job's affinity data changes
+        revision = (job.updated_at, _affinity_fingerprint(job))
+        cached = _stats_cache.get(job_id)
+        if cached is not None and cached[0] == revision:
+            _stats_cache.move_to_end(job_id)
+            return Response(content=cached[1], media_type="application/json")
         
-        # Extract binding affinities with error handling
         try:
-            docking_results = job.docking_results if isinstance(job.docking_results, dict) else json.loads(job.docking_results)
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.error(f"Failed to parse docking results for job {job_id}: {str(e)}")
-            raise ValidationError("Invalid docking results format")
-        
-        if not isinstance(docking_results, dict):
-            raise ValidationError("Docking results must be a dictionary")
-        
-        all_affinities = []
+            affinities = extract_affinities(job)
+        except ValueError as e:
+            raise ValidationError(str(e))
         
-        try:
-            results = docking_results.get("results", [])
-            if not isinstance(results, list):
-                raise ValidationError("Docking results must contain a 'results' list")
-            
-            for result in results:
-                if not isinstance(result, dict):
-                    continue
-                modes = result.get("modes", [])
-                if not isinstance(modes, list):
-                    continue
-                for mode in modes:
-                    if not isinstance(mode, dict):
-                        continue
-                    affinity = mode.get("affinity")
-                    if affinity is not None:
-                        try:
-                            affinity_float = float(affinity)
-                            all_affinities.append(affinity_float)
-                        except (ValueError, TypeError):
-                            logger.warning(f"Invalid affinity value: {affinity}")
-                            continue
-        except Exception as e:
-            logger.error(f"Error extracting affinities for job {job_id}: {str(e)}", exc_info=True)
-            raise ValidationError("Failed to extract binding affinities from results")
-        
-        if not all_affinities:
-            raise ValidationError("No valid binding affinities found")
+        if affinities is None:
+            raise ValidationError("No docking results available for this job")
         
         # Calculate basic statistics
         try:
-            sorted_affinities = sorted(all_affinities)
-            n = len(all_affinities)
-            mean = sum(all_affinities) / n
-            median = sorted_affinities[n // 2] if n % 2 == 1 else (sorted_affinities[n // 2 - 1] + sorted_affinities[n // 2]) / 2
-            
-            variance = sum((x - mean) ** 2 for x in all_affinities) / (n - 1) if n > 1 else 0
-            std_dev = variance ** 0.5
-            
-            q1_idx = n // 4
-            q3_idx = 3 * n // 4
-            q1 = sorted_affinities[q1_idx] if q1_idx < n else sorted_affinities[0]
-            q3 = sorted_affinities[q3_idx] if q3_idx < n else sorted_affinities[-1]
-            iqr = q3 - q1
-            
-            return {
-                "job_id": job_id,
-                "statistics": {
-                    "count": n,
-                    "mean": round(mean, 4),
-                    "median": round(median, 4),
-                    "std_dev": round(std_dev, 4),
-                    "variance": round(variance, 4),
-                    "min": round(min(all_affinities), 4),
-                    "max": round(max(all_affinities), 4),
-                    "range": round(max(all_affinities) - min(all_affinities), 4),
-                    "q1": round(q1, 4),
-                    "q2": round(median, 4),
-                    "q3": round(q3, 4),
-                    "iqr": round(iqr, 4),
-                    "p25": round(sorted_affinities[n // 4] if n >= 4 else sorted_affinities[0], 4),
-                    "p50": round(median, 4),
-                    "p75": round(sorted_affinities[3 * n // 4] if n >= 4 else sorted_affinities[-1], 4),
-                    "p90": round(sorted_affinities[int(n * 0.9)] if n >= 10 else sorted_affinities[-1], 4),
-                    "p95": round(sorted_affinities[int(n * 0.95)] if n >= 20 else sorted_affinities[-1], 4),
-                },
-                "outliers": {
-                    "lower_bound": round(q1 - 1.5 * iqr, 4),
-                    "upper_bound": round(q3 + 1.5 * iqr, 4),
-                    "count": len([x for x in all_affinities if x < q1 - 1.5 * iqr or x > q3 + 1.5 * iqr]),
-                }
-            }
+            stats = compute_stats(affinities)
         except (ZeroDivisionError, IndexError, ValueError) as e:
             logger.error(f"Error calculating statistics for job {job_id}: {str(e)}", exc_info=True)
             raise HTTPException(status_code=500, detail="Failed to calculate statistics")
         
+        if stats is None:
+            raise ValidationError("No valid binding affinities found")
+        
+        # Returned as a response so FastAPI skips its jsonable_encoder pass;
+        # the payload is already plain JSON types
+        response = ORJSONResponse({"job_id": job_id, **stats})
+        _stats_cache[job_id] = (revision, response.body)
+        _stats_cache.move_to_end(job_id)
+        while len(_stats_cache) > STATS_CACHE_SIZE:
+            _stats_cache.popitem(last=False)
+        return response
+        
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValidationError as e:
@@ -133,11 +112,81 @@ async def get_job_statistics(job_id: str, db: AsyncSession = Depends(get_db)):
         logger.error(f"Unexpected error getting statistics for job {job_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _affinity_summary_stmt(dialect_name: str, job_ids: Iterable[str]) -> Select:
+    """
+    Per-job affinity count, mean and minimum aggregated in SQL.
+    
+    Unnests the flat binding_affinities array, so only jobs with at least
+    one stored affinity produce a row.
+    """
+    if dialect_name == "postgresql":
+        elements = func.jsonb_array_elements_text(Job.binding_affinities).table_valued("value")
+        value = cast(elements.c.value, Float)
+    else:
+        elements = func.json_each(Job.binding_affinities).table_valued("value")
+        value = elements.c.value
+    return (
+        select(
+            Job.id,
+            Job.job_name,
+            func.count(value).label("n"),
+            func.avg(value).label("mean"),
+            func.min(value).label("best"),
+        )
+        .join(elements, true())
+        .where(Job.id.in_(job_ids))
+        .group_by(Job.id, Job.job_name)
+    )
+
+def _job_data(job_id: str, job_name: Optional[str], n: int, mean: float, min_score: float) -> Dict[str, Any]:
+    """Per-job entry of the compare_jobs response."""
+    return {
+        "job_id": job_id,
+        "job_name": job_name or f"Job {job_id[:8]}",
+        "count": n,
+        "mean": round(mean, 4),
+        "min": round(min_score, 4),
+        "best_score": round(min_score, 4),
+    }
+
+def _summarize_job(job_id: str, job: Optional[Row]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Summarize one job's binding affinities for compare_jobs.
+    
+    Runs on a worker thread; job is a _STATS_COLUMNS row, or None if missing.
+    
+    Returns:
+        (job_data, error): job_data is None when the job has no usable
+        affinities; error is the warning to report for this job, if any
+    """
+    if not job_id or not job_id.strip():
+        return None, f"Invalid job ID: {job_id}"
+    
+    try:
+        if not job:
+            return None, f"Job not found: {job_id}"
+        
+        try:
+            affinities = extract_affinities(job)
+        except ValueError:
+            return None, f"Invalid results format for job: {job_id}"
+        
+        if affinities is None:
+            return None, f"No docking results for job: {job_id}"
+        
+        brief_stats = compute_brief_stats(affinities)
+        if brief_stats is None:
+            return None, None
+        
+        n, mean, min_score = brief_stats
+        return _job_data(job_id, job.job_name, n, mean, min_score), None
+    except Exception as e:
+        logger.error(f"Unexpected error processing job {job_id}: {str(e)}", exc_info=True)
+        return None, f"Error processing job: {job_id}"
+
 @router.post("/statistics/compare")
-async def compare_jobs(job_ids: List[str], db: AsyncSession = Depends(get_db)):
+async def compare_jobs(job_ids: List[str], db: AsyncSession = Depends(get_db_ro)):
     """Compare statistics across multiple jobs"""
-    from sqlalchemy import select
-    
     try:
         if not job_ids or len(job_ids) < 2:
             raise ValidationError("Need at least 2 jobs for comparison")
@@ -148,82 +197,37 @@ async def compare_jobs(job_ids: List[str], db: AsyncSession = Depends(get_db)):
         jobs_data = []
         errors = []
         
+        # Jobs with stored affinities are summarized by the database, so their
+        # results documents never leave it
+        valid_ids = {job_id for job_id in job_ids if job_id and job_id.strip()}
+        result = await db.execute(_affinity_summary_stmt(db.bind.dialect.name, valid_ids))
+        aggregated = {row.id: row for row in result}
+        
+        # The rest (missing jobs, or rows stored before binding_affinities
+        # existed) are fetched in one round-trip and summarized here
+        remaining = valid_ids - aggregated.keys()
+        jobs_by_id = {}
+        if remaining:
+            result = await db.execute(select(*_STATS_COLUMNS).where(Job.id.in_(remaining)))
+            jobs_by_id = {job.id: job for job in result}
+        
+        # Parsing and extraction are CPU-bound for large results blobs, so run
+        # them on worker threads rather than serially on the event loop
+        summaries = iter(await asyncio.gather(*[
+            asyncio.to_thread(_summarize_job, job_id, jobs_by_id.get(job_id))
+            for job_id in job_ids
+            if job_id not in aggregated
+        ]))
         for job_id in job_ids:
-            if not job_id or not job_id.strip():
-                errors.append(f"Invalid job ID: {job_id}")
-                continue
-            
-            try:
-                result = await db.execute(select(Job).where(Job.id == job_id))
-                job = result.scalar_one_or_none()
-                
-                if not job:
-                    errors.append(f"Job not found: {job_id}")
-                    continue
-                
-                if not job.docking_results:
-                    errors.append(f"No docking results for job: {job_id}")
-                    continue
-                
-                try:
-                    docking_results = job.docking_results if isinstance(job.docking_results, dict) else json.loads(job.docking_results)
-                except (json.JSONDecodeError, TypeError) as e:
-                    logger.warning(f"Failed to parse docking results for job {job_id}: {str(e)}")
-                    errors.append(f"Invalid results format for job: {job_id}")
-                    continue
-                
-                if not isinstance(docking_results, dict):
-                    errors.append(f"Invalid results format for job: {job_id}")
-                    continue
-                
-                all_affinities = []
-                
-                try:
-                    results = docking_results.get("results", [])
-                    if not isinstance(results, list):
-                        continue
-                    
-                    for result in results:
-                        if not isinstance(result, dict):
-                            continue
-                        modes = result.get("modes", [])
-                        if not isinstance(modes, list):
-                            continue
-                        for mode in modes:
-                            if not isinstance(mode, dict):
-                                continue
-                            affinity = mode.get("affinity")
-                            if affinity is not None:
-                                try:
-                                    affinity_float = float(affinity)
-                                    all_affinities.append(affinity_float)
-                                except (ValueError, TypeError):
-                                    continue
-                except Exception as e:
-                    logger.warning(f"Error extracting affinities for job {job_id}: {str(e)}")
-                    continue
-                
-                if all_affinities:
-                    n = len(all_affinities)
-                    mean = sum(all_affinities) / n
-                    min_score = min(all_affinities)
-                    
-                    jobs_data.append({
-                        "job_id": job_id,
-                        "job_name": job.job_name or f"Job {job_id[:8]}",
-                        "count": n,
-                        "mean": round(mean, 4),
-                        "min": round(min_score, 4),
-                        "best_score": round(min_score, 4),
-                    })
-            except SQLAlchemyError as e:
-                logger.error(f"Database error processing job {job_id}: {str(e)}")
-                errors.append(f"Database error for job: {job_id}")
-                continue
-            except Exception as e:
-                logger.error(f"Unexpected error processing job {job_id}: {str(e)}", exc_info=True)
-                errors.append(f"Error processing job: {job_id}")
-                continue
+            row = aggregated.get(job_id)
+            if row is not None:
+                job_data, error = _job_data(job_id, row.job_name, row.n, row.mean, row.best), None
+            else:
+                job_data, error = next(summaries)
+            if error:
+                errors.append(error)
+            elif job_data:
+                jobs_data.append(job_data)
         
         if len(jobs_data) < 2:
             error_msg = "Need at least 2 jobs with valid results"
@@ -234,8 +238,8 @@ async def compare_jobs(job_ids: List[str], db: AsyncSession = Depends(get_db)):
         # Calculate aggregate statistics
         try:
             all_means = [j["mean"] for j in jobs_data]
-            aggregate_mean = sum(all_means) / len(all_means)
-            mean_variance = sum((m - aggregate_mean) ** 2 for m in all_means) / len(all_means)
+            aggregate_mean = fmean(all_means)
+            mean_variance = pvariance(all_means, mu=aggregate_mean)
             
             response = {
                 "job_count": len(jobs_data),
@@ -250,7 +254,7 @@ async def compare_jobs(job_ids: List[str], db: AsyncSession = Depends(get_db)):
             if errors:
                 response["warnings"] = errors[:10]  # Limit warnings
             
-            return response
+            return ORJSONResponse(response)
         except (ZeroDivisionError, ValueError) as e:
             logger.error(f"Error calculating aggregate statistics: {str(e)}", exc_info=True)
             raise HTTPException(status_code=500, detail="Failed to calculate aggregate statistics")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from backend.models import JobType, JobStatus
@@ -30,8 +30,7 @@ class AlphaFoldPredictionResponse(BaseModel):
     updated_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class JobCreate(BaseModel):
     job_name: str = Field(..., description="Name for the job")
@@ -67,8 +66,39 @@ class JobResponse(BaseModel):
     updated_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+class JobSummary(BaseModel):
+    """Job fields shown in job listings (omits report text and file paths)"""
+    id: str
+    job_name: str
+    job_type: JobType
+    status: JobStatus
+    protein_sequence: Optional[str] = None
+    plddt_score: Optional[float] = None
+    quality_metrics: Optional[Dict[str, Any]] = None
+    top_binding_score: Optional[float] = None
+    blockchain_tx_hash: Optional[str] = None
+    error_message: Optional[str] = None
+    progress: Optional[float] = None
+    progress_message: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class DockingMode(BaseModel):
+    """One docked pose; only the fields read back by the statistics code"""
+    affinity: Optional[float] = None
+
+class DockingLigandResult(BaseModel):
+    """Docking outcome for one ligand"""
+    modes: List[DockingMode] = []
+
+class DockingResultsDocument(BaseModel):
+    """Shape of Job.docking_results as produced by run_autodock_vina"""
+    results: List[DockingLigandResult] = []
 
 class JobStatusUpdate(BaseModel):
     status: JobStatus
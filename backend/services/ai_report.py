@@ -1,13 +1,20 @@
 import os
 import logging
-from typing import Dict, Any, Optional, List, AsyncGenerator, Tuple
+from typing import Dict, Any, Optional, List, AsyncGenerator, AsyncIterator, Tuple
 import httpx
 import json
 from datetime import datetime
 import hashlib
 import asyncio
+import bisect
+import time
+from collections import OrderedDict
 from functools import lru_cache
 
+import orjson
+
+from backend.services.external_cache import RedisError, get_redis
+
 # Import molecular properties service
 try:
     from backend.services.molecular_properties import (
@@ -23,6 +30,15 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 lets concurrent LLM calls share one connection per provider; httpx
+# needs the optional h2 package for it (installed via httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    logger.warning("h2 package not available. LLM API calls will use HTTP/1.1.")
+
 class AIReportError(Exception):
     """Base exception for AI report generation errors"""
     pass
@@ -42,6 +58,20 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 _analysis_cache: Dict[str, Dict[str, Any]] = {}
 CACHE_TTL_SECONDS = 3600  # 1 hour cache TTL
 
+# Finished reports keyed by a hash of everything that shapes them, so a
+# re-requested or retried job skips the LLM call. The job ID is part of the
+# key because the prompt (and so the report) names it.
+# Stored in Redis and in an in-process LRU: key -> (expires_at, report)
+REPORT_CACHE_PREFIX = "airep"
+REPORT_CACHE_TTL_SECONDS = 86400  # 24 hours
+REPORT_CACHE_SIZE = 1024
+# Part of the key, so switching models doesn't serve reports from the old ones
+REPORT_CACHE_VERSION = "claude-3-7-sonnet-20250219|gpt-4o"
+_report_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+# Report generations in progress by cache key, shared by concurrent identical requests
+_inflight_reports: Dict[str, "asyncio.Task[str]"] = {}
+
 # Retry configuration
 MAX_RETRIES = 3
 INITIAL_RETRY_DELAY = 1.0  # seconds
@@ -58,74 +88,143 @@ COST_PER_1K_TOKENS = {
     }
 }
 
+# One HTTP client is shared by every LLM call so reports reuse keep-alive
+# connections to the provider APIs instead of paying a TCP/TLS handshake each
+# time. With HTTP/2 concurrent requests are multiplexed over those
+# connections, so only a few are needed. Generation can take minutes, hence
+# the long read timeout; connecting should not.
+_LLM_HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=32)
+_LLM_HTTP_TIMEOUT = httpx.Timeout(180.0, connect=10.0)
+_client: Optional[httpx.AsyncClient] = None
+PREWARM_TIMEOUT_SECONDS = 5.0
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared pooled HTTP client for LLM APIs, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=_LLM_HTTP_LIMITS,
+            timeout=_LLM_HTTP_TIMEOUT
+        )
+    return _client
+
+async def prewarm_client() -> None:
+    """
+    Open connections to the configured LLM providers before the first report.
+    
+    Only the established connection matters, so any HTTP status is fine.
+    Failures are logged, and a slow DNS lookup or handshake never holds up
+    startup for more than PREWARM_TIMEOUT_SECONDS.
+    """
+    urls = []
+    if ANTHROPIC_API_KEY:
+        urls.append("https://api.anthropic.com/")
+    if OPENAI_API_KEY:
+        urls.append("https://api.openai.com/")
+    if not urls:
+        return
+    client = get_client()
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*(client.head(url) for url in urls), return_exceptions=True),
+            timeout=PREWARM_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Pre-warming LLM API connections timed out after {PREWARM_TIMEOUT_SECONDS}s")
+        return
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Could not pre-warm connection to {url}: {str(result)}")
+        else:
+            logger.info(f"Pre-warmed connection to {url} ({result.http_version})")
+
+async def close_client() -> None:
+    """Close the shared LLM HTTP client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# pLDDT interpretation: scores above each threshold move up one label
+_PLDDT_THRESHOLDS = (70.0, 90.0)
+_PLDDT_LABELS = ("Low confidence", "Medium confidence", "High confidence")
+
+# Markdown report used when no AI provider is available
+_TEMPLATE = """# Molecular Docking Analysis Report
+
+{context}
+
+## Analysis Summary
+
+The molecular docking simulation has been completed successfully. 
+The best binding affinity observed was {best_score} kcal/mol.
+
+### Interpretation
+
+- Binding affinities below -7.0 kcal/mol generally indicate strong binding
+- Values between -5.0 and -7.0 kcal/mol suggest moderate binding
+- Values above -5.0 kcal/mol indicate weak binding
+
+### Recommendations
+
+1. Review the top-ranked poses for structural compatibility
+2. Consider running additional validation with molecular dynamics
+3. Evaluate drug-likeness properties (Lipinski's Rule of Five)
+4. Plan experimental validation for promising candidates
+
+---
+*This report was generated by SNOWFLAKE - AI-powered drug discovery platform*
+"""
+
 # Track API usage
 _api_usage_stats: Dict[str, Dict[str, Any]] = {}
 
 # Conversation history storage (in-memory, can be replaced with Redis in production)
 _conversation_history: Dict[str, List[Dict[str, str]]] = {}
 
-async def generate_ai_report(
+def _plddt_label(plddt_score: float) -> str:
+    """Interpretation label for an AlphaFold pLDDT score"""
+    return _PLDDT_LABELS[bisect.bisect_left(_PLDDT_THRESHOLDS, plddt_score)]
+
+async def _build_report_context(
     job_id: str,
     sequence: Optional[str],
     plddt_score: Optional[float],
-    docking_results: Dict[str, Any],
-    stakeholder: str = "researcher"
-) -> str:
+    docking_results: Dict[str, Any]
+) -> Tuple[str, List[Dict[str, Any]]]:
     """
-    Generate AI-powered analysis report for docking results
+    Build the markdown context sent to the LLM for a docking report
     
-    Args:
-        job_id: Unique job identifier
-        sequence: Protein sequence (if AlphaFold was used)
-        plddt_score: AlphaFold confidence score
-        docking_results: Docking simulation results
-        stakeholder: Target audience (researcher, clinician, investor)
-        
     Returns:
-        Formatted markdown report
-        
-    Raises:
-        AIReportError: If report generation fails
-        ValueError: If inputs are invalid
+        The context string and the ligand results with a binding affinity,
+        best first
     """
-    
-    if not job_id:
-        raise ValueError("Job ID is required")
-    
-    if not docking_results:
-        raise ValueError("Docking results are required")
-    
-    valid_stakeholders = ["researcher", "clinician", "investor", "regulator"]
-    if stakeholder not in valid_stakeholders:
-        logger.warning(f"Invalid stakeholder '{stakeholder}', using 'researcher'")
-        stakeholder = "researcher"
-    
-    try:
-        # Build context for AI
-        context = f"""
+    # Sections are collected and joined once rather than re-copying a growing string
+    parts = [f"""
     # Protein-Ligand Docking Analysis Report
     Job ID: {job_id}
     
     ## Protein Information
-    """
+    """]
+    
+    if sequence:
+        if plddt_score is None:
+            logger.warning(f"pLDDT score is None for job {job_id} with sequence")
+            plddt_score = 0.0
         
-        if sequence:
-            if plddt_score is None:
-                logger.warning(f"pLDDT score is None for job {job_id} with sequence")
-                plddt_score = 0.0
-            
-            context += f"""
+        parts.append(f"""
     - Sequence Length: {len(sequence)} amino acids
     - Structure Prediction Method: AlphaFold 2
     - Prediction Confidence (pLDDT): {plddt_score:.2f}/100
-    - Interpretation: {"High confidence" if plddt_score > 90 else "Medium confidence" if plddt_score > 70 else "Low confidence"}
-    """
-        else:
-            context += """
+    - Interpretation: {_plddt_label(plddt_score)}
+    """)
+    else:
+        parts.append("""
     - Structure Source: User-provided PDB file
-    """
-        
-        context += f"""
+    """)
+    
+    parts.append(f"""
     
     ## Docking Results Summary
     - Total Ligands Tested: {docking_results.get('total_ligands', 0)}
@@ -133,12 +232,12 @@ async def generate_ai_report(
     - Failed Ligands: {docking_results.get('failed_ligands', 0)}
     - Best Binding Affinity: {docking_results.get('best_score', 'N/A')} kcal/mol
     - Best Ligand: {docking_results.get('best_ligand', 'N/A')}
-    """
-        
-        # Add statistics if available
-        statistics = docking_results.get('statistics', {})
-        if statistics:
-            context += f"""
+    """)
+    
+    # Add statistics if available
+    statistics = docking_results.get('statistics', {})
+    if statistics:
+        parts.append(f"""
     ### Statistical Analysis:
     - Mean Binding Affinity: {statistics.get('mean_score', 'N/A'):.2f} kcal/mol
     - Standard Deviation: {statistics.get('std_score', 'N/A'):.2f} kcal/mol
@@ -147,136 +246,312 @@ async def generate_ai_report(
     - Number of Clusters: {statistics.get('num_clusters', 'N/A')}
     - Confidence Score: {statistics.get('confidence_score', 'N/A'):.2f}
     - Average Poses per Ligand: {statistics.get('mean_num_modes', 'N/A'):.1f}
-    """
-        
-        context += """
+    """)
+    
+    parts.append("""
     
     ### Top Binding Poses (Detailed):
-    """
-        
-        results = docking_results.get('results', [])
-        valid_results = [r for r in results if r.get('binding_affinity') is not None]
-        valid_results.sort(key=lambda x: x.get('binding_affinity', float('inf')))
+    """)
+    
+    results = docking_results.get('results', [])
+    valid_results = [r for r in results if r.get('binding_affinity') is not None]
+    valid_results.sort(key=lambda x: x.get('binding_affinity', float('inf')))
+    
+    for idx, result in enumerate(valid_results[:5], 1):
+        binding_affinity = result.get('binding_affinity', 'N/A')
+        ligand_name = result.get('ligand_name', f'Ligand {idx}')
+        modes = result.get('modes', [])
+        num_poses = result.get('num_poses', len(modes))
+        affinity_range = result.get('affinity_range', 'N/A')
+        pose_consistency = result.get('pose_consistency', 'N/A')
         
-        for idx, result in enumerate(valid_results[:5], 1):
-            binding_affinity = result.get('binding_affinity', 'N/A')
-            ligand_name = result.get('ligand_name', f'Ligand {idx}')
-            modes = result.get('modes', [])
-            num_poses = result.get('num_poses', len(modes))
-            affinity_range = result.get('affinity_range', 'N/A')
-            pose_consistency = result.get('pose_consistency', 'N/A')
-            
-            context += f"""
+        parts.append(f"""
     {idx}. {ligand_name}
        - Best Binding Affinity: {binding_affinity:.2f} kcal/mol
        - Number of Poses: {num_poses}
        - Affinity Range: {affinity_range:.2f} kcal/mol (if multiple poses)
        - Pose Consistency: {pose_consistency:.2f} (if available)
-       """
-            
-            # Add top 3 modes if available
-            if modes and len(modes) > 0:
-                context += "       - Top 3 Binding Modes:\n"
-                for mode_idx, mode in enumerate(modes[:3], 1):
-                    mode_num = mode.get('mode', mode_idx)
-                    affinity = mode.get('affinity', 'N/A')
-                    rmsd_lb = mode.get('rmsd_lb', 'N/A')
-                    rmsd_ub = mode.get('rmsd_ub', 'N/A')
-                    context += f"         Mode {mode_num}: {affinity:.2f} kcal/mol (RMSD: {rmsd_lb:.2f}-{rmsd_ub:.2f} Å)\n"
+       """)
         
-        # Add clustering information if available
-        clustered_results = docking_results.get('clustered_results', [])
-        if clustered_results:
-            context += """
+        # Add top 3 modes if available
+        if modes and len(modes) > 0:
+            parts.append("       - Top 3 Binding Modes:\n")
+            for mode_idx, mode in enumerate(modes[:3], 1):
+                mode_num = mode.get('mode', mode_idx)
+                affinity = mode.get('affinity', 'N/A')
+                rmsd_lb = mode.get('rmsd_lb', 'N/A')
+                rmsd_ub = mode.get('rmsd_ub', 'N/A')
+                parts.append(f"         Mode {mode_num}: {affinity:.2f} kcal/mol (RMSD: {rmsd_lb:.2f}-{rmsd_ub:.2f} Å)\n")
+    
+    # Add clustering information if available
+    clustered_results = docking_results.get('clustered_results', [])
+    if clustered_results:
+        parts.append("""
     
     ### Pose Clustering Analysis:
-    """
-            clusters = {}
-            for result in clustered_results[:10]:  # Top 10 clustered results
-                cluster_id = result.get('cluster_id', 'unknown')
-                if cluster_id not in clusters:
-                    clusters[cluster_id] = []
-                clusters[cluster_id].append(result)
-            
-            for cluster_id, cluster_members in sorted(clusters.items())[:5]:
-                best_in_cluster = min(cluster_members, key=lambda x: x.get('binding_affinity', float('inf')))
-                context += f"""
-    - Cluster {cluster_id}: {len(cluster_members)} pose(s), best affinity: {best_in_cluster.get('binding_affinity', 'N/A'):.2f} kcal/mol
-    """
+    """)
+        clusters = {}
+        for result in clustered_results[:10]:  # Top 10 clustered results
+            cluster_id = result.get('cluster_id', 'unknown')
+            if cluster_id not in clusters:
+                clusters[cluster_id] = []
+            clusters[cluster_id].append(result)
         
-        # Add parameter information
-        parameters_used = docking_results.get('parameters_used', {})
-        if parameters_used:
-            context += f"""
+        for cluster_id, cluster_members in sorted(clusters.items())[:5]:
+            best_in_cluster = min(cluster_members, key=lambda x: x.get('binding_affinity', float('inf')))
+            parts.append(f"""
+    - Cluster {cluster_id}: {len(cluster_members)} pose(s), best affinity: {best_in_cluster.get('binding_affinity', 'N/A'):.2f} kcal/mol
+    """)
+    
+    # Add parameter information
+    parameters_used = docking_results.get('parameters_used', {})
+    if parameters_used:
+        parts.append(f"""
     
     ### Docking Parameters Used:
     - Grid Center: ({parameters_used.get('center_x', 0):.2f}, {parameters_used.get('center_y', 0):.2f}, {parameters_used.get('center_z', 0):.2f}) Å
     - Grid Size: {parameters_used.get('size_x', 20):.1f} × {parameters_used.get('size_y', 20):.1f} × {parameters_used.get('size_z', 20):.1f} Å
     - Exhaustiveness: {parameters_used.get('exhaustiveness', 8)}
     - Number of Modes: {parameters_used.get('num_modes', 9)}
+    """)
+    
+    # Add ML-powered molecular property predictions for top ligands
+    ml_predictions_context = await _add_ml_predictions_context(docking_results, valid_results)
+    if ml_predictions_context:
+        parts.append(ml_predictions_context)
+    
+    return "".join(parts), valid_results
+
+async def generate_ai_report(
+    job_id: str,
+    sequence: Optional[str],
+    plddt_score: Optional[float],
+    docking_results: Dict[str, Any],
+    stakeholder: str = "researcher",
+    race_providers: bool = False
+) -> str:
     """
+    Generate AI-powered analysis report for docking results
+    
+    Args:
+        job_id: Unique job identifier
+        sequence: Protein sequence (if AlphaFold was used)
+        plddt_score: AlphaFold confidence score
+        docking_results: Docking simulation results
+        stakeholder: Target audience (researcher, clinician, investor)
+        race_providers: When both API keys are configured, query Anthropic and
+            OpenAI concurrently and use whichever report arrives first
         
-        # Add ML-powered molecular property predictions for top ligands
-        ml_predictions_context = await _add_ml_predictions_context(docking_results, valid_results)
-        if ml_predictions_context:
-            context += ml_predictions_context
-        
-        # Calculate ML properties for response
-        ml_properties_data = {}
-        admet_data = {}
-        toxicity_data = {}
+    Returns:
+        Formatted markdown report
         
-        # Try to get ligand files and calculate properties for top ligand
-        ligand_files = docking_results.get('ligand_files', [])
-        if ligand_files and valid_results:
-            try:
-                top_result = valid_results[0]
-                ligand_idx = top_result.get('ligand_index', 0)
-                if ligand_idx < len(ligand_files):
-                    ligand_sdf = ligand_files[ligand_idx]
-                    ligand_name = top_result.get('ligand_name', 'top_ligand')
-                    
-                    properties = calculate_molecular_properties(ligand_sdf, ligand_name)
-                    ml_properties_data = properties.get('molecular_properties', {})
-                    admet_data = properties.get('admet', {})
-                    toxicity_data = properties.get('toxicity', {})
-            except (RDKitNotAvailableError, MolecularPropertyError) as e:
-                logger.warning(f"ML predictions unavailable for structured analysis: {str(e)}")
-            except Exception as e:
-                logger.error(f"Error calculating ML properties for structured analysis: {str(e)}")
+    Raises:
+        AIReportError: If report generation fails
+        ValueError: If inputs are invalid
+    """
+    
+    if not job_id:
+        raise ValueError("Job ID is required")
+    
+    if not docking_results:
+        raise ValueError("Docking results are required")
+    
+    valid_stakeholders = ["researcher", "clinician", "investor", "regulator"]
+    if stakeholder not in valid_stakeholders:
+        logger.warning(f"Invalid stakeholder '{stakeholder}', using 'researcher'")
+        stakeholder = "researcher"
+    
+    try:
+        cache_key = _report_cache_key(job_id, sequence, plddt_score, docking_results, stakeholder)
+        cached_report = await _get_cached_report(cache_key)
+        if cached_report is not None:
+            logger.info(f"Returning cached AI report for job {job_id}")
+            return cached_report
         
-        # Generate AI analysis
-        if ANTHROPIC_API_KEY:
-            try:
-                report = await generate_with_anthropic(context, stakeholder)
-            except (AIAPIError, AIReportTimeoutError) as e:
-                logger.error(f"Anthropic API failed for job {job_id}: {str(e)}")
-                # Fallback to template
-                logger.info(f"Falling back to template report for job {job_id}")
-                report = generate_template_report(context, docking_results, plddt_score)
-        elif OPENAI_API_KEY:
-            try:
-                report = await generate_with_openai(context, stakeholder)
-            except (AIAPIError, AIReportTimeoutError) as e:
-                logger.error(f"OpenAI API failed for job {job_id}: {str(e)}")
-                # Fallback to template
-                logger.info(f"Falling back to template report for job {job_id}")
-                report = generate_template_report(context, docking_results, plddt_score)
+        task = _inflight_reports.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(_generate_report(
+                job_id, sequence, plddt_score, docking_results, stakeholder, race_providers, cache_key
+            ))
+            _inflight_reports[cache_key] = task
+            task.add_done_callback(lambda _: _inflight_reports.pop(cache_key, None))
         else:
-            # Fallback to template-based report
-            logger.info(f"No AI API keys configured, using template report for job {job_id}")
-            report = generate_template_report(context, docking_results, plddt_score)
-        
-        if not report or not report.strip():
-            raise AIReportError("Generated report is empty")
+            logger.info(f"Joining in-flight AI report generation for job {job_id}")
         
-        return report
+        # Shielded so one caller going away doesn't cancel the shared generation
+        return await asyncio.shield(task)
     except (AIReportError, ValueError):
         raise
     except Exception as e:
         logger.error(f"Unexpected error generating AI report for job {job_id}: {str(e)}", exc_info=True)
         raise AIReportError(f"Failed to generate AI report: {str(e)}") from e
 
+async def _generate_report(
+    job_id: str,
+    sequence: Optional[str],
+    plddt_score: Optional[float],
+    docking_results: Dict[str, Any],
+    stakeholder: str,
+    race_providers: bool,
+    cache_key: str
+) -> str:
+    """Build the context and generate the report for generate_ai_report (one run per cache key)"""
+    context, valid_results = await _build_report_context(job_id, sequence, plddt_score, docking_results)
+    
+    # Calculate ML properties for response
+    ml_properties_data = {}
+    admet_data = {}
+    toxicity_data = {}
+    
+    # Try to get ligand files and calculate properties for top ligand
+    ligand_files = docking_results.get('ligand_files', [])
+    if ligand_files and valid_results:
+        try:
+            top_result = valid_results[0]
+            ligand_idx = top_result.get('ligand_index', 0)
+            if ligand_idx < len(ligand_files):
+                ligand_sdf = ligand_files[ligand_idx]
+                ligand_name = top_result.get('ligand_name', 'top_ligand')
+                
+                properties = calculate_molecular_properties(ligand_sdf, ligand_name)
+                ml_properties_data = properties.get('molecular_properties', {})
+                admet_data = properties.get('admet', {})
+                toxicity_data = properties.get('toxicity', {})
+        except (RDKitNotAvailableError, MolecularPropertyError) as e:
+            logger.warning(f"ML predictions unavailable for structured analysis: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error calculating ML properties for structured analysis: {str(e)}")
+    
+    # Generate AI analysis; only provider reports are cached, not the template
+    from_provider = False
+    if race_providers and ANTHROPIC_API_KEY and OPENAI_API_KEY:
+        try:
+            report = await _race_report_providers(context, stakeholder)
+            from_provider = True
+        except (AIAPIError, AIReportTimeoutError) as e:
+            logger.error(f"Both AI providers failed for job {job_id}: {str(e)}")
+            # Fallback to template
+            logger.info(f"Falling back to template report for job {job_id}")
+            report = generate_template_report(context, docking_results, plddt_score)
+    elif ANTHROPIC_API_KEY:
+        try:
+            report = await generate_with_anthropic(context, stakeholder)
+            from_provider = True
+        except (AIAPIError, AIReportTimeoutError) as e:
+            logger.error(f"Anthropic API failed for job {job_id}: {str(e)}")
+            # Fallback to template
+            logger.info(f"Falling back to template report for job {job_id}")
+            report = generate_template_report(context, docking_results, plddt_score)
+    elif OPENAI_API_KEY:
+        try:
+            report = await generate_with_openai(context, stakeholder)
+            from_provider = True
+        except (AIAPIError, AIReportTimeoutError) as e:
+            logger.error(f"OpenAI API failed for job {job_id}: {str(e)}")
+            # Fallback to template
+            logger.info(f"Falling back to template report for job {job_id}")
+            report = generate_template_report(context, docking_results, plddt_score)
+    else:
+        # Fallback to template-based report
+        logger.info(f"No AI API keys configured, using template report for job {job_id}")
+        report = generate_template_report(context, docking_results, plddt_score)
+    
+    if not report or not report.strip():
+        raise AIReportError("Generated report is empty")
+    
+    if from_provider:
+        await _cache_report(cache_key, report)
+    
+    return report
+
+def _canonical(docking_results: Dict[str, Any]) -> bytes:
+    """
+    Serialize docking results in a canonical form for the report cache key
+    
+    Ligand results are ordered by (binding_affinity, ligand_name) and affinities
+    rounded to 3 decimals, so equivalent runs that only differ in result order or
+    float noise share a cache entry. This assumes reports are insensitive to
+    sub-0.001 kcal/mol differences; the report context sorts ligands by affinity
+    anyway.
+    """
+    results = docking_results.get("results")
+    if isinstance(results, list):
+        canonical_results = []
+        for result in results:
+            if isinstance(result, dict) and isinstance(result.get("binding_affinity"), float):
+                result = {**result, "binding_affinity": round(result["binding_affinity"], 3)}
+            canonical_results.append(result)
+        canonical_results.sort(key=_canonical_sort_key)
+        docking_results = {**docking_results, "results": canonical_results}
+    return orjson.dumps(
+        docking_results,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        default=str
+    )
+
+def _canonical_sort_key(result: Any) -> Tuple[float, str]:
+    if not isinstance(result, dict):
+        return (float("inf"), str(result))
+    affinity = result.get("binding_affinity")
+    if not isinstance(affinity, (int, float)):
+        affinity = float("inf")
+    return (affinity, str(result.get("ligand_name", "")))
+
+def _report_cache_key(
+    job_id: str,
+    sequence: Optional[str],
+    plddt_score: Optional[float],
+    docking_results: Dict[str, Any],
+    stakeholder: str
+) -> str:
+    """Content hash of the report inputs (BLAKE2b is cheaper than SHA-256 here)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(_canonical(docking_results))
+    digest.update(orjson.dumps([job_id, sequence, plddt_score, stakeholder, REPORT_CACHE_VERSION]))
+    return f"{REPORT_CACHE_PREFIX}:{digest.hexdigest()}"
+
+async def _get_cached_report(cache_key: str) -> Optional[str]:
+    """Get a cached report from the in-process cache, then Redis"""
+    entry = _report_cache.get(cache_key)
+    if entry is not None:
+        expires_at, report = entry
+        if expires_at >= time.monotonic():
+            _report_cache.move_to_end(cache_key)
+            return report
+        del _report_cache[cache_key]
+    
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        cached = await redis.get(cache_key)
+    except RedisError as e:
+        logger.warning(f"AI report cache lookup failed for {cache_key}: {str(e)}")
+        return None
+    if cached is None:
+        return None
+    report = cached.decode()
+    _store_local_report(cache_key, report)
+    return report
+
+def _store_local_report(cache_key: str, report: str):
+    """Store a report in the in-process cache, evicting the least recently used entry"""
+    _report_cache[cache_key] = (time.monotonic() + REPORT_CACHE_TTL_SECONDS, report)
+    _report_cache.move_to_end(cache_key)
+    while len(_report_cache) > REPORT_CACHE_SIZE:
+        _report_cache.popitem(last=False)
+
+async def _cache_report(cache_key: str, report: str):
+    """Cache a generated report in-process and in Redis"""
+    _store_local_report(cache_key, report)
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.setex(cache_key, REPORT_CACHE_TTL_SECONDS, report)
+    except RedisError as e:
+        logger.warning(f"AI report cache store failed for {cache_key}: {str(e)}")
+
 def _get_cache_key(context: str, stakeholder: str, analysis_type: str = "report") -> str:
     """Generate cache key from context and parameters"""
     key_string = f"{analysis_type}:{stakeholder}:{context}"
@@ -364,24 +639,40 @@ async def _retry_with_backoff(func, *args, **kwargs):
     if last_exception:
         raise last_exception
 
-async def generate_with_anthropic(context: str, stakeholder: str) -> str:
-    """Generate report using Claude API with retry logic and caching"""
-    
-    if not ANTHROPIC_API_KEY:
-        raise AIAPIError("ANTHROPIC_API_KEY not configured")
-    
-    if not context or not context.strip():
-        raise ValueError("Context cannot be empty for AI report generation")
+async def _race_report_providers(context: str, stakeholder: str) -> str:
+    """
+    Request the report from Anthropic and OpenAI at once and keep the first success
     
-    # Check cache
-    cache_key = _get_cache_key(context, stakeholder, "report")
-    cached_result = _get_cached_analysis(cache_key)
-    if cached_result:
-        logger.info("Returning cached AI analysis result")
-        return cached_result
+    The slower request is cancelled as soon as one report arrives, releasing its
+    connection back to the pool. If the first provider to finish failed, the
+    other one is still awaited.
     
-    system_prompt = f"""You are an expert computational chemist and drug discovery scientist with deep expertise in molecular docking, binding affinity prediction, and drug design.
-    Analyze the following protein-ligand docking results and provide a comprehensive, actionable report tailored for a {stakeholder}.
+    Raises:
+        AIAPIError, AIReportTimeoutError: If both providers fail (the last error)
+    """
+    pending = {
+        asyncio.create_task(generate_with_anthropic(context, stakeholder)),
+        asyncio.create_task(generate_with_openai(context, stakeholder)),
+    }
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    return task.result()
+                logger.warning(f"AI provider failed during race: {str(error)}")
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+# Static part of the report system prompt. The stakeholder is given in a
+# separate block (see _report_audience) so this prefix is byte-identical across
+# requests and can be served from Anthropic's prompt cache.
+_REPORT_SYSTEM_PROMPT = """You are an expert computational chemist and drug discovery scientist with deep expertise in molecular docking, binding affinity prediction, and drug design.
+    Analyze the following protein-ligand docking results and provide a comprehensive, actionable report tailored for the stakeholder named below.
     
     Your analysis should include:
     1. **Executive Summary**: Key findings and overall assessment of docking success
@@ -402,64 +693,151 @@ async def generate_with_anthropic(context: str, stakeholder: str) -> str:
        - Suggested follow-up computational studies (MD simulations, binding free energy calculations)
        - Optimization strategies if applicable
     
-    Use clear, professional language appropriate for a {stakeholder}. Cite specific metrics and provide quantitative assessments where possible. 
+    Use clear, professional language appropriate for that stakeholder. Cite specific metrics and provide quantitative assessments where possible. 
     Be critical and identify limitations or uncertainties in the results."""
+
+def _report_audience(stakeholder: str) -> str:
+    """Per-request tail of the report system prompt"""
+    return f"Stakeholder: {stakeholder}"
+
+def _report_system_prompt(stakeholder: str) -> str:
+    """System prompt for the markdown docking report, tailored to the stakeholder"""
+    return f"{_REPORT_SYSTEM_PROMPT}\n\n{_report_audience(stakeholder)}"
+
+def _anthropic_system(system_prompt: str, audience: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Anthropic system blocks with the static prompt marked for prompt caching
+    
+    Anything that varies per request goes in the uncached second block so the
+    cached prefix is reused across calls. Prompts shorter than the model's
+    minimum cacheable length are simply not cached.
+    """
+    blocks = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+    if audience:
+        blocks.append({"type": "text", "text": audience})
+    return blocks
+
+def _anthropic_headers() -> Dict[str, str]:
+    return {
+        "x-api-key": ANTHROPIC_API_KEY,
+        "anthropic-version": "2023-06-01",
+        "content-type": "application/json"
+    }
+
+def _openai_headers() -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {OPENAI_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+async def _post_llm(url: str, headers: Dict[str, str], json_body: Dict[str, Any], provider_name: str) -> Dict[str, Any]:
+    """
+    POST a request to an LLM provider on the shared client and decode the response
+    
+    Args:
+        url: Provider endpoint
+        headers: Request headers, including authentication
+        json_body: Request payload, encoded with orjson (headers must set the JSON content type)
+        provider_name: Provider name used in error messages ("Anthropic", "OpenAI")
+        
+    Returns:
+        Decoded JSON response body
+        
+    Raises:
+        AIReportTimeoutError: If the request times out
+        AIAPIError: On network errors, non-200 responses or an invalid body
+    """
+    client = get_client()
+    try:
+        response = await client.post(url, headers=headers, content=orjson.dumps(json_body))
+    except httpx.TimeoutException:
+        raise AIReportTimeoutError(f"{provider_name} API request timed out after 3 minutes")
+    except httpx.NetworkError as e:
+        raise AIAPIError(f"Network error connecting to {provider_name} API: {str(e)}")
+    except httpx.RequestError as e:
+        raise AIAPIError(f"Request error to {provider_name} API: {str(e)}")
+    
+    if response.status_code == 401:
+        raise AIAPIError(f"Invalid API key for {provider_name} API")
+    elif response.status_code == 429:
+        raise AIAPIError(f"{provider_name} API rate limit exceeded. Please try again later.")
+    elif response.status_code >= 500:
+        raise AIAPIError(f"{provider_name} API server error (status {response.status_code})")
+    elif response.status_code != 200:
+        error_text = response.text[:500] if response.text else "Unknown error"
+        logger.error(f"{provider_name} API error (status {response.status_code}): {error_text}")
+        raise AIAPIError(f"{provider_name} API error (status {response.status_code}): {error_text}")
+    
+    try:
+        return orjson.loads(response.content)
+    except ValueError as e:
+        logger.error(f"Invalid JSON response from {provider_name} API: {str(e)}")
+        raise AIAPIError(f"Invalid response format from {provider_name} API")
+
+def _anthropic_text(result: Dict[str, Any]) -> str:
+    """Text of the first content block of an Anthropic messages response"""
+    content = result.get("content")
+    if not content:
+        raise AIAPIError("No content in Anthropic API response")
+    
+    if not isinstance(content, list):
+        raise AIAPIError("Invalid content format in Anthropic API response")
+    
+    text_content = content[0].get("text", "")
+    if not text_content:
+        raise AIAPIError("Empty text content in Anthropic API response")
+    
+    return text_content
+
+def _openai_text(result: Dict[str, Any]) -> str:
+    """Message content of the first choice of an OpenAI chat completions response"""
+    choices = result.get("choices")
+    if not choices:
+        raise AIAPIError("No choices in OpenAI API response")
+    
+    if not isinstance(choices, list):
+        raise AIAPIError("Invalid choices format in OpenAI API response")
+    
+    message_content = choices[0].get("message", {}).get("content", "")
+    if not message_content:
+        raise AIAPIError("Empty message content in OpenAI API response")
+    
+    return message_content
+
+async def generate_with_anthropic(context: str, stakeholder: str) -> str:
+    """Generate report using Claude API with retry logic and caching"""
+    
+    if not ANTHROPIC_API_KEY:
+        raise AIAPIError("ANTHROPIC_API_KEY not configured")
+    
+    if not context or not context.strip():
+        raise ValueError("Context cannot be empty for AI report generation")
+    
+    # Check cache
+    cache_key = _get_cache_key(context, stakeholder, "report")
+    cached_result = _get_cached_analysis(cache_key)
+    if cached_result:
+        logger.info("Returning cached AI analysis result")
+        return cached_result
+    
+    system = _anthropic_system(_REPORT_SYSTEM_PROMPT, _report_audience(stakeholder))
     
     async def _make_request():
-        async with httpx.AsyncClient(timeout=180.0) as client:  # Increased timeout to 3 minutes
-            try:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": ANTHROPIC_API_KEY,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json"
-                    },
-                    json={
-                        "model": "claude-3-7-sonnet-20250219",  # Updated to latest Claude model
-                        "max_tokens": 4096,  # Increased for more comprehensive analysis
-                        "system": system_prompt,
-                        "messages": [
-                            {"role": "user", "content": context}
-                        ],
-                        "temperature": 0.3  # Lower temperature for more consistent, factual responses
-                    }
-                )
-            except httpx.TimeoutException:
-                raise AIReportTimeoutError("Anthropic API request timed out after 3 minutes")
-            except httpx.NetworkError as e:
-                raise AIAPIError(f"Network error connecting to Anthropic API: {str(e)}")
-            except httpx.RequestError as e:
-                raise AIAPIError(f"Request error to Anthropic API: {str(e)}")
-            
-            if response.status_code == 401:
-                raise AIAPIError("Invalid API key for Anthropic API")
-            elif response.status_code == 429:
-                raise AIAPIError("Anthropic API rate limit exceeded. Please try again later.")
-            elif response.status_code >= 500:
-                raise AIAPIError(f"Anthropic API server error (status {response.status_code})")
-            elif response.status_code != 200:
-                error_text = response.text[:500] if response.text else "Unknown error"
-                logger.error(f"Anthropic API error (status {response.status_code}): {error_text}")
-                raise AIAPIError(f"Anthropic API error (status {response.status_code}): {error_text}")
-            
-            try:
-                result = response.json()
-            except ValueError as e:
-                logger.error(f"Invalid JSON response from Anthropic API: {str(e)}")
-                raise AIAPIError("Invalid response format from Anthropic API")
-            
-            if "content" not in result or not result["content"]:
-                raise AIAPIError("No content in Anthropic API response")
-            
-            if not isinstance(result["content"], list) or len(result["content"]) == 0:
-                raise AIAPIError("Invalid content format in Anthropic API response")
-            
-            text_content = result["content"][0].get("text", "")
-            if not text_content:
-                raise AIAPIError("Empty text content in Anthropic API response")
-            
-            return text_content
+        result = await _post_llm(
+            "https://api.anthropic.com/v1/messages",
+            _anthropic_headers(),
+            {
+                "model": "claude-3-7-sonnet-20250219",  # Updated to latest Claude model
+                "max_tokens": 4096,  # Increased for more comprehensive analysis
+                "system": system,
+                "messages": [
+                    {"role": "user", "content": context}
+                ],
+                "temperature": 0.3  # Lower temperature for more consistent, factual responses
+            },
+            "Anthropic"
+        )
+        return _anthropic_text(result)
     
     try:
         text_content = await _retry_with_backoff(_make_request)
@@ -472,6 +850,18 @@ async def generate_with_anthropic(context: str, stakeholder: str) -> str:
         logger.error(f"Unexpected error calling Anthropic API: {str(e)}", exc_info=True)
         raise AIAPIError(f"Unexpected error generating AI report: {str(e)}") from e
 
+def _openai_report_body(context: str, stakeholder: str) -> Dict[str, Any]:
+    """Chat completions request body for a markdown report"""
+    return {
+        "model": "gpt-4o",  # Updated to latest GPT-4o model
+        "messages": [
+            {"role": "system", "content": _report_system_prompt(stakeholder)},
+            {"role": "user", "content": context}
+        ],
+        "max_tokens": 4096,  # Increased for more comprehensive analysis
+        "temperature": 0.3  # Lower temperature for more consistent, factual responses
+    }
+
 async def generate_with_openai(context: str, stakeholder: str) -> str:
     """Generate report using OpenAI GPT-4 with retry logic and caching"""
     
@@ -488,85 +878,14 @@ async def generate_with_openai(context: str, stakeholder: str) -> str:
         logger.info("Returning cached AI analysis result")
         return cached_result
     
-    system_prompt = f"""You are an expert computational chemist and drug discovery scientist with deep expertise in molecular docking, binding affinity prediction, and drug design.
-    Analyze the following protein-ligand docking results and provide a comprehensive, actionable report tailored for a {stakeholder}.
-    
-    Your analysis should include:
-    1. **Executive Summary**: Key findings and overall assessment of docking success
-    2. **Structural Quality Assessment**: Evaluate protein structure confidence (if AlphaFold was used) and its impact on docking reliability
-    3. **Binding Affinity Analysis**: 
-       - Interpret binding affinities in context (strong: < -7 kcal/mol, moderate: -5 to -7, weak: > -5)
-       - Analyze statistical distribution of scores across ligands
-       - Assess pose consistency and clustering patterns
-       - Identify outliers and potential artifacts
-    4. **Ligand Comparison**: Compare top candidates, highlighting differences in binding modes and affinities
-    5. **Drug-likeness Considerations**: 
-       - Assess binding affinity in context of drug development
-       - Discuss potential for optimization
-       - Consider ADMET implications based on binding characteristics
-    6. **Confidence Assessment**: Evaluate reliability of results based on pose consistency, score distribution, and structural quality
-    7. **Recommendations for Next Steps**: 
-       - Specific experimental validation approaches
-       - Suggested follow-up computational studies (MD simulations, binding free energy calculations)
-       - Optimization strategies if applicable
-    
-    Use clear, professional language appropriate for a {stakeholder}. Cite specific metrics and provide quantitative assessments where possible. 
-    Be critical and identify limitations or uncertainties in the results."""
-    
     async def _make_request():
-        async with httpx.AsyncClient(timeout=180.0) as client:  # Increased timeout to 3 minutes
-            try:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {OPENAI_API_KEY}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-4o",  # Updated to latest GPT-4o model
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": context}
-                        ],
-                        "max_tokens": 4096,  # Increased for more comprehensive analysis
-                        "temperature": 0.3  # Lower temperature for more consistent, factual responses
-                    }
-                )
-            except httpx.TimeoutException:
-                raise AIReportTimeoutError("OpenAI API request timed out after 3 minutes")
-            except httpx.NetworkError as e:
-                raise AIAPIError(f"Network error connecting to OpenAI API: {str(e)}")
-            except httpx.RequestError as e:
-                raise AIAPIError(f"Request error to OpenAI API: {str(e)}")
-            
-            if response.status_code == 401:
-                raise AIAPIError("Invalid API key for OpenAI API")
-            elif response.status_code == 429:
-                raise AIAPIError("OpenAI API rate limit exceeded. Please try again later.")
-            elif response.status_code >= 500:
-                raise AIAPIError(f"OpenAI API server error (status {response.status_code})")
-            elif response.status_code != 200:
-                error_text = response.text[:500] if response.text else "Unknown error"
-                logger.error(f"OpenAI API error (status {response.status_code}): {error_text}")
-                raise AIAPIError(f"OpenAI API error (status {response.status_code}): {error_text}")
-            
-            try:
-                result = response.json()
-            except ValueError as e:
-                logger.error(f"Invalid JSON response from OpenAI API: {str(e)}")
-                raise AIAPIError("Invalid response format from OpenAI API")
-            
-            if "choices" not in result or not result["choices"]:
-                raise AIAPIError("No choices in OpenAI API response")
-            
-            if not isinstance(result["choices"], list) or len(result["choices"]) == 0:
-                raise AIAPIError("Invalid choices format in OpenAI API response")
-            
-            message_content = result["choices"][0].get("message", {}).get("content", "")
-            if not message_content:
-                raise AIAPIError("Empty message content in OpenAI API response")
-            
-            return message_content
+        result = await _post_llm(
+            "https://api.openai.com/v1/chat/completions",
+            _openai_headers(),
+            _openai_report_body(context, stakeholder),
+            "OpenAI"
+        )
+        return _openai_text(result)
     
     try:
         message_content = await _retry_with_backoff(_make_request)
@@ -586,33 +905,10 @@ def generate_template_report(
 ) -> str:
     """Generate a basic template report without AI"""
     
-    report = f"""# Molecular Docking Analysis Report
-
-{context}
-
-## Analysis Summary
-
-The molecular docking simulation has been completed successfully. 
-The best binding affinity observed was {docking_results.get('best_score', 'N/A')} kcal/mol.
-
-### Interpretation
-
-- Binding affinities below -7.0 kcal/mol generally indicate strong binding
-- Values between -5.0 and -7.0 kcal/mol suggest moderate binding
-- Values above -5.0 kcal/mol indicate weak binding
-
-### Recommendations
-
-1. Review the top-ranked poses for structural compatibility
-2. Consider running additional validation with molecular dynamics
-3. Evaluate drug-likeness properties (Lipinski's Rule of Five)
-4. Plan experimental validation for promising candidates
-
----
-*This report was generated by SNOWFLAKE - AI-powered drug discovery platform*
-"""
-    
-    return report
+    return _TEMPLATE.format(
+        context=context,
+        best_score=docking_results.get('best_score', 'N/A')
+    )
 
 def _get_stakeholder_specific_prompt(stakeholder: str, analysis_type: str) -> Dict[str, str]:
     """Get stakeholder-specific system prompts with clinical insights focus"""
@@ -1053,51 +1349,29 @@ async def generate_structured_with_anthropic(context: str, system_prompt: str, s
         return cached_result
     
     async def _make_request():
-        async with httpx.AsyncClient(timeout=180.0) as client:  # Increased timeout to 3 minutes
-            try:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": ANTHROPIC_API_KEY,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json"
-                    },
-                    json={
-                        "model": "claude-3-7-sonnet-20250219",  # Updated to latest Claude model
-                        "max_tokens": 4096,
-                        "system": system_prompt,
-                        "messages": [
-                            {"role": "user", "content": context}
-                        ],
-                        "temperature": 0.3  # Lower temperature for more consistent, factual responses
-                    }
-                )
-            except httpx.TimeoutException:
-                raise AIReportTimeoutError("Anthropic API request timed out after 3 minutes")
-            except httpx.NetworkError as e:
-                raise AIAPIError(f"Network error connecting to Anthropic API: {str(e)}")
-            except httpx.RequestError as e:
-                raise AIAPIError(f"Request error to Anthropic API: {str(e)}")
-            
-            if response.status_code != 200:
-                error_text = response.text[:500] if response.text else "Unknown error"
-                raise AIAPIError(f"Anthropic API error (status {response.status_code}): {error_text}")
-            
-            result = response.json()
-            if "content" not in result or not result["content"]:
-                raise AIAPIError("No content in Anthropic API response")
-            
-            text_content = result["content"][0].get("text", "")
-            if not text_content:
-                raise AIAPIError("Empty text content in Anthropic API response")
-            
-            # Track usage and cost
-            usage = result.get("usage", {})
-            input_tokens = usage.get("input_tokens", 0)
-            output_tokens = usage.get("output_tokens", 0)
-            _track_api_usage("anthropic", "claude-3-7-sonnet-20250219", input_tokens, output_tokens)
-            
-            return text_content
+        result = await _post_llm(
+            "https://api.anthropic.com/v1/messages",
+            _anthropic_headers(),
+            {
+                "model": "claude-3-7-sonnet-20250219",  # Updated to latest Claude model
+                "max_tokens": 4096,
+                "system": _anthropic_system(system_prompt),
+                "messages": [
+                    {"role": "user", "content": context}
+                ],
+                "temperature": 0.3  # Lower temperature for more consistent, factual responses
+            },
+            "Anthropic"
+        )
+        text_content = _anthropic_text(result)
+        
+        # Track usage and cost
+        usage = result.get("usage", {})
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        _track_api_usage("anthropic", "claude-3-7-sonnet-20250219", input_tokens, output_tokens)
+        
+        return text_content
     
     try:
         text_content = await _retry_with_backoff(_make_request)
@@ -1124,51 +1398,30 @@ async def generate_structured_with_openai(context: str, system_prompt: str, stak
         return cached_result
     
     async def _make_request():
-        async with httpx.AsyncClient(timeout=180.0) as client:  # Increased timeout to 3 minutes
-            try:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {OPENAI_API_KEY}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-4o",  # Updated to latest GPT-4o model
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": context}
-                        ],
-                        "max_tokens": 4096,
-                        "temperature": 0.3,  # Lower temperature for more consistent, factual responses
-                        "response_format": {"type": "json_object"}
-                    }
-                )
-            except httpx.TimeoutException:
-                raise AIReportTimeoutError("OpenAI API request timed out after 3 minutes")
-            except httpx.NetworkError as e:
-                raise AIAPIError(f"Network error connecting to OpenAI API: {str(e)}")
-            except httpx.RequestError as e:
-                raise AIAPIError(f"Request error to OpenAI API: {str(e)}")
-            
-            if response.status_code != 200:
-                error_text = response.text[:500] if response.text else "Unknown error"
-                raise AIAPIError(f"OpenAI API error (status {response.status_code}): {error_text}")
-            
-            result = response.json()
-            if "choices" not in result or not result["choices"]:
-                raise AIAPIError("No choices in OpenAI API response")
-            
-            message_content = result["choices"][0].get("message", {}).get("content", "")
-            if not message_content:
-                raise AIAPIError("Empty message content in OpenAI API response")
-            
-            # Track usage and cost
-            usage = result.get("usage", {})
-            prompt_tokens = usage.get("prompt_tokens", 0)
-            completion_tokens = usage.get("completion_tokens", 0)
-            _track_api_usage("openai", "gpt-4o", prompt_tokens, completion_tokens)
-            
-            return message_content
+        result = await _post_llm(
+            "https://api.openai.com/v1/chat/completions",
+            _openai_headers(),
+            {
+                "model": "gpt-4o",  # Updated to latest GPT-4o model
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": context}
+                ],
+                "max_tokens": 4096,
+                "temperature": 0.3,  # Lower temperature for more consistent, factual responses
+                "response_format": {"type": "json_object"}
+            },
+            "OpenAI"
+        )
+        message_content = _openai_text(result)
+        
+        # Track usage and cost
+        usage = result.get("usage", {})
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        _track_api_usage("openai", "gpt-4o", prompt_tokens, completion_tokens)
+        
+        return message_content
     
     try:
         message_content = await _retry_with_backoff(_make_request)
@@ -1422,107 +1675,179 @@ Please provide your analysis in JSON format with the following structure:
         logger.error(f"Error in streaming analysis: {str(e)}", exc_info=True)
         yield json.dumps({"error": f"Streaming failed: {str(e)}"})
 
-async def _stream_with_anthropic(context: str, system_prompt: str) -> AsyncGenerator[str, None]:
-    """Stream analysis using Anthropic Claude API"""
-    if not ANTHROPIC_API_KEY:
-        raise AIAPIError("ANTHROPIC_API_KEY not configured")
+async def generate_ai_report_stream(
+    job_id: str,
+    sequence: Optional[str],
+    plddt_score: Optional[float],
+    docking_results: Dict[str, Any],
+    stakeholder: str = "researcher"
+) -> AsyncIterator[str]:
+    """
+    Stream the markdown report produced by generate_ai_report as it is generated
     
-    async with httpx.AsyncClient(timeout=180.0) as client:
-        try:
-            async with client.stream(
-                "POST",
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": ANTHROPIC_API_KEY,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json"
-                },
-                json={
-                    "model": "claude-3-7-sonnet-20250219",
-                    "max_tokens": 4096,
-                    "system": system_prompt,
-                    "messages": [{"role": "user", "content": context}],
-                    "temperature": 0.3,
-                    "stream": True
-                }
-            ) as response:
-                if response.status_code != 200:
-                    error_text = await response.aread()
-                    raise AIAPIError(f"Anthropic API error (status {response.status_code}): {error_text.decode()[:500]}")
-                
-                async for line in response.aiter_lines():
-                    if not line.strip():
-                        continue
-                    if line.startswith("data: "):
-                        data = line[6:]  # Remove "data: " prefix
-                        if data == "[DONE]":
-                            break
-                        try:
-                            chunk_data = json.loads(data)
-                            if "delta" in chunk_data and "text" in chunk_data["delta"]:
-                                yield chunk_data["delta"]["text"]
-                        except json.JSONDecodeError:
-                            continue
-        except httpx.TimeoutException:
-            raise AIReportTimeoutError("Anthropic API request timed out")
-        except Exception as e:
-            raise AIAPIError(f"Error streaming from Anthropic: {str(e)}")
+    Tokens are yielded as soon as the provider sends them, so callers can start
+    rendering within the first second instead of waiting for the whole report.
+    If the provider fails before sending anything, the template report is
+    yielded instead; a failure mid-stream is raised to the caller.
+    
+    Args:
+        job_id: Unique job identifier
+        sequence: Protein sequence (if AlphaFold was used)
+        plddt_score: AlphaFold confidence score
+        docking_results: Docking simulation results
+        stakeholder: Target audience (researcher, clinician, investor, regulator)
+        
+    Yields:
+        Chunks of report text as they are generated
+        
+    Raises:
+        AIReportError: If streaming fails after the report has started
+        ValueError: If inputs are invalid
+    """
+    if not job_id:
+        raise ValueError("Job ID is required")
+    
+    if not docking_results:
+        raise ValueError("Docking results are required")
+    
+    valid_stakeholders = ["researcher", "clinician", "investor", "regulator"]
+    if stakeholder not in valid_stakeholders:
+        logger.warning(f"Invalid stakeholder '{stakeholder}', using 'researcher'")
+        stakeholder = "researcher"
+    
+    context, _ = await _build_report_context(job_id, sequence, plddt_score, docking_results)
+    if ANTHROPIC_API_KEY:
+        stream = _stream_with_anthropic(context, _REPORT_SYSTEM_PROMPT, _report_audience(stakeholder))
+    elif OPENAI_API_KEY:
+        stream = _stream_with_openai(context, _report_system_prompt(stakeholder), json_mode=False)
+    else:
+        logger.info(f"No AI API keys configured, using template report for job {job_id}")
+        yield generate_template_report(context, docking_results, plddt_score)
+        return
+    
+    started = False
+    try:
+        async for chunk in stream:
+            started = True
+            yield chunk
+    except (AIAPIError, AIReportTimeoutError) as e:
+        if started:
+            raise
+        logger.error(f"Streaming report failed for job {job_id}: {str(e)}")
+        logger.info(f"Falling back to template report for job {job_id}")
+        yield generate_template_report(context, docking_results, plddt_score)
 
-async def _stream_with_openai(context: str, system_prompt: str) -> AsyncGenerator[str, None]:
-    """Stream analysis using OpenAI GPT-4 API"""
-    if not OPENAI_API_KEY:
-        raise AIAPIError("OPENAI_API_KEY not configured")
+async def _stream_with_anthropic(
+    context: str,
+    system_prompt: str,
+    audience: Optional[str] = None
+) -> AsyncGenerator[str, None]:
+    """Stream analysis using Anthropic Claude API (audience is an uncached system prompt tail)"""
+    if not ANTHROPIC_API_KEY:
+        raise AIAPIError("ANTHROPIC_API_KEY not configured")
     
-    async with httpx.AsyncClient(timeout=180.0) as client:
-        try:
-            async with client.stream(
-                "POST",
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4o",
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": context}
-                    ],
-                    "max_tokens": 4096,
-                    "temperature": 0.3,
-                    "stream": True,
-                    "response_format": {"type": "json_object"}
-                }
-            ) as response:
-                if response.status_code != 200:
-                    error_text = await response.aread()
-                    raise AIAPIError(f"OpenAI API error (status {response.status_code}): {error_text.decode()[:500]}")
-                
-                async for line in response.aiter_lines():
-                    if not line.strip() or not line.startswith("data: "):
-                        continue
+    client = get_client()
+    try:
+        async with client.stream(
+            "POST",
+            "https://api.anthropic.com/v1/messages",
+            headers=_anthropic_headers(),
+            content=orjson.dumps({
+                "model": "claude-3-7-sonnet-20250219",
+                "max_tokens": 4096,
+                "system": _anthropic_system(system_prompt, audience),
+                "messages": [{"role": "user", "content": context}],
+                "temperature": 0.3,
+                "stream": True
+            })
+        ) as response:
+            if response.status_code != 200:
+                error_text = await response.aread()
+                raise AIAPIError(f"Anthropic API error (status {response.status_code}): {error_text.decode()[:500]}")
+            
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                if line.startswith("data: "):
                     data = line[6:]  # Remove "data: " prefix
                     if data == "[DONE]":
                         break
                     try:
-                        chunk_data = json.loads(data)
-                        if "choices" in chunk_data and len(chunk_data["choices"]) > 0:
-                            delta = chunk_data["choices"][0].get("delta", {})
-                            if "content" in delta:
-                                yield delta["content"]
+                        chunk_data = orjson.loads(data)
+                        if "delta" in chunk_data and "text" in chunk_data["delta"]:
+                            yield chunk_data["delta"]["text"]
                     except json.JSONDecodeError:
                         continue
-        except httpx.TimeoutException:
-            raise AIReportTimeoutError("OpenAI API request timed out")
-        except Exception as e:
-            raise AIAPIError(f"Error streaming from OpenAI: {str(e)}")
+    except httpx.TimeoutException:
+        raise AIReportTimeoutError("Anthropic API request timed out")
+    except Exception as e:
+        raise AIAPIError(f"Error streaming from Anthropic: {str(e)}")
+
+async def _stream_with_openai(
+    context: str,
+    system_prompt: str,
+    json_mode: bool = True
+) -> AsyncGenerator[str, None]:
+    """Stream analysis using OpenAI GPT-4 API (as a JSON object unless json_mode is False)"""
+    if not OPENAI_API_KEY:
+        raise AIAPIError("OPENAI_API_KEY not configured")
+    
+    payload = {
+        "model": "gpt-4o",
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": context}
+        ],
+        "max_tokens": 4096,
+        "temperature": 0.3,
+        "stream": True
+    }
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    
+    client = get_client()
+    try:
+        async with client.stream(
+            "POST",
+            "https://api.openai.com/v1/chat/completions",
+            headers=_openai_headers(),
+            content=orjson.dumps(payload)
+        ) as response:
+            if response.status_code != 200:
+                error_text = await response.aread()
+                raise AIAPIError(f"OpenAI API error (status {response.status_code}): {error_text.decode()[:500]}")
+            
+            async for line in response.aiter_lines():
+                if not line.strip() or not line.startswith("data: "):
+                    continue
+                data = line[6:]  # Remove "data: " prefix
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk_data = orjson.loads(data)
+                    if "choices" in chunk_data and len(chunk_data["choices"]) > 0:
+                        delta = chunk_data["choices"][0].get("delta", {})
+                        if "content" in delta:
+                            yield delta["content"]
+                except json.JSONDecodeError:
+                    continue
+    except httpx.TimeoutException:
+        raise AIReportTimeoutError("OpenAI API request timed out")
+    except Exception as e:
+        raise AIAPIError(f"Error streaming from OpenAI: {str(e)}")
 
 # ============================================================================
 # CONVERSATION INTERFACE
 # ============================================================================
 
 def get_conversation_history(job_id: str) -> List[Dict[str, str]]:
-    """Get conversation history for a job"""
+    """
+    Get conversation history for a job.
+    
+    History is held in an in-process dict, so this is a plain lookup with no
+    I/O and is safe to call directly from async handlers. If the store moves
+    to Redis, this needs an async counterpart.
+    """
     return _conversation_history.get(job_id, [])
 
 def add_to_conversation_history(job_id: str, role: str, content: str):
@@ -1990,7 +2315,7 @@ Job ID: {job_id}
 - Sequence Length: {len(sequence)} amino acids
 - Structure Prediction Method: AlphaFold 2
 - Prediction Confidence (pLDDT): {plddt_score:.2f}/100
-- Interpretation: {"High confidence" if plddt_score > 90 else "Medium confidence" if plddt_score > 70 else "Low confidence"}
+- Interpretation: {_plddt_label(plddt_score)}
 """
     else:
         context += """
@@ -1,7 +1,7 @@
 import subprocess
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 import aiofiles
 import logging
 import asyncio
@@ -10,7 +10,10 @@ from collections import defaultdict
 import statistics
 import shutil
 
+from pydantic import ValidationError as PydanticValidationError
+
 from backend.config import settings
+from backend.schemas import DockingResultsDocument
 
 logger = logging.getLogger(__name__)
 
@@ -559,6 +562,60 @@ async def process_ligands_parallel(
         
         return processed_results
 
+def extract_mode_affinities(docking_results: Any) -> List[float]:
+    """
+    Flatten the affinity of every docked mode out of a docking results document.
+    
+    Malformed entries and non-numeric affinities are skipped.
+    
+    Args:
+        docking_results: Document as returned by run_autodock_vina
+        
+    Returns:
+        Affinities in document order
+    """
+    return list(iter_mode_affinities(docking_results))
+
+def iter_mode_affinities(docking_results: Any) -> Iterator[float]:
+    """Lazy form of extract_mode_affinities(), for single-pass consumers."""
+    # Well-formed documents are checked in one pass by pydantic-core; only
+    # documents that fail it are walked entry by entry
+    try:
+        document = DockingResultsDocument.model_validate(docking_results)
+    except PydanticValidationError:
+        return _iter_mode_affinities_lenient(docking_results)
+    return (
+        mode.affinity
+        for result in document.results
+        for mode in result.modes
+        if mode.affinity is not None
+    )
+
+def _iter_mode_affinities_lenient(docking_results: Any) -> Iterator[float]:
+    """iter_mode_affinities() for documents with malformed entries."""
+    if not isinstance(docking_results, dict):
+        return
+    results = docking_results.get("results", [])
+    if not isinstance(results, list):
+        return
+    
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        modes = result.get("modes", [])
+        if not isinstance(modes, list):
+            continue
+        for mode in modes:
+            if not isinstance(mode, dict):
+                continue
+            affinity = mode.get("affinity")
+            if affinity is not None:
+                try:
+                    yield float(affinity)
+                except (ValueError, TypeError):
+                    logger.warning(f"Invalid affinity value: {affinity}")
+                    continue
+
 def calculate_docking_statistics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Calculate comprehensive statistics from docking results with advanced metrics.
@@ -10,8 +10,10 @@ import asyncio
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache
 
 import httpx
+import orjson
 from backend.config import settings
 from backend.exceptions import ServiceError
 
@@ -38,6 +40,49 @@ class ExternalAPIAuthError(ExternalAPIError):
     pass
 
 
+# Upstream APIs proxied by this service
+_UPSTREAM_BASE_URLS = (
+    settings.PUBCHEM_BASE_URL,
+    settings.CHEMBL_BASE_URL,
+    settings.UNIPROT_BASE_URL,
+    settings.PDB_BASE_URL,
+)
+
+# One HTTP client is shared by every upstream API, so all requests reuse the
+# same keep-alive connections, transport and DNS lookups instead of paying a
+# TCP/TLS handshake each time. httpx limits apply to the whole pool, so it is
+# sized from the per-host budget times the number of upstream hosts.
+# Every pooled connection is kept alive: with fewer keep-alive slots than
+# connections, each burst of concurrent proxy calls would close the surplus
+# connections and reopen them on the next burst.
+_HTTP_POOL_SIZE = settings.EXTERNAL_API_MAX_CONNECTIONS_PER_HOST * len(set(_UPSTREAM_BASE_URLS))
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=_HTTP_POOL_SIZE,
+    max_keepalive_connections=_HTTP_POOL_SIZE,
+    keepalive_expiry=settings.EXTERNAL_API_KEEPALIVE_EXPIRY,
+)
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared pooled HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=_HTTP_LIMITS,
+            timeout=httpx.Timeout(settings.EXTERNAL_API_TIMEOUT),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its connection pool."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 class HTTPMethod(str, Enum):
     """HTTP methods supported"""
     GET = "GET"
@@ -141,67 +186,68 @@ class ExternalAPIClient:
         
         for attempt in range(self.max_retries + 1):
             try:
-                async with httpx.AsyncClient(timeout=request_timeout) as client:
-                    request_kwargs = {
-                        "url": url,
-                        "headers": request_headers,
-                        "params": params,
-                    }
-                    
-                    if json_data:
-                        request_kwargs["json"] = json_data
-                    elif data:
-                        request_kwargs["data"] = data
-                    
-                    response = await client.request(method.value, **request_kwargs)
-                    
-                    # Handle rate limiting
-                    if response.status_code == 429:
-                        retry_after = response.headers.get("Retry-After", str(self.retry_delay))
-                        try:
-                            retry_after = float(retry_after)
-                        except ValueError:
-                            retry_after = self.retry_delay
-                        
-                        if attempt < self.max_retries:
-                            logger.warning(
-                                f"Rate limited, retrying after {retry_after}s "
-                                f"(attempt {attempt + 1}/{self.max_retries + 1})"
-                            )
-                            await asyncio.sleep(retry_after)
-                            continue
-                        else:
-                            raise ExternalAPIRateLimitError(
-                                f"Rate limit exceeded after {self.max_retries + 1} attempts"
-                            )
-                    
-                    # Handle authentication errors
-                    if response.status_code == 401:
-                        raise ExternalAPIAuthError("Authentication failed - invalid API key")
+                client = get_http_client()
+                request_kwargs = {
+                    "url": url,
+                    "headers": request_headers,
+                    "params": params,
+                    "timeout": request_timeout,
+                }
+                
+                if json_data:
+                    request_kwargs["json"] = json_data
+                elif data:
+                    request_kwargs["data"] = data
+                
+                response = await client.request(method.value, **request_kwargs)
+                
+                # Handle rate limiting
+                if response.status_code == 429:
+                    retry_after = response.headers.get("Retry-After", str(self.retry_delay))
+                    try:
+                        retry_after = float(retry_after)
+                    except ValueError:
+                        retry_after = self.retry_delay
                     
-                    # Handle server errors with retry
-                    if response.status_code >= 500 and attempt < self.max_retries:
+                    if attempt < self.max_retries:
                         logger.warning(
-                            f"Server error {response.status_code}, retrying "
+                            f"Rate limited, retrying after {retry_after}s "
                             f"(attempt {attempt + 1}/{self.max_retries + 1})"
                         )
-                        await asyncio.sleep(self.retry_delay * (attempt + 1))
+                        await asyncio.sleep(retry_after)
                         continue
-                    
-                    # Handle client errors
-                    if response.status_code >= 400:
-                        error_text = response.text[:500] if response.text else "Unknown error"
-                        raise ExternalAPIError(
-                            f"API request failed with status {response.status_code}: {error_text}"
+                    else:
+                        raise ExternalAPIRateLimitError(
+                            f"Rate limit exceeded after {self.max_retries + 1} attempts"
                         )
-                    
-                    # Parse response
-                    try:
-                        return response.json()
-                    except ValueError:
-                        # Return text if not JSON
-                        return {"text": response.text, "status_code": response.status_code}
-                    
+                
+                # Handle authentication errors
+                if response.status_code == 401:
+                    raise ExternalAPIAuthError("Authentication failed - invalid API key")
+                
+                # Handle server errors with retry
+                if response.status_code >= 500 and attempt < self.max_retries:
+                    logger.warning(
+                        f"Server error {response.status_code}, retrying "
+                        f"(attempt {attempt + 1}/{self.max_retries + 1})"
+                    )
+                    await asyncio.sleep(self.retry_delay * (attempt + 1))
+                    continue
+                
+                # Handle client errors
+                if response.status_code >= 400:
+                    error_text = response.text[:500] if response.text else "Unknown error"
+                    raise ExternalAPIError(
+                        f"API request failed with status {response.status_code}: {error_text}"
+                    )
+                
+                # Parse response (orjson decodes the raw bytes directly)
+                try:
+                    return orjson.loads(response.content)
+                except ValueError:
+                    # Return text if not JSON
+                    return {"text": response.text, "status_code": response.status_code}
+                
             except httpx.TimeoutException as e:
                 last_error = ExternalAPITimeoutError(f"Request timed out after {request_timeout}s")
                 if attempt < self.max_retries:
@@ -234,6 +280,54 @@ class ExternalAPIClient:
         
         raise ExternalAPIError("Request failed after all retries")
     
+    async def open_stream(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        """
+        Open a streaming GET request without buffering the body.
+        
+        The status is checked before returning, so errors surface as exceptions
+        rather than mid-stream. Streams are not retried. The caller must
+        aclose() the returned response.
+        
+        Raises:
+            ExternalAPIError: If the request fails
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        client = get_http_client()
+        request = client.build_request(
+            "GET",
+            url,
+            params=params,
+            headers=self._get_headers(headers),
+            timeout=timeout or self.timeout,
+        )
+        
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.TimeoutException:
+            raise ExternalAPITimeoutError(f"Request timed out after {timeout or self.timeout}s")
+        except httpx.NetworkError as e:
+            raise ExternalAPIError(f"Network error: {str(e)}")
+        
+        if response.status_code >= 400:
+            await response.aread()
+            await response.aclose()
+            if response.status_code == 401:
+                raise ExternalAPIAuthError("Authentication failed - invalid API key")
+            if response.status_code == 429:
+                raise ExternalAPIRateLimitError("Rate limit exceeded")
+            error_text = response.text[:500] if response.text else "Unknown error"
+            raise ExternalAPIError(
+                f"API request failed with status {response.status_code}: {error_text}"
+            )
+        
+        return response
+    
     async def get(
         self,
         endpoint: str,
@@ -307,36 +401,43 @@ class ExternalAPIClient:
         )
 
 
-# Pre-configured API clients for common services
+# Pre-configured API clients for common services. Clients are created once and
+# reused; all of them send their requests through the single process-wide
+# httpx client from get_http_client(), which the app's lifespan shuts down
+# with close_http_client().
+@lru_cache(maxsize=None)
 def get_pubchem_client() -> Optional[ExternalAPIClient]:
     """Get PubChem API client"""
     return ExternalAPIClient(
-        base_url="https://pubchem.ncbi.nlm.nih.gov/rest/pug",
-        timeout=30.0,
+        base_url=settings.PUBCHEM_BASE_URL,
+        timeout=settings.EXTERNAL_API_TIMEOUT,
     )
 
 
+@lru_cache(maxsize=None)
 def get_chembl_client() -> Optional[ExternalAPIClient]:
     """Get ChEMBL API client"""
     return ExternalAPIClient(
-        base_url="https://www.ebi.ac.uk/chembl/api/data",
-        timeout=30.0,
+        base_url=settings.CHEMBL_BASE_URL,
+        timeout=settings.EXTERNAL_API_TIMEOUT,
     )
 
 
+@lru_cache(maxsize=None)
 def get_uniprot_client() -> Optional[ExternalAPIClient]:
     """Get UniProt API client"""
     return ExternalAPIClient(
-        base_url="https://rest.uniprot.org",
-        timeout=30.0,
+        base_url=settings.UNIPROT_BASE_URL,
+        timeout=settings.EXTERNAL_API_TIMEOUT,
     )
 
 
+@lru_cache(maxsize=None)
 def get_pdb_client() -> Optional[ExternalAPIClient]:
     """Get PDB API client"""
     return ExternalAPIClient(
-        base_url="https://data.rcsb.org/rest/v1",
-        timeout=30.0,
+        base_url=settings.PDB_BASE_URL,
+        timeout=settings.EXTERNAL_API_TIMEOUT,
     )
 
 
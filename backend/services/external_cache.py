@@ -0,0 +1,195 @@
+"""
+Response cache for external API GET requests.
+Stores upstream JSON responses in Redis so repeat lookups against slow
+services (PubChem, ChEMBL, UniProt, PDB) skip the network round-trip, with a
+small short-lived in-process cache in front of Redis for the hottest keys.
+"""
+import asyncio
+import logging
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
+from urllib.parse import urlencode
+
+import orjson
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from redis.asyncio import Redis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    RedisError = Exception
+    logger.warning("redis package not available. External API responses will not be cached.")
+
+CACHE_KEY_PREFIX = "extapi"
+
+# Cache hit/miss counters (per API name)
+_cache_stats: Dict[str, Dict[str, int]] = {}
+
+# In-process LRU: key -> (expires_at, response), most recently used last
+_local_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+# In-flight lookups by cache key, shared by concurrent identical requests
+_inflight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+_redis: Optional["Redis"] = None
+
+
+def _get_redis() -> Optional["Redis"]:
+    """Get the shared Redis client, creating it (and its connection pool) on first use."""
+    global _redis
+    if not REDIS_AVAILABLE:
+        return None
+    if _redis is None:
+        _redis = Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=settings.EXTERNAL_API_CACHE_TIMEOUT,
+            socket_timeout=settings.EXTERNAL_API_CACHE_TIMEOUT,
+        )
+    return _redis
+
+
+def get_redis() -> Optional["Redis"]:
+    """Get the shared Redis client (None if redis is not installed); also used by the AI report cache."""
+    return _get_redis()
+
+
+def make_cache_key(api_name: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the cache key for a GET request.
+
+    Query parameters are sorted so that the same request always maps to the
+    same key regardless of parameter order.
+    """
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    digest = hashlib.sha1(f"{endpoint.lstrip('/')}?{query}".encode()).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:{api_name}:{digest}"
+
+
+def _local_get(key: str) -> Optional[Dict[str, Any]]:
+    """Get a response from the in-process cache if present and not expired."""
+    entry = _local_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        del _local_cache[key]
+        return None
+    _local_cache.move_to_end(key)
+    return value
+
+
+def _local_set(key: str, value: Dict[str, Any]) -> None:
+    """Store a response in the in-process cache, evicting the least recently used entry."""
+    _local_cache[key] = (time.monotonic() + settings.EXTERNAL_API_LOCAL_CACHE_TTL, value)
+    _local_cache.move_to_end(key)
+    while len(_local_cache) > settings.EXTERNAL_API_LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+
+
+def _record(api_name: str, outcome: str) -> None:
+    stats = _cache_stats.setdefault(api_name, {"local_hit": 0, "cache_hit": 0, "cache_miss": 0, "coalesced": 0})
+    stats[outcome] += 1
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Get cache hit/miss counters per API."""
+    return {api: dict(stats) for api, stats in _cache_stats.items()}
+
+
+async def _load(
+    api_name: str,
+    key: str,
+    ttl: int,
+    fetch_fn: Callable[[], Awaitable[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Load a response from Redis, falling back to the upstream fetch on a miss."""
+    redis = _get_redis()
+    cached = None
+    if redis is not None:
+        try:
+            # GETEX refreshes the TTL so frequently used entries stay warm
+            cached = await redis.getex(key, ex=ttl)
+        except RedisError as e:
+            logger.warning("External API cache lookup failed for %s: %s", key, e)
+
+    if cached is not None:
+        _record(api_name, "cache_hit")
+        result = orjson.loads(cached)
+        _local_set(key, result)
+        return result
+
+    _record(api_name, "cache_miss")
+    result = await fetch_fn()
+    _local_set(key, result)
+
+    if redis is not None:
+        try:
+            await redis.set(key, orjson.dumps(result), ex=ttl)
+        except (RedisError, TypeError) as e:
+            logger.warning("External API cache store failed for %s: %s", key, e)
+
+    return result
+
+
+async def cached_get(
+    api_name: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    fetch_fn: Callable[[], Awaitable[Dict[str, Any]]],
+    ttl: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Return a cached external API response, fetching and storing it on a miss.
+
+    Lookups check the in-process cache, then Redis, then the upstream API.
+    Concurrent identical requests share a single lookup/fetch, so a burst of
+    N requests for an uncached key results in one upstream call.
+    Redis failures never fail the request: the upstream fetch is used instead.
+
+    Args:
+        api_name: Name/identifier for the API
+        endpoint: API endpoint path
+        params: Query parameters
+        fetch_fn: Coroutine function performing the upstream request
+        ttl: Cache TTL in seconds (defaults to EXTERNAL_API_CACHE_TTL)
+
+    Returns:
+        Response data
+    """
+    if not settings.EXTERNAL_API_CACHE_ENABLED:
+        return await fetch_fn()
+
+    key = make_cache_key(api_name, endpoint, params)
+
+    local = _local_get(key)
+    if local is not None:
+        _record(api_name, "local_hit")
+        return local
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _load(api_name, key, ttl or settings.EXTERNAL_API_CACHE_TTL, fetch_fn)
+        )
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        _record(api_name, "coalesced")
+
+    # Shielded so one caller disconnecting doesn't cancel the shared fetch
+    return await asyncio.shield(task)
+
+
+async def close_cache() -> None:
+    """Close the Redis connection pool."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
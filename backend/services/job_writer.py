@@ -0,0 +1,98 @@
+"""
+Micro-batched writer for new job rows.
+Job submissions that arrive within a few milliseconds of each other are
+inserted with a single multi-row INSERT ... RETURNING and one commit, instead
+of one round-trip and commit per job.
+"""
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import settings
+from backend.database import async_session_maker
+from backend.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobWriter:
+    """Collects pending job inserts and flushes them in batches from one consumer task."""
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+        batch_size: Optional[int] = None,
+        batch_window: Optional[float] = None,
+    ):
+        self._session_factory = session_factory
+        self._batch_size = batch_size or settings.JOB_INSERT_BATCH_SIZE
+        self._batch_window = batch_window if batch_window is not None else settings.JOB_INSERT_BATCH_WINDOW
+        self._queue: Optional["asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]"] = None
+        self._consumer: Optional["asyncio.Task[None]"] = None
+    
+    async def insert(self, values: Dict[str, Any]) -> Job:
+        """
+        Insert a job row, batched with any other inserts submitted concurrently.
+        
+        Args:
+            values: Column values for the new job
+            
+        Returns:
+            The inserted Job, including server-generated columns
+            
+        Raises:
+            SQLAlchemyError: If the batch containing this job fails to insert
+        """
+        if self._consumer is None or self._consumer.done():
+            self._queue = asyncio.Queue()
+            self._consumer = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((values, future))
+        return await future
+    
+    async def _next_batch(self) -> List[Tuple[Dict[str, Any], asyncio.Future]]:
+        """Wait for one pending insert, then take whatever else arrives within the batch window."""
+        batch = [await self._queue.get()]
+        if self._batch_window > 0:
+            await asyncio.sleep(self._batch_window)
+        while len(batch) < self._batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+    
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                async with self._session_factory() as session:
+                    result = await session.scalars(
+                        insert(Job).returning(Job),
+                        [values for values, _ in batch],
+                    )
+                    jobs = {job.id: job for job in result.all()}
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"Failed to insert batch of {len(batch)} jobs: {str(e)}", exc_info=True)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for values, future in batch:
+                if not future.done():
+                    future.set_result(jobs[values["id"]])
+    
+    async def close(self) -> None:
+        """Stop the consumer task."""
+        if self._consumer is not None:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+            self._consumer = None
+
+
+job_writer = JobWriter()
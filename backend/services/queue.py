@@ -2,8 +2,10 @@
 Task queue system using Celery and Redis for background job processing
 """
 
-from celery import Celery
+from celery import Celery, Task
 from celery.exceptions import Retry, TaskError
+from typing import Any, Awaitable, Dict, Set
+import asyncio
 import os
 import logging
 
@@ -42,21 +44,77 @@ celery_app.conf.update(
 
 # Import tasks to register them
 from backend.services import workflow
+from backend.database import close_db
+from backend.services.ai_report import close_client as close_ai_client
+from backend.services.external_cache import close_cache
+
+
+async def _run_workflow(coro: Awaitable[Any]) -> Any:
+    """
+    Run a workflow coroutine, then close every client bound to this task's event loop.
+    
+    Each task runs in its own asyncio.run() loop, so the DB engine, the LLM
+    HTTP client and the Redis cache client must not outlive it.
+    """
+    try:
+        return await coro
+    finally:
+        await close_db()
+        await close_ai_client()
+        await close_cache()
+
+
+async def enqueue_task(task: Task, **kwargs: Any) -> str:
+    """
+    Publish a task to the broker without blocking the event loop.
+    
+    Args:
+        task: Celery task to run
+        **kwargs: Task keyword arguments (must be JSON-serializable)
+        
+    Returns:
+        Celery task ID
+    """
+    result = await asyncio.to_thread(task.apply_async, kwargs=kwargs)
+    return result.id
+
+# Submissions still being published; holds references so they aren't collected
+_pending_submissions: Set["asyncio.Task[None]"] = set()
+
+
+async def _submit(task: Task, kwargs: Dict[str, Any]) -> None:
+    try:
+        await enqueue_task(task, **kwargs)
+    except Exception as e:
+        logger.error(f"Failed to enqueue {task.name} for job {kwargs.get('job_id')}: {str(e)}", exc_info=True)
+
+
+def submit_task(task: Task, **kwargs: Any) -> None:
+    """
+    Publish a task in the background so the caller can respond immediately.
+    
+    Any rows the task reads must already be committed. Publish failures are
+    logged and the job is left in its current state.
+    
+    Args:
+        task: Celery task to run
+        **kwargs: Task keyword arguments (must be JSON-serializable)
+    """
+    submission = asyncio.create_task(_submit(task, kwargs))
+    _pending_submissions.add(submission)
+    submission.add_done_callback(_pending_submissions.discard)
 
 # Define Celery tasks
 @celery_app.task(name="run_alphafold_then_dock", bind=True, max_retries=3)
 def run_alphafold_then_dock_task(self, job_id, sequence, ligand_files, parameters):
     """Celery task wrapper for AlphaFold + docking workflow"""
-    import asyncio
-    from backend.exceptions import BackendError
-    
     try:
         logger.info(f"Starting Celery task for AlphaFold + docking workflow, job {job_id}")
-        result = asyncio.run(
+        result = asyncio.run(_run_workflow(
             workflow.run_alphafold_then_dock(
                 job_id, sequence, ligand_files, parameters
             )
-        )
+        ))
         logger.info(f"Completed Celery task for job {job_id}")
         return result
     except Exception as e:
@@ -71,18 +129,38 @@ def run_alphafold_then_dock_task(self, job_id, sequence, ligand_files, parameter
         raise TaskError(f"Task failed for job {job_id}: {str(e)}")
 
 @celery_app.task(name="run_docking_only", bind=True, max_retries=3)
-def run_docking_only_task(self, job_id, protein_pdb, ligand_files, parameters):
+def run_docking_only_task(self, job_id, protein_pdb, ligand_files, parameters, protein_pdb_path=None):
     """Celery task wrapper for docking-only workflow"""
-    import asyncio
-    from backend.exceptions import BackendError
-    
     try:
         logger.info(f"Starting Celery task for docking-only workflow, job {job_id}")
-        result = asyncio.run(
+        result = asyncio.run(_run_workflow(
             workflow.run_docking_only(
-                job_id, protein_pdb, ligand_files, parameters
+                job_id, protein_pdb, ligand_files, parameters, protein_pdb_path
+            )
+        ))
+        logger.info(f"Completed Celery task for job {job_id}")
+        return result
+    except Exception as e:
+        logger.error(f"Celery task failed for job {job_id}: {str(e)}", exc_info=True)
+        
+        # Retry on transient errors
+        if isinstance(e, (ConnectionError, TimeoutError)) and self.request.retries < self.max_retries:
+            logger.info(f"Retrying task for job {job_id} (attempt {self.request.retries + 1}/{self.max_retries})")
+            raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+        
+        # Don't retry on permanent errors
+        raise TaskError(f"Task failed for job {job_id}: {str(e)}")
+
+@celery_app.task(name="run_alphafold_only", bind=True, max_retries=3)
+def run_alphafold_only_task(self, job_id, sequence, model_preset, max_template_date, db_preset, use_gpu_relax):
+    """Celery task wrapper for AlphaFold-only workflow"""
+    try:
+        logger.info(f"Starting Celery task for AlphaFold-only workflow, job {job_id}")
+        result = asyncio.run(_run_workflow(
+            workflow.run_alphafold_only(
+                job_id, sequence, model_preset, max_template_date, db_preset, use_gpu_relax
             )
-        )
+        ))
         logger.info(f"Completed Celery task for job {job_id}")
         return result
     except Exception as e:
@@ -2,13 +2,16 @@ import logging
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
+import aiofiles
 
 from backend.database import async_session_maker
 from backend.config import settings
 from backend.models import Job, JobStatus
+from backend.exceptions import DatabaseError, FileProcessingError
 from backend.services.alphafold import run_alphafold, extract_quality_metrics, ModelPreset, DatabasePreset
-from backend.services.docking import run_autodock_vina
+from backend.services.docking import run_autodock_vina, extract_mode_affinities
 from backend.services.ai_report import generate_ai_report
 from backend.services.blockchain import store_on_blockchain
 from backend.services.binding_site import analyze_binding_sites
@@ -35,9 +38,6 @@ async def update_job_status(
         progress_message: Optional human-readable progress message
         **kwargs: Additional fields to update
     """
-    from sqlalchemy.exc import SQLAlchemyError
-    from backend.exceptions import DatabaseError
-    
     async with async_session_maker() as session:
         try:
             result = await session.execute(select(Job).where(Job.id == job_id))
@@ -64,6 +64,10 @@ async def update_job_status(
                     except Exception as e:
                         logger.warning(f"Failed to set {key} for job {job_id}: {str(e)}")
             
+            # Keep the flat affinity list read by the statistics endpoints in sync
+            if "docking_results" in kwargs:
+                job.binding_affinities = extract_mode_affinities(kwargs["docking_results"])
+            
             if status == JobStatus.COMPLETED:
                 job.completed_at = datetime.now()
                 if progress is None:
@@ -282,7 +286,8 @@ async def run_alphafold_then_dock(
             sequence=sequence,
             plddt_score=plddt_score,
             docking_results=enhanced_docking_results,
-            stakeholder="researcher"
+            stakeholder="researcher",
+            race_providers=settings.AI_REPORT_RACE_PROVIDERS
         )
         
         await update_job_status(
@@ -328,41 +333,122 @@ async def run_alphafold_then_dock(
             logger.error(f"Failed to update job status to FAILED for job {job_id}: {str(status_error)}", exc_info=True)
         raise
 
+async def run_alphafold_only(
+    job_id: str,
+    sequence: str,
+    model_preset: str = ModelPreset.MONOMER.value,
+    max_template_date: Optional[str] = None,
+    db_preset: str = DatabasePreset.REDUCED_DBS.value,
+    use_gpu_relax: bool = True
+):
+    """
+    AlphaFold-only workflow: structure prediction and quality assessment, no docking.
+
+    Args:
+        job_id: Unique job identifier
+        sequence: Protein amino acid sequence
+        model_preset: AlphaFold model preset name
+        max_template_date: Maximum template date (YYYY-MM-DD format)
+        db_preset: AlphaFold database preset name
+        use_gpu_relax: Whether to use GPU-accelerated relaxation
+    """
+    try:
+        logger.info(f"Starting AlphaFold-only workflow for job {job_id}")
+        await update_job_status(
+            job_id,
+            JobStatus.PREDICTING_STRUCTURE,
+            progress=0.0,
+            progress_message="Initializing AlphaFold structure prediction..."
+        )
+
+        # Progress callback for status updates
+        async def progress_callback(status: str, progress: float):
+            logger.info(f"AlphaFold progress for job {job_id}: {status} ({progress*100:.1f}%)")
+            await update_job_status(
+                job_id,
+                JobStatus.PREDICTING_STRUCTURE,
+                progress=progress * 90.0,  # Map to 0-90% range
+                progress_message=f"AlphaFold: {status}"
+            )
+
+        predicted_pdb, plddt_score, quality_metrics = await run_alphafold(
+            sequence,
+            job_id,
+            model_preset=ModelPreset(model_preset),
+            max_template_date=max_template_date,
+            db_preset=DatabasePreset(db_preset),
+            use_gpu_relax=use_gpu_relax,
+            progress_callback=progress_callback
+        )
+
+        if not quality_metrics:
+            quality_metrics = await extract_quality_metrics(predicted_pdb)
+
+        await update_job_status(
+            job_id,
+            JobStatus.COMPLETED,
+            progress=100.0,
+            progress_message=f"AlphaFold prediction completed (pLDDT: {plddt_score:.2f})",
+            predicted_pdb_path=str(predicted_pdb),
+            plddt_score=plddt_score,
+            quality_metrics=quality_metrics
+        )
+
+        logger.info(f"Job {job_id} completed successfully - AlphaFold-only workflow finished")
+
+    except Exception as e:
+        logger.error(f"Error in AlphaFold-only workflow for job {job_id}: {str(e)}", exc_info=True)
+        try:
+            await update_job_status(
+                job_id,
+                JobStatus.FAILED,
+                error_message=str(e)
+            )
+        except Exception as status_error:
+            logger.error(f"Failed to update job status to FAILED for job {job_id}: {str(status_error)}", exc_info=True)
+        raise
+
 async def run_docking_only(
     job_id: str,
-    protein_pdb: str,
+    protein_pdb: Optional[str],
     ligand_files: List[str],
-    parameters: Dict[str, Any]
+    parameters: Dict[str, Any],
+    protein_pdb_path: Optional[str] = None
 ):
     """
     Docking-only workflow: Use existing PDB → Molecular docking → AI report
     
     Args:
         job_id: Unique job identifier
-        protein_pdb: PDB file content as string
+        protein_pdb: PDB file content as string (None to reuse protein_pdb_path)
         ligand_files: List of ligand file contents
         parameters: Docking parameters
+        protein_pdb_path: Already-saved PDB file, used when protein_pdb is None
+            (e.g. when retrying a job)
     """
     try:
-        # Step 1: Save uploaded PDB file
-        logger.info(f"Saving uploaded PDB for job {job_id}")
-        
-        import aiofiles
-        from backend.exceptions import FileProcessingError
-        
-        try:
-            pdb_dir = settings.UPLOADS_DIR / job_id
-            pdb_dir.mkdir(parents=True, exist_ok=True)
-            pdb_path = pdb_dir / "protein.pdb"
+        if protein_pdb is None:
+            # Step 1: Reuse the PDB file saved by a previous run
+            if not protein_pdb_path or not Path(protein_pdb_path).exists():
+                raise FileProcessingError(f"Protein PDB file not found: {protein_pdb_path}")
+            pdb_path = Path(protein_pdb_path)
+        else:
+            # Step 1: Save uploaded PDB file
+            logger.info(f"Saving uploaded PDB for job {job_id}")
             
-            async with aiofiles.open(pdb_path, 'w') as f:
-                await f.write(protein_pdb)
-        except OSError as e:
-            logger.error(f"Failed to create directory or write PDB file for job {job_id}: {str(e)}")
-            raise FileProcessingError(f"Failed to save uploaded PDB file: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error saving PDB file for job {job_id}: {str(e)}", exc_info=True)
-            raise FileProcessingError(f"Unexpected error saving PDB file: {str(e)}")
+            try:
+                pdb_dir = settings.UPLOADS_DIR / job_id
+                pdb_dir.mkdir(parents=True, exist_ok=True)
+                pdb_path = pdb_dir / "protein.pdb"
+                
+                async with aiofiles.open(pdb_path, 'w') as f:
+                    await f.write(protein_pdb)
+            except OSError as e:
+                logger.error(f"Failed to create directory or write PDB file for job {job_id}: {str(e)}")
+                raise FileProcessingError(f"Failed to save uploaded PDB file: {str(e)}")
+            except Exception as e:
+                logger.error(f"Unexpected error saving PDB file for job {job_id}: {str(e)}", exc_info=True)
+                raise FileProcessingError(f"Unexpected error saving PDB file: {str(e)}")
         
         await update_job_status(
             job_id,
@@ -409,7 +495,8 @@ async def run_docking_only(
             sequence=None,
             plddt_score=None,
             docking_results=docking_results,
-            stakeholder="researcher"
+            stakeholder="researcher",
+            race_providers=settings.AI_REPORT_RACE_PROVIDERS
         )
         
         await update_job_status(
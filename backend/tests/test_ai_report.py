@@ -0,0 +1,233 @@
+import asyncio
+import uuid
+import httpx
+import orjson
+import pytest
+from types import SimpleNamespace
+from backend.main import app
+from backend.routes.jobs import get_job_with_results
+from backend.services import ai_report, external_cache
+from backend.services.ai_report import generate_ai_report_stream
+
+DOCKING_RESULTS = {
+    "total_ligands": 1,
+    "successful_ligands": 1,
+    "best_score": -8.2,
+    "results": [{"ligand_name": "lig", "binding_affinity": -8.2, "affinity_range": 0.0, "pose_consistency": 1.0}],
+}
+
+@pytest.fixture(autouse=True)
+def no_report_cache(monkeypatch):
+    """Keep each test's reports out of Redis and the shared in-process cache"""
+    monkeypatch.setattr(external_cache, "_get_redis", lambda: None)
+    monkeypatch.setattr(ai_report, "_report_cache", type(ai_report._report_cache)())
+
+def _use_transport(monkeypatch, handler):
+    """Route the shared LLM client through a mock transport"""
+    monkeypatch.setattr(ai_report, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+@pytest.mark.asyncio
+async def test_report_stream_without_api_keys(monkeypatch):
+    """Test that the template report is streamed when no AI provider is configured"""
+    monkeypatch.setattr(ai_report, "ANTHROPIC_API_KEY", None)
+    monkeypatch.setattr(ai_report, "OPENAI_API_KEY", None)
+
+    chunks = [chunk async for chunk in generate_ai_report_stream("job", None, None, DOCKING_RESULTS)]
+
+    assert len(chunks) == 1
+    assert chunks[0].startswith("# Molecular Docking Analysis Report")
+    assert "-8.2 kcal/mol" in chunks[0]
+
+@pytest.mark.asyncio
+async def test_report_stream_from_anthropic(monkeypatch):
+    """Test that Anthropic SSE text deltas are yielded in order"""
+    monkeypatch.setattr(ai_report, "ANTHROPIC_API_KEY", "test-key")
+    events = [
+        {"type": "message_start", "message": {}},
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "# Report"}},
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": " body"}},
+        {"type": "message_delta", "delta": {"stop_reason": "end_turn"}},
+        {"type": "message_stop"},
+    ]
+    body = b"".join(
+        b"event: " + event["type"].encode() + b"\ndata: " + orjson.dumps(event) + b"\n\n" for event in events
+    )
+    requests = []
+
+    def handler(request):
+        requests.append(orjson.loads(request.content))
+        return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+    _use_transport(monkeypatch, handler)
+
+    chunks = [chunk async for chunk in generate_ai_report_stream("job", None, None, DOCKING_RESULTS)]
+
+    assert chunks == ["# Report", " body"]
+    assert requests[0]["stream"] is True
+    assert requests[0]["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert requests[0]["system"][1]["text"] == "Stakeholder: researcher"
+
+@pytest.mark.asyncio
+async def test_report_stream_route_is_not_gzipped(monkeypatch):
+    """Test that the SSE report route is not buffered by gzip for clients that accept it"""
+    monkeypatch.setattr(ai_report, "ANTHROPIC_API_KEY", None)
+    monkeypatch.setattr(ai_report, "OPENAI_API_KEY", None)
+    job = SimpleNamespace(id="job", protein_sequence=None, plddt_score=None, docking_results=DOCKING_RESULTS)
+    app.dependency_overrides[get_job_with_results] = lambda: job
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get(
+                f"/api/jobs/{uuid.uuid4()}/report/stream", headers={"Accept-Encoding": "gzip"}
+            )
+    finally:
+        app.dependency_overrides.pop(get_job_with_results)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in response.headers
+    assert "Molecular Docking Analysis Report" in response.text
+
+@pytest.mark.asyncio
+async def test_race_providers_uses_first_report(monkeypatch):
+    """Test that racing providers returns the fastest report and cancels the other"""
+    monkeypatch.setattr(ai_report, "ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(ai_report, "OPENAI_API_KEY", "test-key")
+    cancelled = []
+
+    async def slow(context, stakeholder):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "slow report"
+
+    async def failing(context, stakeholder):
+        raise ai_report.AIAPIError("unavailable")
+
+    async def fast(context, stakeholder):
+        await asyncio.sleep(0)
+        return "fast report"
+
+    monkeypatch.setattr(ai_report, "generate_with_anthropic", slow)
+    monkeypatch.setattr(ai_report, "generate_with_openai", fast)
+    report = await ai_report.generate_ai_report("job", None, None, DOCKING_RESULTS, race_providers=True)
+    assert report == "fast report"
+    assert cancelled == [True]
+
+    # A provider that fails first doesn't decide the race
+    monkeypatch.setattr(ai_report, "generate_with_anthropic", failing)
+    report = await ai_report.generate_ai_report("job", "MKV", 90.0, DOCKING_RESULTS, race_providers=True)
+    assert report == "fast report"
+
+@pytest.mark.asyncio
+async def test_report_cache_skips_provider(monkeypatch):
+    """Test that identical report inputs are served from the cache, template reports are not cached"""
+    monkeypatch.setattr(ai_report, "ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(ai_report, "OPENAI_API_KEY", None)
+    calls = []
+
+    async def provider(context, stakeholder):
+        calls.append(stakeholder)
+        if len(calls) == 1:
+            raise ai_report.AIAPIError("unavailable")
+        return f"report for {stakeholder}"
+
+    monkeypatch.setattr(ai_report, "generate_with_anthropic", provider)
+
+    # Template fallback is not cached, so the provider is retried
+    fallback = await ai_report.generate_ai_report("job", None, None, DOCKING_RESULTS)
+    assert fallback.startswith("# Molecular Docking Analysis Report")
+
+    first = await ai_report.generate_ai_report("job", None, None, DOCKING_RESULTS)
+    second = await ai_report.generate_ai_report("job", None, None, dict(DOCKING_RESULTS))
+    other = await ai_report.generate_ai_report("job", None, None, DOCKING_RESULTS, stakeholder="investor")
+    # The prompt names the job, so another job's report is never reused
+    other_job = await ai_report.generate_ai_report("other-job", None, None, DOCKING_RESULTS)
+
+    assert first == second == other_job == "report for researcher"
+    assert other == "report for investor"
+    assert calls == ["researcher", "researcher", "investor", "researcher"]
+
+@pytest.mark.asyncio
+async def test_prewarm_client_connects_to_configured_providers(monkeypatch):
+    """Test that startup pre-warming only contacts configured providers and ignores errors"""
+    monkeypatch.setattr(ai_report, "ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(ai_report, "OPENAI_API_KEY", None)
+    requests = []
+
+    def handler(request):
+        requests.append((request.method, request.url.host))
+        return httpx.Response(404)
+
+    _use_transport(monkeypatch, handler)
+
+    await ai_report.prewarm_client()
+
+    assert requests == [("HEAD", "api.anthropic.com")]
+
+@pytest.mark.asyncio
+async def test_openai_report_response_parsing(monkeypatch):
+    """Test that OpenAI requests are sent as JSON and malformed response bodies raise AIAPIError"""
+    monkeypatch.setattr(ai_report, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(ai_report, "INITIAL_RETRY_DELAY", 0)
+    monkeypatch.setattr(ai_report, "_analysis_cache", {})
+    bodies = [
+        orjson.dumps({"choices": [{"message": {"content": "# Report"}}]}),
+        b"not json",
+    ]
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=bodies[0])
+
+    _use_transport(monkeypatch, handler)
+    assert await ai_report.generate_with_openai("context", "researcher") == "# Report"
+    assert requests[0].headers["content-type"] == "application/json"
+    assert orjson.loads(requests[0].content)["messages"][-1]["content"] == "context"
+
+    _use_transport(monkeypatch, lambda request: httpx.Response(200, content=bodies[1]))
+    with pytest.raises(ai_report.AIAPIError, match="Invalid response format"):
+        await ai_report.generate_with_openai("other context", "researcher")
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reports_are_coalesced(monkeypatch):
+    """Test that concurrent requests for the same report share one provider call"""
+    monkeypatch.setattr(ai_report, "ANTHROPIC_API_KEY", "test-key")
+    calls = []
+
+    async def provider(context, stakeholder):
+        calls.append(stakeholder)
+        await asyncio.sleep(0.01)
+        return "shared report"
+
+    monkeypatch.setattr(ai_report, "generate_with_anthropic", provider)
+
+    reports = await asyncio.gather(*(
+        ai_report.generate_ai_report("job", None, None, DOCKING_RESULTS) for _ in range(3)
+    ))
+
+    assert reports == ["shared report"] * 3
+    assert len(calls) == 1
+    assert ai_report._inflight_reports == {}
+
+def test_report_cache_key_ignores_result_order():
+    """Test that equivalent docking results differing in order or float noise share a cache key"""
+    results = [
+        {"ligand_name": "a", "binding_affinity": -8.2},
+        {"ligand_name": "b", "binding_affinity": -7.1},
+    ]
+    reordered = [
+        {"ligand_name": "b", "binding_affinity": -7.10000001},
+        {"ligand_name": "a", "binding_affinity": -8.2},
+    ]
+    key = ai_report._report_cache_key("job", None, None, {"results": results}, "researcher")
+
+    assert ai_report._report_cache_key("job", None, None, {"results": reordered}, "researcher") == key
+    assert ai_report._report_cache_key("job", None, None, {"results": results[:1]}, "researcher") != key
+    assert ai_report._report_cache_key("job", None, None, {"results": results}, "investor") != key
+    assert ai_report._report_cache_key("other-job", None, None, {"results": results}, "researcher") != key
+    # The caller's results are not modified
+    assert reordered[0]["binding_affinity"] == -7.10000001
@@ -1,6 +1,6 @@
 import pytest
 from httpx import AsyncClient
-from backend.main import app
+from backend.main import CachedCORSMiddleware, app
 
 @pytest.mark.asyncio
 async def test_health_endpoint():
@@ -26,3 +26,15 @@ async def test_job_submission():
         
         # This would test actual submission in integration tests
         assert job_data["job_type"] == "sequence_to_docking"
+
+def test_cors_origins_match_exactly():
+    """Test that CORS_ORIGINS entries are matched exactly, with no implicit wildcards"""
+    middleware = CachedCORSMiddleware(
+        app,
+        allow_origins=["http://localhost:3000", "https://*.vercel.app"],
+    )
+    
+    assert middleware.is_allowed_origin("http://localhost:3000")
+    assert middleware.is_allowed_origin("https://*.vercel.app")
+    assert not middleware.is_allowed_origin("https://evil.vercel.app")
+    assert not middleware.is_allowed_origin("http://localhost:8080")
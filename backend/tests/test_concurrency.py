@@ -0,0 +1,26 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from backend.utils.concurrency import limit_concurrency
+
+@pytest.mark.asyncio
+async def test_requests_over_limit_are_rejected():
+    """Test that calls beyond the concurrency limit fail fast with 503"""
+    release = asyncio.Event()
+    
+    @limit_concurrency(2)
+    async def handler():
+        await release.wait()
+        return "ok"
+    
+    running = [asyncio.create_task(handler()) for _ in range(2)]
+    await asyncio.sleep(0)
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await handler()
+    assert exc_info.value.status_code == 503
+    assert "Retry-After" in exc_info.value.headers
+    
+    release.set()
+    assert await asyncio.gather(*running) == ["ok", "ok"]
+    assert await handler() == "ok"
@@ -0,0 +1,66 @@
+import orjson
+import pytest
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from backend.database import Base, _migrate_schema
+from backend.models import Job, JobStatus, JobType
+
+@pytest.fixture
+async def engine():
+    """Empty in-memory database with the current schema"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_migrate_rewrites_enum_names_to_values(engine):
+    """Test that rows stored by the old SQLEnum columns (member names) are rewritten to values"""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "INSERT INTO jobs (id, job_name, job_type, status) VALUES "
+            "('old', 'Old job', 'SEQUENCE_TO_DOCKING', 'FAILED'), "
+            "('new', 'New job', 'docking_only', 'completed')"
+        )
+        await conn.run_sync(_migrate_schema)
+        # Running it again is a no-op
+        await conn.run_sync(_migrate_schema)
+        rows = (await conn.execute(select(Job.id, Job.job_type, Job.status).order_by(Job.id))).all()
+    
+    assert rows == [
+        ("new", JobType.DOCKING_ONLY.value, JobStatus.COMPLETED.value),
+        ("old", JobType.SEQUENCE_TO_DOCKING.value, JobStatus.FAILED.value),
+    ]
+
+@pytest.mark.asyncio
+async def test_migrate_adds_and_backfills_binding_affinities(engine):
+    """Test that a jobs table without binding_affinities gets the column, filled from docking_results"""
+    docking_results = {"results": [{"modes": [{"affinity": -8.5}, {"affinity": -7.0}]}]}
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ALTER TABLE jobs DROP COLUMN binding_affinities")
+        await conn.exec_driver_sql(
+            "INSERT INTO jobs (id, job_name, job_type, status, docking_results) VALUES "
+            "('docked', 'Docked', 'docking_only', 'completed', ?), "
+            "('malformed', 'Malformed', 'docking_only', 'completed', '{\"results\": 5}'), "
+            "('pending', 'Pending', 'docking_only', 'submitted', NULL)",
+            (orjson.dumps(docking_results).decode(),)
+        )
+        await conn.run_sync(_migrate_schema)
+        rows = dict((await conn.execute(select(Job.id, Job.binding_affinities))).all())
+    
+    assert rows == {"docked": [-8.5, -7.0], "malformed": None, "pending": None}
+
+@pytest.mark.asyncio
+async def test_migrate_replaces_blockchain_tx_hash_index(engine):
+    """Test that the old full blockchain_tx_hash index is dropped and the partial one created"""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("DROP INDEX idx_job_blockchain_tx_notnull")
+        await conn.exec_driver_sql("CREATE INDEX ix_jobs_blockchain_tx_hash ON jobs (blockchain_tx_hash)")
+        await conn.run_sync(_migrate_schema)
+        indexes = {
+            index["name"] for index in await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes("jobs"))
+        }
+    
+    assert "ix_jobs_blockchain_tx_hash" not in indexes
+    assert "idx_job_blockchain_tx_notnull" in indexes
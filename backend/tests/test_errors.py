@@ -0,0 +1,58 @@
+import pytest
+import orjson
+from fastapi import HTTPException, Request
+from backend.exceptions import DatabaseError, NotFoundError, ValidationError
+from backend.main import backend_exception_handler
+from backend.utils.errors import handle_errors
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error, status_code, detail", [
+    (ValidationError("bad input"), 400, "bad input"),
+    (NotFoundError("Job not found: x"), 404, "Job not found: x"),
+    (DatabaseError("write failed"), 500, "write failed"),
+    (RuntimeError("boom"), 500, "Internal server error"),
+])
+async def test_errors_are_translated(error, status_code, detail):
+    """Test that backend errors escaping a handler become the matching HTTP errors"""
+    @handle_errors
+    async def handler():
+        raise error
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await handler()
+    assert exc_info.value.status_code == status_code
+    assert exc_info.value.detail == detail
+
+@pytest.mark.asyncio
+async def test_http_exceptions_pass_through():
+    """Test that HTTPExceptions raised by a handler are not rewritten"""
+    @handle_errors
+    async def handler():
+        raise HTTPException(status_code=409, detail="conflict")
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await handler()
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail == "conflict"
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error, status_code, body", [
+    (
+        DatabaseError("(sqlite3.OperationalError) no such table: jobs"),
+        500,
+        {"detail": "Database operation failed", "message": "(sqlite3.OperationalError) no such table: jobs", "details": None},
+    ),
+    (
+        NotFoundError("Job not found: x"),
+        404,
+        {"detail": "Job not found: x", "message": "Resource not found", "details": None},
+    ),
+])
+async def test_backend_error_response_body(error, status_code, body):
+    """Test that database errors keep the generic detail while public errors return their message"""
+    request = Request({"type": "http", "method": "GET", "path": "/jobs", "headers": [], "query_string": b""})
+    
+    response = await backend_exception_handler(request, error)
+    
+    assert response.status_code == status_code
+    assert orjson.loads(response.body) == body
@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+from backend.services import external_cache
+from backend.services.external_cache import make_cache_key, cached_get
+
+def test_cache_key_ignores_param_order():
+    """Test that identical requests map to the same cache key"""
+    key_a = make_cache_key("pubchem", "/compound/name/aspirin/JSON", {"a": "1", "b": "2"})
+    key_b = make_cache_key("pubchem", "compound/name/aspirin/JSON", {"b": "2", "a": "1"})
+    assert key_a == key_b
+    assert key_a.startswith("extapi:pubchem:")
+    assert key_a != make_cache_key("chembl", "compound/name/aspirin/JSON", {"a": "1", "b": "2"})
+
+@pytest.mark.asyncio
+async def test_cached_get_without_redis(monkeypatch):
+    """Test that responses are served from the in-process cache when Redis is unavailable"""
+    monkeypatch.setattr(external_cache, "_get_redis", lambda: None)
+    monkeypatch.setattr(external_cache, "_local_cache", type(external_cache._local_cache)())
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        return {"ok": True}
+    
+    assert await cached_get("pdb", "core/entry/1ABC", None, fetch) == {"ok": True}
+    assert await cached_get("pdb", "core/entry/1ABC", None, fetch) == {"ok": True}
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_coalesced(monkeypatch):
+    """Test that concurrent identical requests share one upstream fetch"""
+    monkeypatch.setattr(external_cache, "_get_redis", lambda: None)
+    monkeypatch.setattr(external_cache, "_local_cache", type(external_cache._local_cache)())
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+    
+    results = await asyncio.gather(*[
+        cached_get("uniprot", "uniprotkb/P04637", {"format": "json"}, fetch)
+        for _ in range(10)
+    ])
+    assert results == [{"ok": True}] * 10
+    assert len(calls) == 1
@@ -0,0 +1,35 @@
+import asyncio
+import uuid
+import pytest
+from backend.models import Job, JobType, JobStatus
+from backend.services.job_writer import JobWriter
+
+@pytest.mark.asyncio
+async def test_concurrent_inserts_are_batched(test_db):
+    """Test that concurrent job inserts are written together and returned with defaults"""
+    writer = JobWriter(session_factory=test_db, batch_window=0.01)
+    batches = []
+    original = writer._next_batch
+    
+    async def record_batch():
+        batch = await original()
+        batches.append(len(batch))
+        return batch
+    
+    writer._next_batch = record_batch
+    try:
+        job_ids = [str(uuid.uuid4()) for _ in range(5)]
+        jobs = await asyncio.gather(*[
+            writer.insert({"id": job_id, "job_name": f"Job {job_id[:8]}", "job_type": JobType.DOCKING_ONLY})
+            for job_id in job_ids
+        ])
+    finally:
+        await writer.close()
+    
+    assert [job.id for job in jobs] == job_ids
+    assert all(job.status == JobStatus.SUBMITTED for job in jobs)
+    assert all(job.created_at is not None for job in jobs)
+    assert batches == [5]
+    
+    async with test_db() as session:
+        assert await session.get(Job, job_ids[0]) is not None
@@ -0,0 +1,73 @@
+import uuid
+import orjson
+import pytest
+from fastapi import HTTPException
+from backend.models import Job, JobType, new_job_id
+from backend.routes.jobs import get_job_or_404, get_job_or_404_rw, list_jobs, retry_job
+from backend.schemas import JobSummary
+
+@pytest.mark.asyncio
+async def test_list_jobs_returns_summary_columns_only(test_db):
+    """Test that job listings leave large JSON/text columns out of the payload"""
+    async with test_db() as session:
+        session.add(Job(
+            id=new_job_id(),
+            job_name="Docking Job",
+            job_type=JobType.DOCKING_ONLY,
+            ligand_files=["ligand"] * 10,
+            docking_parameters={"exhaustiveness": 8},
+            docking_results={"results": []},
+            ai_report_content="report"
+        ))
+        await session.commit()
+
+        response = await list_jobs(db=session, cursor=None, limit=20)
+
+    jobs = orjson.loads(response.body)
+    assert len(jobs) == 1
+    assert set(jobs[0]) == set(JobSummary.model_fields)
+    assert jobs[0]["job_name"] == "Docking Job"
+
+@pytest.mark.asyncio
+async def test_list_jobs_keyset_pagination(test_db):
+    """Test that following X-Next-Cursor walks every job exactly once, newest first"""
+    async with test_db() as session:
+        job_ids = [new_job_id() for _ in range(5)]
+        session.add_all([
+            Job(id=job_id, job_name=f"Job {i}", job_type=JobType.DOCKING_ONLY)
+            for i, job_id in enumerate(job_ids)
+        ])
+        await session.commit()
+
+        seen = []
+        cursor = None
+        while True:
+            response = await list_jobs(db=session, cursor=cursor, limit=2)
+            seen.extend(job["id"] for job in orjson.loads(response.body))
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+    # Rows created within the same second are ordered by id, newest first
+    assert seen == sorted(job_ids, reverse=True)
+
+@pytest.mark.asyncio
+async def test_job_loaders_share_404(test_db):
+    """Test that the read-only and read-write job dependencies load jobs and 404 the same way"""
+    job_id = new_job_id()
+    missing_id = uuid.uuid4()
+    async with test_db() as session:
+        session.add(Job(id=job_id, job_name="Docking Job", job_type=JobType.DOCKING_ONLY))
+        await session.commit()
+
+        for loader in (get_job_or_404, get_job_or_404_rw):
+            assert (await loader(job_id=uuid.UUID(job_id), db=session)).id == job_id
+            with pytest.raises(HTTPException) as exc_info:
+                await loader(job_id=missing_id, db=session)
+            assert exc_info.value.status_code == 404
+            assert exc_info.value.detail == f"Job not found: {missing_id}"
+
+        job = await get_job_or_404_rw(job_id=uuid.UUID(job_id), db=session)
+        with pytest.raises(HTTPException) as exc_info:
+            await retry_job(job=job, db=session)
+        assert exc_info.value.status_code == 400
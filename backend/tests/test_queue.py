@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import pytest
+from backend.services import queue
+
+class FakeTask:
+    name = "fake_task"
+    
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.published = []
+    
+    def apply_async(self, kwargs):
+        if self.fail:
+            raise ConnectionError("broker unavailable")
+        self.published.append(kwargs)
+        return type("Result", (), {"id": "task-id"})()
+
+@pytest.mark.asyncio
+async def test_submit_task_publishes_in_background():
+    """Test that submit_task returns immediately and publishes the task afterwards"""
+    task = FakeTask()
+    queue.submit_task(task, job_id="job-1")
+    assert task.published == []
+    
+    await asyncio.gather(*queue._pending_submissions)
+    assert task.published == [{"job_id": "job-1"}]
+    assert not queue._pending_submissions
+
+@pytest.mark.asyncio
+async def test_submit_task_logs_publish_failures(caplog):
+    """Test that a failed publish is logged instead of raised"""
+    task = FakeTask(fail=True)
+    with caplog.at_level(logging.ERROR, logger=queue.__name__):
+        queue.submit_task(task, job_id="job-1")
+        
+        await asyncio.gather(*queue._pending_submissions)
+    assert not queue._pending_submissions
+    
+    errors = [record for record in caplog.records if record.levelno == logging.ERROR]
+    assert len(errors) == 1
+    assert errors[0].name == queue.__name__
+    assert errors[0].getMessage() == "Failed to enqueue fake_task for job job-1: broker unavailable"
+    assert isinstance(errors[0].exc_info[1], ConnectionError)
+
+@pytest.mark.asyncio
+async def test_run_workflow_closes_loop_bound_clients(monkeypatch):
+    """Test that the DB engine, LLM client and Redis client are closed after each task"""
+    closed = []
+    
+    async def _close(name):
+        closed.append(name)
+    
+    monkeypatch.setattr(queue, "close_db", lambda: _close("db"))
+    monkeypatch.setattr(queue, "close_ai_client", lambda: _close("ai"))
+    monkeypatch.setattr(queue, "close_cache", lambda: _close("cache"))
+    
+    async def _workflow():
+        raise RuntimeError("workflow failed")
+    
+    with pytest.raises(RuntimeError):
+        await queue._run_workflow(_workflow())
+    assert closed == ["db", "ai", "cache"]
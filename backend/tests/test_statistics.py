@@ -0,0 +1,200 @@
+import orjson
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from fastapi import HTTPException
+from backend.models import Job, JobType, new_job_id
+from backend.routes import _stats_core
+from backend.routes.statistics import compare_jobs, get_job_statistics
+from backend.services.docking import extract_mode_affinities
+
+def _docking_results(*affinities):
+    return {"results": [{"ligand": "lig", "modes": [{"affinity": a} for a in affinities]}]}
+
+@pytest.mark.asyncio
+async def test_job_statistics(test_db):
+    """Test summary statistics, percentiles and outliers for a job's affinities"""
+    job_id = new_job_id()
+    async with test_db() as session:
+        session.add(Job(
+            id=job_id,
+            job_name="Docking Job",
+            job_type=JobType.DOCKING_ONLY,
+            docking_results=_docking_results(-9.0, -8.5, -8.0, -7.5, -7.0, -1.0)
+        ))
+        await session.commit()
+
+        response = await get_job_statistics(job_id=job_id, db=session)
+
+    body = orjson.loads(response.body)
+    stats = body["statistics"]
+    assert stats["count"] == 6
+    assert stats["mean"] == -6.8333
+    assert stats["median"] == -7.75
+    assert stats["min"] == -9.0
+    assert stats["max"] == -1.0
+    assert stats["q1"] == -8.5
+    assert stats["q3"] == -7.0
+    assert stats["p90"] == stats["p95"] == -1.0
+    assert stats["std_dev"] == pytest.approx(stats["variance"] ** 0.5, abs=1e-4)
+    assert body["outliers"] == {"lower_bound": -10.75, "upper_bound": -4.75, "count": 1}
+
+@pytest.mark.asyncio
+async def test_compare_jobs(test_db):
+    """Test that compared jobs are reported in request order with missing jobs as warnings"""
+    job_ids = [new_job_id(), new_job_id()]
+    missing_id = new_job_id()
+    async with test_db() as session:
+        session.add_all([
+            # Summarized in SQL from the stored affinities
+            Job(id=job_ids[0], job_name="First", job_type=JobType.DOCKING_ONLY,
+                docking_results=_docking_results(-9.0, -7.0), binding_affinities=[-9.0, -7.0]),
+            # Stored before binding_affinities existed
+            Job(id=job_ids[1], job_name="Second", job_type=JobType.DOCKING_ONLY,
+                docking_results=_docking_results(-6.0, -5.0, -4.0)),
+        ])
+        await session.commit()
+
+        response = await compare_jobs(job_ids=[job_ids[1], missing_id, job_ids[0]], db=session)
+
+    body = orjson.loads(response.body)
+    assert [job["job_id"] for job in body["jobs"]] == [job_ids[1], job_ids[0]]
+    assert [job["mean"] for job in body["jobs"]] == [-5.0, -8.0]
+    assert body["aggregate"]["mean_of_means"] == -6.5
+    assert body["aggregate"]["best_overall"] == -9.0
+    assert body["warnings"] == [f"Job not found: {missing_id}"]
+
+@pytest.mark.asyncio
+async def test_job_statistics_from_json_string(test_db):
+    """Test that docking results stored as a JSON-encoded string are decoded"""
+    job_id = new_job_id()
+    async with test_db() as session:
+        session.add(Job(
+            id=job_id,
+            job_name="Docking Job",
+            job_type=JobType.DOCKING_ONLY,
+            docking_results=orjson.dumps(_docking_results(-8.0, -6.0)).decode()
+        ))
+        await session.commit()
+
+        first = await get_job_statistics(job_id=job_id, db=session)
+        second = await get_job_statistics(job_id=job_id, db=session)
+
+    assert first.body == second.body
+    body = orjson.loads(first.body)
+    assert body["statistics"]["count"] == 2
+    assert body["statistics"]["mean"] == -7.0
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("raw, detail", [
+    ('[{"modes": [{"affinity": -8.0}]}]', "Docking results must be a dictionary"),
+    ('{"results": {"modes": [{"affinity": -8.0}]}}', "Docking results must contain a 'results' list"),
+])
+async def test_job_statistics_rejects_malformed_json_string(test_db, raw, detail):
+    """Test that malformed JSON-string documents are a 400, not empty statistics"""
+    job_id = new_job_id()
+    async with test_db() as session:
+        session.add(Job(id=job_id, job_name="Docking Job", job_type=JobType.DOCKING_ONLY, docking_results=raw))
+        await session.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_job_statistics(job_id=job_id, db=session)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == detail
+
+@pytest.mark.asyncio
+async def test_job_statistics_uses_stored_affinities(test_db):
+    """Test that the flattened binding_affinities column is used when present"""
+    job_id = new_job_id()
+    async with test_db() as session:
+        session.add(Job(
+            id=job_id,
+            job_name="Docking Job",
+            job_type=JobType.DOCKING_ONLY,
+            # Would be rejected if the document were parsed again
+            docking_results={"results": "stale"},
+            binding_affinities=extract_mode_affinities(_docking_results(-8.0, "n/a", -6.0))
+        ))
+        await session.commit()
+
+        response = await get_job_statistics(job_id=job_id, db=session)
+
+    body = orjson.loads(response.body)
+    assert body["statistics"]["count"] == 2
+    assert body["statistics"]["mean"] == -7.0
+
+@pytest.mark.parametrize("docking_results, expected", [
+    (_docking_results(-8.0, -7, "-6.5", None), [-8.0, -7.0, -6.5]),
+    ({"results": [{"modes": [{"affinity": -8.0}, "bad", {"affinity": "n/a"}]}, None]}, [-8.0]),
+    ({"results": [{"ligand": "no modes"}]}, []),
+    ("not a document", []),
+])
+def test_extract_mode_affinities(docking_results, expected):
+    """Test that affinities are flattened and malformed entries skipped"""
+    assert extract_mode_affinities(docking_results) == expected
+
+@pytest.mark.asyncio
+async def test_job_statistics_cache_follows_updates(test_db):
+    """Test that cached statistics are recomputed once the job row changes"""
+    job_id = new_job_id()
+    async with test_db() as session:
+        job = Job(
+            id=job_id,
+            job_name="Docking Job",
+            job_type=JobType.DOCKING_ONLY,
+            binding_affinities=[-8.0, -6.0]
+        )
+        session.add(job)
+        await session.commit()
+
+        first = await get_job_statistics(job_id=job_id, db=session)
+
+        job.binding_affinities = [-8.0, -6.0, -4.0]
+        await session.commit()
+
+        second = await get_job_statistics(job_id=job_id, db=session)
+
+    assert orjson.loads(first.body)["statistics"]["count"] == 2
+    assert orjson.loads(second.body)["statistics"]["count"] == 3
+
+def test_parsed_docking_results_cache_does_not_keep_raw():
+    """Test that decoded JSON strings are cached per job revision and re-parsed when the string changes"""
+    updated_at = datetime(2026, 1, 1, 12, 0, 0)
+    raw = orjson.dumps(_docking_results(-8.0)).decode()
+    job = SimpleNamespace(id="job", updated_at=updated_at, docking_results=raw)
+
+    first = _stats_core._load_docking_results(job)
+    assert _stats_core._load_docking_results(job) is first
+    assert all(raw not in entry for entry in _stats_core._parsed_cache.values())
+
+    # Rewritten within the same updated_at second
+    job.docking_results = orjson.dumps(_docking_results(-8.0, -6.0)).decode()
+    assert len(_stats_core._load_docking_results(job)["results"][0]["modes"]) == 2
+
+@pytest.mark.asyncio
+async def test_job_statistics_cache_notices_same_second_updates(test_db):
+    """Test that cached statistics are not reused when the affinities change within one updated_at tick"""
+    job_id = new_job_id()
+    updated_at = datetime(2026, 1, 1, 12, 0, 0)
+    async with test_db() as session:
+        job = Job(
+            id=job_id,
+            job_name="Docking Job",
+            job_type=JobType.DOCKING_ONLY,
+            binding_affinities=[-8.0, -6.0],
+            updated_at=updated_at
+        )
+        session.add(job)
+        await session.commit()
+
+        first = await get_job_statistics(job_id=job_id, db=session)
+
+        job.binding_affinities = [-8.0, -6.0, -4.0]
+        job.updated_at = updated_at
+        await session.commit()
+
+        second = await get_job_statistics(job_id=job_id, db=session)
+
+    assert orjson.loads(first.body)["statistics"]["count"] == 2
+    assert orjson.loads(second.body)["statistics"]["count"] == 3
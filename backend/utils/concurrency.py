@@ -0,0 +1,44 @@
+"""
+Concurrency limiting for expensive endpoints.
+"""
+import asyncio
+import functools
+import logging
+from typing import Any, Awaitable, Callable, TypeVar
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def limit_concurrency(limit: int, retry_after: int = 5) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Cap the number of in-flight calls to an async route handler.
+    
+    When the limit is reached, further requests are rejected immediately with
+    503 and a Retry-After header instead of queueing behind the running ones,
+    so accepted requests keep their latency under overload.
+    
+    Args:
+        limit: Maximum number of concurrent calls (per worker process)
+        retry_after: Seconds clients are asked to wait before retrying
+    """
+    semaphore = asyncio.Semaphore(limit)
+    
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            if semaphore.locked():
+                logger.warning(f"Rejecting {func.__name__}: {limit} requests already in progress")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server busy, please retry later",
+                    headers={"Retry-After": str(retry_after)},
+                )
+            async with semaphore:
+                return await func(*args, **kwargs)
+        return wrapper
+    
+    return decorator
@@ -0,0 +1,42 @@
+"""
+Shared error translation for route handlers.
+"""
+import functools
+import logging
+from typing import Any, Awaitable, Callable, TypeVar
+
+from fastapi import HTTPException
+
+from backend.exceptions import DatabaseError, NotFoundError, ValidationError
+
+T = TypeVar("T")
+
+
+def handle_errors(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Translate exceptions escaping an async route handler into HTTP errors.
+
+    HTTPException passes through unchanged; ValidationError becomes 400,
+    NotFoundError 404 and DatabaseError 500, each with the error message as
+    detail. Anything else is logged with its traceback and returned as a
+    generic 500, so handlers only catch errors they respond to differently.
+    """
+    logger = logging.getLogger(func.__module__)
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        try:
+            return await func(*args, **kwargs)
+        except HTTPException:
+            raise
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except NotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except DatabaseError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        except Exception as e:
+            logger.error(f"Unexpected error in {func.__name__}: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+    return wrapper
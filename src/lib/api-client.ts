@@ -117,6 +117,12 @@ function mapBackendJobToStatus(raw: Record<string, unknown>): JobStatus {
   }
 }
 
+export interface JobPage {
+  jobs: JobStatus[]
+  /** Cursor for the next page, or null on the last page */
+  nextCursor: string | null
+}
+
 export interface AIAnalysisRequest {
   job_id: string
   analysis_type: "binding_affinity" | "drug_likeness" | "toxicity" | "comprehensive" | "custom"
@@ -362,14 +368,17 @@ class APIClient {
     }
   }
 
-  /** List jobs with optional pagination. */
-  async listJobs(skip = 0, limit = 20): Promise<JobStatus[]> {
+  /** List jobs, newest first. Pass the previous page's nextCursor to continue. */
+  async listJobs(limit = 20, cursor?: string): Promise<JobPage> {
     try {
-      const response = await fetchWithTimeout(
-        `${this.baseUrl}/api/jobs?skip=${skip}&limit=${limit}`,
-      )
+      const params = new URLSearchParams({ limit: String(limit) })
+      if (cursor) params.set("cursor", cursor)
+      const response = await fetchWithTimeout(`${this.baseUrl}/api/jobs?${params}`)
       const raw = (await this.handleResponse(response, "List jobs")) as Record<string, unknown>[]
-      return raw.map((j) => mapBackendJobToStatus(j))
+      return {
+        jobs: raw.map((j) => mapBackendJobToStatus(j)),
+        nextCursor: response.headers.get("X-Next-Cursor"),
+      }
     } catch (error) {
       if (error instanceof APIError) throw error
       throw new APIError("Unable to list jobs", 0, "NETWORK_ERROR")
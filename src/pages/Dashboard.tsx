@@ -29,6 +29,31 @@ export default function Dashboard() {
   const [isInitialLoading, setIsInitialLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
   const [balance, setBalance] = useState<number | null>(null)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
+
+  // Refresh the newest page without dropping older pages already loaded
+  const refreshJobs = async () => {
+    const page = await apiClient.listJobs(100)
+    const ids = new Set(page.jobs.map((j) => j.job_id))
+    setJobs((prev) => [...page.jobs, ...prev.filter((j) => !ids.has(j.job_id))])
+  }
+
+  const handleLoadMore = async () => {
+    if (!nextCursor) return
+    setIsLoadingMore(true)
+    try {
+      const page = await apiClient.listJobs(100, nextCursor)
+      const ids = new Set(page.jobs.map((j) => j.job_id))
+      setJobs((prev) => [...prev.filter((j) => !ids.has(j.job_id)), ...page.jobs])
+      setNextCursor(page.nextCursor)
+    } catch (err) {
+      if (err instanceof APIError) setError(err.message)
+      else setError("Failed to load more jobs.")
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }
 
   useEffect(() => {
     const fetchBalance = async () => {
@@ -49,8 +74,11 @@ export default function Dashboard() {
     let cancelled = false
     const load = async () => {
       try {
-        const list = await apiClient.listJobs(0, 100)
-        if (!cancelled) setJobs(list)
+        const page = await apiClient.listJobs(100)
+        if (!cancelled) {
+          setJobs(page.jobs)
+          setNextCursor(page.nextCursor)
+        }
       } catch (e) {
         if (!cancelled) {
           setError("Failed to load jobs. Check that the API is running.")
@@ -77,8 +105,7 @@ export default function Dashboard() {
     if (!inProgress) return
     const id = setInterval(async () => {
       try {
-        const list = await apiClient.listJobs(0, 100)
-        setJobs(list)
+        await refreshJobs()
       } catch {
         // ignore poll errors
       }
@@ -162,8 +189,7 @@ export default function Dashboard() {
         throw new Error("Invalid job configuration")
       }
       setIsSubmitDialogOpen(false)
-      const list = await apiClient.listJobs(0, 100)
-      setJobs(list)
+      await refreshJobs()
     } catch (err) {
       if (err instanceof APIError) setError(err.message)
       else setError("An unexpected error occurred. Please try again.")
@@ -351,6 +377,18 @@ export default function Dashboard() {
                         )}
                       </div>
                     ))}
+                    {nextCursor && (
+                      <Button
+                        variant="ghost"
+                        size="sm"
+                        className="w-full gap-2"
+                        onClick={handleLoadMore}
+                        disabled={isLoadingMore}
+                      >
+                        {isLoadingMore && <Loader2 className="w-4 h-4 animate-spin" />}
+                        Load more jobs
+                      </Button>
+                    )}
                     {filteredJobs.length === 0 && jobs.length > 0 && (
                       <div className="text-center py-8 text-muted-foreground">
                         <p>No jobs match your search criteria.</p>